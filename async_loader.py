@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+"""asyncio loaders that keep several insert batches in flight.
+
+The blocking loaders wait a full round trip for every batch, which dominates
+when seeding from a workstation or another region. These loaders feed
+generated batches through a bounded queue to a fixed number of concurrent
+senders: aiomysql connections for MySQL, or executor threads wrapping the
+boto3 rds-data client for the Data API.
+
+Run directly to measure throughput against a local MySQL (or a fake Data API
+endpoint) as round-trip time varies:
+
+    python3 async_loader.py --scale 1 --rtt-ms 0,10,50,100 --compare-sync
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+import seed_data
+
+DEFAULT_INFLIGHT = 8
+PROXY_READ_BYTES = 64 * 1024
+
+def check_requirements():
+    """Check if required modules are installed."""
+    try:
+        import aiomysql
+    except ImportError:
+        print("Error: aiomysql module is required for the asyncio loader but not installed.")
+        print("Please install it using: pip install aiomysql")
+        sys.exit(1)
+
+async def pipeline(batches, execute, inflight=DEFAULT_INFLIGHT):
+    """Run `await execute(batch)` for every batch with at most `inflight` running at once.
+
+    Batches are pulled from the (lazy) iterator into a queue of `inflight`
+    slots, so the producer never gets further ahead of the senders than that.
+    Returns the sum of what `execute` returned.
+    """
+    queue = asyncio.Queue(maxsize=inflight)
+
+    async def produce():
+        for batch in batches:
+            await queue.put(batch)
+        for _ in range(inflight):
+            await queue.put(None)
+
+    async def consume():
+        done = 0
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return done
+            done += await execute(batch)
+
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(consume()) for _ in range(inflight)]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return sum(results[1:])
+
+async def load_mysql(host, user, password, database, scale, seed, port=3306,
+                     batch_size=seed_data.DEFAULT_BATCH_SIZE, inflight=DEFAULT_INFLIGHT):
+    """Recreate the RDS test tables and load a generated dataset over `inflight` aiomysql connections.
+
+    Each batch is one multi-row INSERT committed on its own connection; a
+    table starts once every batch of the previous table has committed, so
+    foreign keys always find their parent rows. Returns rows per table.
+    """
+    import aiomysql
+    import rds_insert_test_data as rds
+
+    pool = await aiomysql.create_pool(host=host, port=port, user=user, password=password, db=database,
+                                      charset='utf8mb4', minsize=1, maxsize=inflight, autocommit=False)
+    inserted = {}
+    try:
+        async with pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                for table in reversed(seed_data.TABLE_ORDER):
+                    await cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                for table in seed_data.TABLE_ORDER:
+                    await cursor.execute(rds.TABLE_DDL[table])
+            await connection.commit()
+
+        for table in seed_data.TABLE_ORDER:
+            sql = rds.insert_sql(table, seed_data.COLUMNS[table])
+
+            async def execute(chunk):
+                async with pool.acquire() as connection:
+                    async with connection.cursor() as cursor:
+                        await cursor.executemany(sql, chunk)
+                    await connection.commit()
+                return len(chunk)
+
+            started = time.time()
+            rows = seed_data.generate_rows(table, scale, seed)
+            inserted[table] = await pipeline(seed_data.chunked(rows, batch_size), execute, inflight)
+            elapsed = time.time() - started
+            print(f"  {table}: {inserted[table]} rows in {elapsed:.1f}s "
+                  f"({inserted[table] / max(elapsed, 1e-9):.0f} rows/sec)")
+    finally:
+        pool.close()
+        await pool.wait_closed()
+    return inserted
+
+async def load_data_api(client, scale, seed, database=None, inflight=DEFAULT_INFLIGHT,
+                        max_rows=None, max_bytes=None):
+    """Load a generated dataset through the Data API with `inflight` batch calls outstanding.
+
+    The boto3 client is blocking, so calls run on a thread pool; throttling
+    is still handled by execute_chunk_with_backoff. Tables must already exist.
+    Returns rows per table.
+    """
+    import aurora_data_api_insert_test_data as aurora
+
+    max_rows = max_rows or aurora.MAX_BATCH_ROWS
+    max_bytes = max_bytes or aurora.MAX_BATCH_BYTES
+    limiter = aurora.AdaptiveConcurrency(inflight, initial=inflight)
+    loop = asyncio.get_running_loop()
+    inserted = {}
+    with ThreadPoolExecutor(max_workers=inflight, thread_name_prefix='data-api') as executor:
+        for table in seed_data.TABLE_ORDER:
+            encoder = aurora.table_encoder(table)
+            sql = aurora.insert_statement(table, encoder.names)
+
+            async def execute(item):
+                chunk, chunk_bytes = item
+                return await loop.run_in_executor(executor, aurora.execute_chunk_with_backoff,
+                                                  client, sql, chunk, chunk_bytes, limiter, database)
+
+            started = time.time()
+            parameter_sets = encoder.encode_rows(seed_data.generate_rows(table, scale, seed))
+            chunks = aurora.chunk_parameter_sets(parameter_sets, max_rows, max_bytes)
+            inserted[table] = await pipeline(chunks, execute, inflight)
+            elapsed = time.time() - started
+            print(f"  {table}: {inserted[table]} rows in {elapsed:.1f}s "
+                  f"({inserted[table] / max(elapsed, 1e-9):.0f} rows/sec)")
+    return inserted
+
+class LatencyProxy:
+    """TCP proxy that delays the traffic in each direction by half of `rtt` seconds.
+
+    Data keeps its order and is forwarded as soon as its delay has passed, so
+    the link behaves like a long, fast pipe rather than a slow one.
+    """
+
+    def __init__(self, target_host, target_port, rtt, listen_host='127.0.0.1', listen_port=0):
+        self.target_host = target_host
+        self.target_port = target_port
+        self.rtt = rtt
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+        self.listen_port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, client_reader, client_writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(self._forward(client_reader, upstream_writer),
+                             self._forward(upstream_reader, client_writer),
+                             return_exceptions=True)
+
+    async def _forward(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, data = await queue.get()
+                if data is None:
+                    break
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+
+        deliverer = asyncio.ensure_future(deliver())
+        try:
+            while True:
+                data = await reader.read(PROXY_READ_BYTES)
+                if not data:
+                    break
+                queue.put_nowait((loop.time() + self.rtt / 2, data))
+        finally:
+            queue.put_nowait((0, None))
+            await deliverer
+            writer.close()
+
+def load_mysql_blocking(host, port, user, password, database, scale, seed, batch_size):
+    """Load through the blocking rds_insert_test_data path, for comparison. Returns rows per table."""
+    import rds_insert_test_data as rds
+
+    connection = rds.open_connection(host, user, password, database, port=port)
+    inserted = {}
+    try:
+        with connection.cursor() as cursor:
+            rds.create_tables(cursor)
+        connection.commit()
+        for table in seed_data.TABLE_ORDER:
+            rows = seed_data.generate_rows(table, scale, seed)
+            inserted[table] = rds.insert_rows(connection, table, seed_data.COLUMNS[table], rows, batch_size)
+    finally:
+        connection.close()
+    return inserted
+
+async def rtt_sweep(args, rtts):
+    """Load once per RTT and return (rtt, mode, rows, seconds) results."""
+    results = []
+    loop = asyncio.get_running_loop()
+    for rtt in rtts:
+        print(f"\nRTT {rtt * 1000:.0f} ms:")
+        if args.target == 'data-api':
+            from benchmark_loaders import FakeRdsDataClient
+            modes = [('async', None)]
+            if args.compare_sync:
+                modes.append(('sync', None))
+            for mode, _ in modes:
+                client = FakeRdsDataClient(latency=rtt)
+                started = time.perf_counter()
+                if mode == 'async':
+                    inserted = await load_data_api(client, args.scale, args.seed, 'benchmark', args.inflight)
+                else:
+                    import aurora_data_api_insert_test_data as aurora
+                    aurora.DATABASE_NAME = 'benchmark'
+                    await loop.run_in_executor(None, partial(
+                        aurora.insert_generated_data, client, args.scale, args.seed, max_concurrency=1))
+                    inserted = client.rows
+                results.append((rtt, mode, sum(inserted.values()), time.perf_counter() - started))
+            continue
+
+        proxy = await LatencyProxy(os.environ['MYSQL_HOST'], int(os.environ.get('MYSQL_PORT', 3306)), rtt).start()
+        try:
+            connect = ('127.0.0.1', os.environ['MYSQL_USER'], os.environ['MYSQL_PASS'], os.environ['MYSQL_DB'])
+            started = time.perf_counter()
+            inserted = await load_mysql(*connect, args.scale, args.seed, port=proxy.listen_port,
+                                        batch_size=args.batch_size, inflight=args.inflight)
+            results.append((rtt, 'async', sum(inserted.values()), time.perf_counter() - started))
+            if args.compare_sync:
+                started = time.perf_counter()
+                # The proxy runs on this event loop, so the blocking loader needs its own thread
+                inserted = await loop.run_in_executor(None, partial(
+                    load_mysql_blocking, connect[0], proxy.listen_port, *connect[1:], args.scale, args.seed,
+                    args.batch_size))
+                results.append((rtt, 'sync', sum(inserted.values()), time.perf_counter() - started))
+        finally:
+            await proxy.close()
+    return results
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Pipelined asyncio test data loader")
+    parser.add_argument('--target', choices=('mysql', 'data-api'), default='mysql',
+                        help="mysql: MYSQL_* environment variables; data-api: the Aurora cluster configured "
+                             "in aurora_data_api_insert_test_data.py (a local fake with --rtt-ms)")
+    parser.add_argument('--scale', type=int, default=1, help="Scale factor (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed for generated data")
+    parser.add_argument('--batch-size', type=int, default=seed_data.DEFAULT_BATCH_SIZE,
+                        help=f"Rows per INSERT batch (default: {seed_data.DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--inflight', type=int, default=DEFAULT_INFLIGHT,
+                        help=f"Batches in flight at once (default: {DEFAULT_INFLIGHT})")
+    parser.add_argument('--rtt-ms', help="Comma-separated round-trip times to benchmark, e.g. 0,10,50,100. "
+                                         "MySQL traffic goes through a local latency proxy")
+    parser.add_argument('--compare-sync', action='store_true',
+                        help="With --rtt-ms, also time the blocking loader at each RTT")
+    args = parser.parse_args()
+    if args.scale < 1 or args.batch_size < 1 or args.inflight < 1:
+        parser.error("--scale, --batch-size and --inflight must be positive")
+    if args.target == 'mysql' and not os.environ.get('MYSQL_HOST'):
+        parser.error("set MYSQL_HOST, MYSQL_USER, MYSQL_PASS and MYSQL_DB (source ./set_db_credentials.sh)")
+    return args
+
+def main():
+    """Load a generated dataset, or benchmark the loaders across round-trip times."""
+    args = parse_args()
+    if args.target == 'mysql':
+        check_requirements()
+
+    if args.rtt_ms:
+        rtts = [float(value) / 1000 for value in args.rtt_ms.split(',')]
+        results = asyncio.run(rtt_sweep(args, rtts))
+        print(f"\n{'RTT ms':>8} {'mode':>6} {'rows':>10} {'seconds':>9} {'rows/sec':>10}")
+        for rtt, mode, rows, seconds in results:
+            print(f"{rtt * 1000:>8.0f} {mode:>6} {rows:>10} {seconds:>9.2f} {rows / max(seconds, 1e-9):>10.0f}")
+        return 0
+
+    if args.target == 'mysql':
+        asyncio.run(load_mysql(os.environ['MYSQL_HOST'], os.environ['MYSQL_USER'], os.environ['MYSQL_PASS'],
+                               os.environ['MYSQL_DB'], args.scale, args.seed,
+                               port=int(os.environ.get('MYSQL_PORT', 3306)),
+                               batch_size=args.batch_size, inflight=args.inflight))
+    else:
+        import aurora_data_api_insert_test_data as aurora
+        client = aurora.get_rds_data_client()
+        aurora.DATABASE_NAME = aurora.get_or_create_database(client)
+        aurora.create_tables(client)
+        asyncio.run(load_data_api(client, args.scale, args.seed, aurora.DATABASE_NAME, inflight=args.inflight))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
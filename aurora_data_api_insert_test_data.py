@@ -1,15 +1,55 @@
 #!/usr/bin/env python3
 
+import os
+import csv
 import sys
+import time
+import random
+import asyncio
+import argparse
+import threading
+import queue
 import boto3
 import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, date
+from decimal import Decimal
+from operator import methodcaller
 from botocore.exceptions import ClientError, BotoCoreError
 
+import seed_data
+import async_loader
+import statement_trace
+
 # Aurora cluster configuration
 RESOURCE_ARN = "arn:aws:rds:us-east-1:632930644527:cluster:mcpdemo"
 SECRET_ARN = "arn:aws:secretsmanager:us-east-1:632930644527:secret:aurora/mcpdemo-QOU5uE"
 DATABASE_NAME = None  # Will be determined at runtime
 
+# Data API limits: 4 MiB per request; keep headroom for the JSON envelope
+MAX_BATCH_BYTES = 3 * 1024 * 1024
+MAX_BATCH_ROWS = 1000
+MAX_CONCURRENCY = 8
+MAX_THROTTLE_RETRIES = 8
+
+# Data API responses are capped at 1 MiB; pages shrink until they fit
+READ_PAGE_ROWS = 5000
+MIN_READ_PAGE_ROWS = 10
+
+# An auto-paused Aurora Serverless cluster takes ~15-30s to resume; the
+# wake-up probe retries until it answers or this many seconds pass
+RESUME_TIMEOUT = 300
+MAX_RESUME_BACKOFF = 2.0
+# Rows per table generated and encoded ahead of the load
+PREFETCH_ROWS = 20000
+
+THROTTLING_ERROR_CODES = (
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableError',
+    'RequestLimitExceeded',
+)
+
 def check_requirements():
     """Check if required modules are installed."""
     try:
@@ -19,6 +59,49 @@ def check_requirements():
         print("Please install it using: pip install boto3")
         sys.exit(1)
 
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Insert test data into Aurora MySQL using the Data API")
+    parser.add_argument('--scale', type=int,
+                        help="Generate a scaled dataset instead of the fixed sample rows")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--max-batch-rows', type=int, default=MAX_BATCH_ROWS,
+                        help=f"Parameter sets per batch_execute_statement call (default: {MAX_BATCH_ROWS})")
+    parser.add_argument('--max-batch-bytes', type=int, default=MAX_BATCH_BYTES,
+                        help=f"Approximate request payload bytes per call (default: {MAX_BATCH_BYTES})")
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help=f"Upper bound on concurrent batch calls (default: {MAX_CONCURRENCY})")
+    parser.add_argument('--commit-rows', type=int,
+                        help="Group batch calls into per-worker transactions committed every N rows")
+    parser.add_argument('--commit-bytes', type=int,
+                        help="Group batch calls into per-worker transactions committed every N payload bytes")
+    parser.add_argument('--export', metavar='DIR',
+                        help="Export every test table to DIR as CSV through the Data API and exit")
+    parser.add_argument('--benchmark-encoder', type=int, metavar='ROWS',
+                        help="Benchmark parameter-set encoding on ROWS generated rows and exit (no AWS calls)")
+    parser.add_argument('--async-inflight', type=int, metavar='N',
+                        help="Load generated data with the asyncio loader, keeping N batch calls in flight")
+    parser.add_argument('--no-warmup', action='store_true',
+                        help="Do not probe the cluster in the background while the script starts up")
+    parser.add_argument('--resume-timeout', type=float, default=RESUME_TIMEOUT,
+                        help=f"Seconds to wait for a paused cluster to resume (default: {RESUME_TIMEOUT})")
+    parser.add_argument('--prefetch-rows', type=int, default=PREFETCH_ROWS,
+                        help=f"Rows per table generated and encoded ahead of the load (default: {PREFETCH_ROWS})")
+    statement_trace.add_trace_args(parser)
+    args = parser.parse_args()
+    if args.scale is not None and args.scale < 1:
+        parser.error("--scale must be a positive integer")
+    if args.max_batch_rows < 1 or args.max_batch_bytes < 1 or args.concurrency < 1:
+        parser.error("--max-batch-rows, --max-batch-bytes and --concurrency must be positive")
+    if args.resume_timeout <= 0 or args.prefetch_rows < 1:
+        parser.error("--resume-timeout and --prefetch-rows must be positive")
+    if args.async_inflight is not None and (args.async_inflight < 1 or not args.scale):
+        parser.error("--async-inflight requires --scale and a positive N")
+    if args.async_inflight and (args.commit_rows or args.commit_bytes):
+        parser.error("--async-inflight cannot be combined with --commit-rows or --commit-bytes")
+    return args
+
 def get_rds_data_client():
     """Create and return RDS Data Service client."""
     try:
@@ -28,8 +111,12 @@ def get_rds_data_client():
         print(f"Error creating RDS Data client: {e}")
         sys.exit(1)
 
-def execute_statement(client, sql, parameters=None, database=None):
-    """Execute a SQL statement using RDS Data API."""
+def execute_statement(client, sql, parameters=None, database=None, **options):
+    """Execute a SQL statement using RDS Data API.
+
+    Extra keyword options (e.g. includeResultMetadata, formatRecordsAs) are
+    passed through to the API call.
+    """
     try:
         request_params = {
             'resourceArn': RESOURCE_ARN,
@@ -46,17 +133,25 @@ def execute_statement(client, sql, parameters=None, database=None):
         if parameters:
             request_params['parameters'] = parameters
 
-        response = client.execute_statement(**request_params)
-        return response
+        request_params.update(options)
+
+        if statement_trace.TRACER is None:
+            return client.execute_statement(**request_params)
+        return traced_call('execute', client.execute_statement, request_params)
     except ClientError as e:
-        print(f"AWS Client Error: {e}")
+        # Throttling, resuming clusters and oversized results are retried by the callers
+        if not (is_throttling_error(e) or is_resuming_error(e) or _is_response_too_large(e)):
+            print(f"AWS Client Error: {e}")
         raise
     except Exception as e:
         print(f"Error executing SQL statement: {e}")
         raise
 
-def execute_batch_statement(client, sql, parameter_sets, database=None):
-    """Execute a batch SQL statement using RDS Data API."""
+def execute_batch_statement(client, sql, parameter_sets, database=None, **options):
+    """Execute a batch SQL statement using RDS Data API.
+
+    Extra keyword options (e.g. transactionId) are passed through to the API call.
+    """
     try:
         request_params = {
             'resourceArn': RESOURCE_ARN,
@@ -71,15 +166,355 @@ def execute_batch_statement(client, sql, parameter_sets, database=None):
         elif DATABASE_NAME:
             request_params['database'] = DATABASE_NAME
 
-        response = client.batch_execute_statement(**request_params)
-        return response
+        request_params.update(options)
+
+        if statement_trace.TRACER is None:
+            return client.batch_execute_statement(**request_params)
+        return traced_call('batch', client.batch_execute_statement, request_params)
     except ClientError as e:
-        print(f"AWS Client Error: {e}")
+        if not is_throttling_error(e):
+            print(f"AWS Client Error: {e}")
         raise
     except Exception as e:
         print(f"Error executing batch SQL statement: {e}")
         raise
 
+def traced_call(kind, method, request_params):
+    """Call a Data API method and record a statement_trace span for it."""
+    tracer = statement_trace.TRACER
+    started = time.time()
+    clock = time.perf_counter()
+    # Approximates the request body; parameter values are sent as JSON too
+    request_bytes = len(json.dumps(request_params, default=str))
+    try:
+        response = method(**request_params)
+    except ClientError as e:
+        retries = e.response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        tracer.record(kind, request_params.get('sql'), time.perf_counter() - clock, started,
+                      request_bytes=request_bytes, retries=retries, error=e.response['Error']['Code'])
+        raise
+    metadata = response.get('ResponseMetadata', {})
+    response_bytes = metadata.get('HTTPHeaders', {}).get('content-length')
+    if 'updateResults' in response:
+        rows = len(response['updateResults'])
+    else:
+        rows = response.get('numberOfRecordsUpdated')
+    if 'records' in response:
+        records = len(response['records'])
+    elif 'formattedRecords' in response:
+        records = len(json.loads(response['formattedRecords']))
+    else:
+        records = None
+    tracer.record(kind, request_params.get('sql'), time.perf_counter() - clock, started, rows=rows,
+                  request_bytes=request_bytes, response_bytes=int(response_bytes) if response_bytes else None,
+                  records=records, retries=metadata.get('RetryAttempts', 0))
+    return response
+
+def begin_transaction(client, database=None):
+    """Begin a Data API transaction and return its id."""
+    request_params = {'resourceArn': RESOURCE_ARN, 'secretArn': SECRET_ARN, 'database': database or DATABASE_NAME}
+    if statement_trace.TRACER is None:
+        response = client.begin_transaction(**request_params)
+    else:
+        response = traced_call('begin', client.begin_transaction, request_params)
+    return response['transactionId']
+
+def commit_transaction(client, transaction_id):
+    """Commit a Data API transaction."""
+    request_params = {'resourceArn': RESOURCE_ARN, 'secretArn': SECRET_ARN, 'transactionId': transaction_id}
+    if statement_trace.TRACER is None:
+        return client.commit_transaction(**request_params)
+    return traced_call('commit', client.commit_transaction, request_params)
+
+def rollback_transaction(client, transaction_id):
+    """Roll back a Data API transaction."""
+    request_params = {'resourceArn': RESOURCE_ARN, 'secretArn': SECRET_ARN, 'transactionId': transaction_id}
+    if statement_trace.TRACER is None:
+        return client.rollback_transaction(**request_params)
+    return traced_call('rollback', client.rollback_transaction, request_params)
+
+def is_throttling_error(error):
+    """Return True if a ClientError means the Data API is shedding load."""
+    return error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+def is_resuming_error(error):
+    """Return True if a ClientError means the cluster is auto-paused and resuming."""
+    details = error.response.get('Error', {})
+    message = details.get('Message', '')
+    return details.get('Code') == 'DatabaseResumingException' or (
+        details.get('Code') == 'BadRequestException'
+        and ('resuming' in message.lower() or 'Communications link failure' in message))
+
+class ClusterWarmup:
+    """Wake-up probe for an auto-paused cluster, run on a background thread.
+
+    Started as the script starts, so the 15-30 seconds a paused Aurora
+    Serverless cluster takes to resume overlap with startup and data
+    generation instead of blocking the first real statement.
+    """
+
+    def __init__(self, client, timeout=RESUME_TIMEOUT, sql="SELECT 1"):
+        self.client = client
+        self.timeout = timeout
+        self.sql = sql
+        self.started = time.time()
+        self.ready_at = None
+        self.probes = 0
+        self.resumed = False
+        self.wait_started = None
+        self.waited = 0.0
+        self.error = None
+        self.done = threading.Event()
+        threading.Thread(target=self._probe, name='wake-probe', daemon=True).start()
+
+    def _probe(self):
+        backoff = 0.25
+        try:
+            while True:
+                self.probes += 1
+                try:
+                    execute_statement(self.client, self.sql)
+                    self.ready_at = time.time()
+                    return
+                except ClientError as e:
+                    if not (is_resuming_error(e) or is_throttling_error(e)) or \
+                            time.time() - self.started > self.timeout:
+                        self.error = e
+                        return
+                    self.resumed = self.resumed or is_resuming_error(e)
+                time.sleep(random.uniform(backoff / 2, backoff))
+                backoff = min(MAX_RESUME_BACKOFF, backoff * 1.5)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def wait(self):
+        """Block until the cluster answers and return the seconds spent waiting; raise if it never did."""
+        self.wait_started = time.time()
+        self.done.wait()
+        self.waited = time.time() - self.wait_started
+        if self.error is not None:
+            raise self.error
+        return self.waited
+
+    def summary(self, busy_until=None):
+        """Return the cold start and how much of it was hidden behind other work.
+
+        The script is busy until it starts waiting, or until `busy_until` if
+        data generation kept going longer than that.
+        """
+        wake = self.ready_at - self.started
+        busy_until = max(self.wait_started or self.ready_at, busy_until or 0.0)
+        hidden = max(min(self.ready_at, busy_until) - self.started, 0.0)
+        return {'resumed': self.resumed, 'probes': self.probes, 'wake_seconds': round(wake, 3),
+                'waited_seconds': round(self.waited, 3), 'hidden_seconds': round(hidden, 3)}
+
+    def report(self, busy_until=None):
+        summary = self.summary(busy_until)
+        if not summary['resumed']:
+            print(f"Cluster answered the wake-up probe in {summary['wake_seconds']:.1f}s (it was not paused)")
+            return
+        print(f"Cluster resumed in {summary['wake_seconds']:.1f}s ({summary['probes']} probes); "
+              f"{summary['hidden_seconds']:.1f}s of it was hidden behind startup and data generation")
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight Data API calls.
+
+    The limit halves whenever a call is throttled and grows by one after a run
+    of successful calls, up to `maximum`.
+    """
+
+    def __init__(self, maximum, initial=2, increase_after=4):
+        self.maximum = maximum
+        self.limit = min(initial, maximum)
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def throttled(self):
+        with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+
+    def succeeded(self):
+        with self.condition:
+            self.successes += 1
+            if self.successes >= self.increase_after and self.limit < self.maximum:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify_all()
+
+def parameter_set_size(parameter_set):
+    """Estimate the JSON-encoded size in bytes of one parameter set."""
+    size = 2
+    for parameter in parameter_set:
+        # {"name":"..","value":{"stringValue":".."}} plus typeHint if present
+        size += 40 + len(parameter['name']) + len(parameter.get('typeHint', ''))
+        for value in parameter['value'].values():
+            size += len(value.encode('utf-8')) if isinstance(value, str) else 24
+    return size
+
+def chunk_parameter_sets(parameter_sets, max_rows=MAX_BATCH_ROWS, max_bytes=MAX_BATCH_BYTES):
+    """Group parameter sets into (chunk, estimated bytes) bounded by row count and encoded size."""
+    chunk = []
+    chunk_bytes = 0
+    for parameter_set in parameter_sets:
+        size = parameter_set_size(parameter_set)
+        if chunk and (len(chunk) >= max_rows or chunk_bytes + size > max_bytes):
+            yield chunk, chunk_bytes
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(parameter_set)
+        chunk_bytes += size
+    if chunk:
+        yield chunk, chunk_bytes
+
+class WorkerTransactions:
+    """One open Data API transaction per worker thread.
+
+    Each worker groups the chunks it executes into its own transaction and
+    commits once `commit_rows` rows or `commit_bytes` payload bytes have gone
+    through it, so concurrent workers never share a transaction id.
+    """
+
+    def __init__(self, client, database=None, commit_rows=None, commit_bytes=None):
+        self.client = client
+        self.database = database
+        self.commit_rows = commit_rows
+        self.commit_bytes = commit_bytes
+        self.lock = threading.Lock()
+        # thread name -> [transaction id, rows, bytes]
+        self.open = {}
+        self.committed = 0
+
+    def current(self):
+        """Return the calling worker's transaction id, beginning one if needed."""
+        name = threading.current_thread().name
+        with self.lock:
+            state = self.open.get(name)
+        if state is None:
+            state = [begin_transaction(self.client, self.database), 0, 0]
+            with self.lock:
+                self.open[name] = state
+        return state[0]
+
+    def record(self, rows, size):
+        """Account an executed chunk and commit the worker's transaction if it is full."""
+        name = threading.current_thread().name
+        with self.lock:
+            state = self.open[name]
+            state[1] += rows
+            state[2] += size
+            full = ((self.commit_rows and state[1] >= self.commit_rows)
+                    or (self.commit_bytes and state[2] >= self.commit_bytes))
+            if full:
+                del self.open[name]
+        if full:
+            commit_transaction(self.client, state[0])
+            with self.lock:
+                self.committed += 1
+
+    def commit_all(self):
+        """Commit every worker's open transaction."""
+        with self.lock:
+            states = list(self.open.values())
+            self.open.clear()
+        for transaction_id, _, _ in states:
+            commit_transaction(self.client, transaction_id)
+            with self.lock:
+                self.committed += 1
+
+    def rollback_all(self):
+        """Roll back every worker's open transaction, ignoring ones that already ended."""
+        with self.lock:
+            states = list(self.open.values())
+            self.open.clear()
+        for transaction_id, _, _ in states:
+            try:
+                rollback_transaction(self.client, transaction_id)
+            except ClientError as e:
+                print(f"Warning: rollback of transaction {transaction_id} failed: {e}")
+
+def execute_chunk_with_backoff(client, sql, chunk, chunk_bytes, limiter, database, transactions=None):
+    """Run one batch chunk, backing off and shrinking concurrency on throttling."""
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        limiter.acquire()
+        try:
+            if transactions:
+                execute_batch_statement(client, sql, chunk, database, transactionId=transactions.current())
+            else:
+                execute_batch_statement(client, sql, chunk, database)
+        except ClientError as e:
+            if not is_throttling_error(e) or attempt == MAX_THROTTLE_RETRIES:
+                raise
+            limiter.throttled()
+            if statement_trace.TRACER is not None:
+                statement_trace.TRACER.retry('batch', sql, e.response['Error']['Code'])
+        else:
+            limiter.succeeded()
+            if transactions:
+                transactions.record(len(chunk), chunk_bytes)
+            return len(chunk)
+        finally:
+            limiter.release()
+        # Full jitter exponential backoff
+        time.sleep(random.uniform(0, min(20.0, 0.2 * 2 ** attempt)))
+
+def execute_batch_statement_chunked(client, sql, parameter_sets, database=None,
+                                    max_rows=MAX_BATCH_ROWS, max_bytes=MAX_BATCH_BYTES,
+                                    max_concurrency=MAX_CONCURRENCY, commit_rows=None, commit_bytes=None):
+    """Execute a batch statement over any number of parameter sets.
+
+    Parameter sets are consumed lazily, split into chunks that fit the Data API
+    request limits, and submitted concurrently under an adaptive limit. With
+    `commit_rows` or `commit_bytes`, each worker runs its chunks inside its own
+    transaction and commits at that interval instead of auto-committing every
+    call; on failure the open transactions are rolled back. Returns the number
+    of parameter sets executed.
+    """
+    limiter = AdaptiveConcurrency(max_concurrency)
+    transactions = None
+    if commit_rows or commit_bytes:
+        transactions = WorkerTransactions(client, database, commit_rows, commit_bytes)
+    executed = 0
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='data-api') as pool:
+        try:
+            for chunk, chunk_bytes in chunk_parameter_sets(parameter_sets, max_rows, max_bytes):
+                # Keep at most a couple of chunks queued per worker so memory stays bounded
+                while len(pending) >= max_concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        executed += future.result()
+                pending.add(pool.submit(execute_chunk_with_backoff, client, sql, chunk, chunk_bytes,
+                                        limiter, database, transactions))
+            for future in pending:
+                executed += future.result()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            if transactions:
+                transactions.rollback_all()
+            raise
+    if transactions:
+        transactions.commit_all()
+    return executed
+
 def get_or_create_database(client):
     """Get available databases and create one if needed."""
     global DATABASE_NAME
@@ -140,6 +575,7 @@ def create_tables(client):
 
     # Drop tables if they exist
     drop_statements = [
+        "DROP TABLE IF EXISTS order_items",
         "DROP TABLE IF EXISTS orders",
         "DROP TABLE IF EXISTS customers",
         "DROP TABLE IF EXISTS products"
@@ -185,116 +621,451 @@ def create_tables(client):
     """
     execute_statement(client, orders_sql)
 
+    # Create order_items table
+    order_items_sql = """
+    CREATE TABLE order_items (
+        order_item_id INT AUTO_INCREMENT PRIMARY KEY,
+        order_id INT NOT NULL,
+        product_id INT NOT NULL,
+        quantity INT NOT NULL,
+        unit_price DECIMAL(10, 2) NOT NULL,
+        FOREIGN KEY (order_id) REFERENCES orders(order_id),
+        FOREIGN KEY (product_id) REFERENCES products(product_id)
+    )
+    """
+    execute_statement(client, order_items_sql)
+
     print("Tables created successfully.")
 
+# Data API value member, typeHint and Python-side conversion per column type.
+# DECIMAL and TIMESTAMP travel as strings with a typeHint so no precision is
+# lost to doubleValue and the server parses them as the right type.
+DATA_API_TYPES = {
+    'long': ('longValue', None, None),
+    'double': ('doubleValue', None, None),
+    'boolean': ('booleanValue', None, None),
+    'string': ('stringValue', None, None),
+    'decimal': ('stringValue', 'DECIMAL', 'str'),
+    'timestamp': ('stringValue', 'TIMESTAMP', '_format_timestamp'),
+    'date': ('stringValue', 'DATE', '_format_date'),
+}
+
+# Data API column types of the tables, in seed_data.COLUMNS order
+TABLE_COLUMN_TYPES = {
+    'customers': ('long', 'string', 'string', 'string', 'timestamp'),
+    'products': ('long', 'string', 'string', 'decimal', 'long'),
+    'orders': ('long', 'long', 'timestamp', 'decimal', 'string'),
+    'order_items': ('long', 'long', 'long', 'long', 'decimal'),
+}
+
+def _format_timestamp(value):
+    """Format a datetime as Data API TIMESTAMP text."""
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+def _format_date(value):
+    """Format a date as Data API DATE text."""
+    return value.strftime('%Y-%m-%d')
+
+class ParameterSetEncoder:
+    """Turns row tuples or column arrays into Data API parameter sets.
+
+    The per-row encoding function is generated once from the schema, so
+    encoding a row is a single call that unpacks the tuple and builds the cell
+    dicts directly, without per-cell type dispatch. Every cell, NULL cells
+    included, gets its own dicts, so callers may modify the sets they receive.
+    """
+
+    def __init__(self, columns):
+        """`columns` is a sequence of (name, type) pairs, types from DATA_API_TYPES."""
+        self.columns = tuple(columns)
+        self.names = tuple(name for name, _ in self.columns)
+        self.encode_row = self._compile()
+
+    def _compile(self):
+        variables = [f"v{index}" for index in range(len(self.columns))]
+        cells = []
+        for variable, (name, column_type) in zip(variables, self.columns):
+            value_key, type_hint, convert = DATA_API_TYPES[column_type]
+            value = variable
+            if convert:
+                value = f"({variable} if {variable}.__class__ is str else {convert}({variable}))"
+            hint = f", 'typeHint': {type_hint!r}" if type_hint else ""
+            cells.append(
+                f"{{'name': {name!r}, 'value': {{{value_key!r}: {value}}}{hint}}} "
+                f"if {variable} is not None else {{'name': {name!r}, 'value': {{'isNull': True}}}}"
+            )
+        unpack = ", ".join(variables) + ("," if len(variables) == 1 else "")
+        source = (
+            "def encode_row(row):\n"
+            f"    {unpack} = row\n"
+            "    return [\n        " + ",\n        ".join(cells) + ",\n    ]\n"
+        )
+        namespace = {
+            '_format_timestamp': _format_timestamp,
+            '_format_date': _format_date,
+        }
+        exec(compile(source, f"<parameter encoder {', '.join(self.names)}>", 'exec'), namespace)
+        return namespace['encode_row']
+
+    def encode_rows(self, rows):
+        """Lazily encode an iterable of row tuples."""
+        return map(self.encode_row, rows)
+
+    def encode_columns(self, column_arrays):
+        """Lazily encode column arrays given in schema order."""
+        return map(self.encode_row, zip(*column_arrays))
+
+def table_encoder(table):
+    """Return a ParameterSetEncoder for one of the seed_data tables."""
+    return ParameterSetEncoder(zip(seed_data.COLUMNS[table], TABLE_COLUMN_TYPES[table]))
+
+def insert_statement(table, columns):
+    """Build a named-parameter INSERT for the Data API."""
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + name for name in columns)})")
+
 def insert_sample_data(client):
     """Insert sample data into tables using RDS Data API."""
     print("Inserting sample data...")
 
-    # Insert customers data using batch execution
-    customers_sql = "INSERT INTO customers (first_name, last_name, email) VALUES (:first_name, :last_name, :email)"
-    customers_data = [
-        [
-            {'name': 'first_name', 'value': {'stringValue': 'John'}},
-            {'name': 'last_name', 'value': {'stringValue': 'Doe'}},
-            {'name': 'email', 'value': {'stringValue': 'john.doe@example.com'}}
+    sample_rows = {
+        'customers': [
+            ('John', 'Doe', 'john.doe@example.com'),
+            ('Jane', 'Smith', 'jane.smith@example.com'),
+            ('Robert', 'Johnson', 'robert.johnson@example.com'),
+            ('Emily', 'Williams', 'emily.williams@example.com'),
+            ('Michael', 'Brown', 'michael.brown@example.com'),
         ],
-        [
-            {'name': 'first_name', 'value': {'stringValue': 'Jane'}},
-            {'name': 'last_name', 'value': {'stringValue': 'Smith'}},
-            {'name': 'email', 'value': {'stringValue': 'jane.smith@example.com'}}
+        'products': [
+            ('Laptop', 'High-performance laptop with 16GB RAM', '1299.99', 50),
+            ('Smartphone', 'Latest model with 128GB storage', '899.99', 100),
+            ('Headphones', 'Noise-cancelling wireless headphones', '249.99', 75),
+            ('Tablet', '10-inch tablet with retina display', '499.99', 30),
+            ('Smart Watch', 'Fitness tracking and notifications', '199.99', 60),
         ],
-        [
-            {'name': 'first_name', 'value': {'stringValue': 'Robert'}},
-            {'name': 'last_name', 'value': {'stringValue': 'Johnson'}},
-            {'name': 'email', 'value': {'stringValue': 'robert.johnson@example.com'}}
+        'orders': [
+            (1, '1299.99', 'delivered'),
+            (2, '899.99', 'shipped'),
+            (3, '249.99', 'processing'),
+            (4, '699.98', 'pending'),
+            (5, '199.99', 'delivered'),
+            (1, '499.99', 'shipped'),
         ],
-        [
-            {'name': 'first_name', 'value': {'stringValue': 'Emily'}},
-            {'name': 'last_name', 'value': {'stringValue': 'Williams'}},
-            {'name': 'email', 'value': {'stringValue': 'emily.williams@example.com'}}
+        'order_items': [
+            (1, 1, 1, '1299.99'),
+            (2, 2, 1, '899.99'),
+            (3, 3, 1, '249.99'),
+            (4, 4, 1, '499.99'),
+            (4, 5, 1, '199.99'),
+            (5, 5, 1, '199.99'),
+            (6, 4, 1, '499.99'),
         ],
-        [
-            {'name': 'first_name', 'value': {'stringValue': 'Michael'}},
-            {'name': 'last_name', 'value': {'stringValue': 'Brown'}},
-            {'name': 'email', 'value': {'stringValue': 'michael.brown@example.com'}}
-        ]
+    }
+
+    # The sample rows leave the AUTO_INCREMENT keys and defaulted columns to the server
+    sample_columns = {
+        'customers': ('first_name', 'last_name', 'email'),
+        'products': ('product_name', 'description', 'price', 'stock_quantity'),
+        'orders': ('customer_id', 'total_amount', 'status'),
+        'order_items': ('order_id', 'product_id', 'quantity', 'unit_price'),
+    }
+
+    # One transaction for all tables: a failure leaves the tables empty rather than half-populated
+    transaction_id = begin_transaction(client)
+    try:
+        for table in seed_data.TABLE_ORDER:
+            column_types = dict(zip(seed_data.COLUMNS[table], TABLE_COLUMN_TYPES[table]))
+            encoder = ParameterSetEncoder((name, column_types[name]) for name in sample_columns[table])
+            sql = insert_statement(table, encoder.names)
+            execute_batch_statement(client, sql, list(encoder.encode_rows(sample_rows[table])),
+                                    transactionId=transaction_id)
+    except Exception:
+        print("Rolling back sample data...")
+        rollback_transaction(client, transaction_id)
+        raise
+    commit_transaction(client, transaction_id)
+
+    print("Sample data inserted successfully.")
+
+class PrefetchedParameterSets:
+    """Parameter sets of a table generated and encoded on a background thread, up to `rows` ahead."""
+
+    _END = object()
+
+    def __init__(self, table, scale, seed, rows=PREFETCH_ROWS, chunk_rows=seed_data.DEFAULT_BATCH_SIZE):
+        self.table = table
+        self.chunks = queue.Queue(max(1, rows // chunk_rows))
+        self.encoded = 0
+        # When the producer first had nothing to do: its buffer was full or the table was done
+        self.idle_at = None
+        threading.Thread(target=self._produce, args=(scale, seed, chunk_rows), name=f"prefetch-{table}",
+                         daemon=True).start()
+
+    def _produce(self, scale, seed, chunk_rows):
+        try:
+            encoder = table_encoder(self.table)
+            for chunk in seed_data.chunked(encoder.encode_rows(seed_data.generate_rows(self.table, scale, seed)),
+                                           chunk_rows):
+                if self.idle_at is None and self.chunks.full():
+                    self.idle_at = time.time()
+                self.chunks.put(chunk)
+                self.encoded += len(chunk)
+            self.chunks.put(self._END)
+        except BaseException as e:
+            self.chunks.put(e)
+        finally:
+            if self.idle_at is None:
+                self.idle_at = time.time()
+
+    def __iter__(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._END:
+                return
+            if isinstance(chunk, BaseException):
+                raise chunk
+            yield from chunk
+
+def prefetch_dataset(scale, seed, rows=PREFETCH_ROWS):
+    """Start generating and encoding every table of a dataset ahead of the load."""
+    return {table: PrefetchedParameterSets(table, scale, seed, rows) for table in seed_data.TABLE_ORDER}
+
+def prefetch_busy_until(prefetched):
+    """Return when the last prefetch thread ran out of work (now if one is still busy)."""
+    return max((rows.idle_at or time.time() for rows in prefetched.values()), default=None)
+
+def insert_generated_data(client, scale, seed, max_rows=MAX_BATCH_ROWS, max_bytes=MAX_BATCH_BYTES,
+                          max_concurrency=MAX_CONCURRENCY, commit_rows=None, commit_bytes=None, prefetched=None):
+    """Stream a generated dataset of the given scale into the tables.
+
+    `prefetched` maps tables to parameter sets already being generated (see
+    prefetch_dataset).
+    """
+    for table in seed_data.TABLE_ORDER:
+        encoder = table_encoder(table)
+        print(f"Inserting rows into {table}...")
+        started = time.time()
+        if prefetched:
+            parameter_sets = prefetched[table]
+        else:
+            parameter_sets = encoder.encode_rows(seed_data.generate_rows(table, scale, seed))
+        inserted = execute_batch_statement_chunked(client, insert_statement(table, encoder.names), parameter_sets,
+                                                   max_rows=max_rows, max_bytes=max_bytes,
+                                                   max_concurrency=max_concurrency,
+                                                   commit_rows=commit_rows, commit_bytes=commit_bytes)
+        elapsed = time.time() - started
+        print(f"  {inserted} rows in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):.0f} rows/sec)")
+
+def _dict_literal_parameter_set(row):
+    """Encode a customers row the way insert_sample_data used to: one dict literal per cell."""
+    return [
+        {'name': 'customer_id', 'value': {'longValue': row[0]}},
+        {'name': 'first_name', 'value': {'stringValue': row[1]}},
+        {'name': 'last_name', 'value': {'stringValue': row[2]}},
+        {'name': 'email', 'value': {'stringValue': row[3]}},
+        {'name': 'created_at', 'value': {'stringValue': row[4]}, 'typeHint': 'TIMESTAMP'}
     ]
-    execute_batch_statement(client, customers_sql, customers_data)
-
-    # Insert products data using batch execution
-    products_sql = "INSERT INTO products (product_name, description, price, stock_quantity) VALUES (:product_name, :description, :price, :stock_quantity)"
-    products_data = [
-        [
-            {'name': 'product_name', 'value': {'stringValue': 'Laptop'}},
-            {'name': 'description', 'value': {'stringValue': 'High-performance laptop with 16GB RAM'}},
-            {'name': 'price', 'value': {'doubleValue': 1299.99}},
-            {'name': 'stock_quantity', 'value': {'longValue': 50}}
-        ],
-        [
-            {'name': 'product_name', 'value': {'stringValue': 'Smartphone'}},
-            {'name': 'description', 'value': {'stringValue': 'Latest model with 128GB storage'}},
-            {'name': 'price', 'value': {'doubleValue': 899.99}},
-            {'name': 'stock_quantity', 'value': {'longValue': 100}}
-        ],
-        [
-            {'name': 'product_name', 'value': {'stringValue': 'Headphones'}},
-            {'name': 'description', 'value': {'stringValue': 'Noise-cancelling wireless headphones'}},
-            {'name': 'price', 'value': {'doubleValue': 249.99}},
-            {'name': 'stock_quantity', 'value': {'longValue': 75}}
-        ],
-        [
-            {'name': 'product_name', 'value': {'stringValue': 'Tablet'}},
-            {'name': 'description', 'value': {'stringValue': '10-inch tablet with retina display'}},
-            {'name': 'price', 'value': {'doubleValue': 499.99}},
-            {'name': 'stock_quantity', 'value': {'longValue': 30}}
-        ],
-        [
-            {'name': 'product_name', 'value': {'stringValue': 'Smart Watch'}},
-            {'name': 'description', 'value': {'stringValue': 'Fitness tracking and notifications'}},
-            {'name': 'price', 'value': {'doubleValue': 199.99}},
-            {'name': 'stock_quantity', 'value': {'longValue': 60}}
-        ]
+
+def _per_cell_parameter_set(columns, row):
+    """Encode a row by inspecting each cell's Python type (the generic approach)."""
+    return [
+        {'name': name, 'value': {'longValue': value} if isinstance(value, int) else {'stringValue': value}}
+        for name, value in zip(columns, row)
     ]
-    execute_batch_statement(client, products_sql, products_data)
-
-    # Insert orders data using batch execution
-    orders_sql = "INSERT INTO orders (customer_id, total_amount, status) VALUES (:customer_id, :total_amount, :status)"
-    orders_data = [
-        [
-            {'name': 'customer_id', 'value': {'longValue': 1}},
-            {'name': 'total_amount', 'value': {'doubleValue': 1299.99}},
-            {'name': 'status', 'value': {'stringValue': 'delivered'}}
-        ],
-        [
-            {'name': 'customer_id', 'value': {'longValue': 2}},
-            {'name': 'total_amount', 'value': {'doubleValue': 899.99}},
-            {'name': 'status', 'value': {'stringValue': 'shipped'}}
-        ],
-        [
-            {'name': 'customer_id', 'value': {'longValue': 3}},
-            {'name': 'total_amount', 'value': {'doubleValue': 249.99}},
-            {'name': 'status', 'value': {'stringValue': 'processing'}}
-        ],
-        [
-            {'name': 'customer_id', 'value': {'longValue': 4}},
-            {'name': 'total_amount', 'value': {'doubleValue': 699.98}},
-            {'name': 'status', 'value': {'stringValue': 'pending'}}
-        ],
-        [
-            {'name': 'customer_id', 'value': {'longValue': 5}},
-            {'name': 'total_amount', 'value': {'doubleValue': 199.99}},
-            {'name': 'status', 'value': {'stringValue': 'delivered'}}
-        ],
-        [
-            {'name': 'customer_id', 'value': {'longValue': 1}},
-            {'name': 'total_amount', 'value': {'doubleValue': 499.99}},
-            {'name': 'status', 'value': {'stringValue': 'shipped'}}
-        ]
+
+def benchmark_parameter_encoding(rows=200000, seed=seed_data.DEFAULT_SEED):
+    """Compare parameter-set encoding throughput of the dict-literal and compiled encoders."""
+    data = list(seed_data.generate_rows('customers', -(-rows // seed_data.ROWS_PER_SCALE['customers']), seed))[:rows]
+    columns = list(zip(*data))
+    encoder = table_encoder('customers')
+
+    def consume(parameter_sets):
+        # Encode batch by batch, as the loader does, rather than holding every row at once
+        for _ in seed_data.chunked(parameter_sets, MAX_BATCH_ROWS):
+            pass
+
+    candidates = [
+        ("per-cell type dispatch", lambda: consume(_per_cell_parameter_set(encoder.names, row) for row in data)),
+        ("hand-written dict literals", lambda: consume(_dict_literal_parameter_set(row) for row in data)),
+        ("compiled encoder (rows)", lambda: consume(encoder.encode_rows(data))),
+        ("compiled encoder (columns)", lambda: consume(encoder.encode_columns(columns))),
     ]
-    execute_batch_statement(client, orders_sql, orders_data)
+    sample = data[:100]
+    assert ([_dict_literal_parameter_set(row) for row in sample] == list(encoder.encode_rows(sample))
+            == list(encoder.encode_columns(list(zip(*sample)))))
 
-    print("Sample data inserted successfully.")
+    print(f"Encoding {len(data)} customers rows into Data API parameter sets:")
+    for label, encode in candidates:
+        # Best of five runs to reduce noise
+        best = min(_timed(encode) for _ in range(5))
+        print(f"  {label:28s} {len(data) / best:12.0f} rows/sec")
+
+def _timed(function):
+    """Return the wall time of one call."""
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+def _decode_decimal(field):
+    """Decode a DECIMAL cell (returned as stringValue) to Decimal."""
+    value = field.get('stringValue')
+    return None if value is None else Decimal(value)
+
+def _decode_datetime(field):
+    """Decode a TIMESTAMP/DATETIME cell to datetime."""
+    value = field.get('stringValue')
+    return None if value is None else datetime.fromisoformat(value)
+
+def _decode_date(field):
+    """Decode a DATE cell to date."""
+    value = field.get('stringValue')
+    return None if value is None else date.fromisoformat(value)
+
+# Decoder per MySQL type name reported in columnMetadata. NULL cells are
+# {'isNull': True}, so dict.get on the expected member already yields None.
+_RESULT_DECODERS = {
+    'long': methodcaller('get', 'longValue'),
+    'double': methodcaller('get', 'doubleValue'),
+    'boolean': methodcaller('get', 'booleanValue'),
+    'string': methodcaller('get', 'stringValue'),
+    'blob': methodcaller('get', 'blobValue'),
+    'decimal': _decode_decimal,
+    'datetime': _decode_datetime,
+    'date': _decode_date,
+}
+
+_RESULT_TYPE_NAMES = {
+    'long': ('TINYINT', 'SMALLINT', 'MEDIUMINT', 'INT', 'INTEGER', 'BIGINT', 'YEAR',
+             'TINYINT UNSIGNED', 'SMALLINT UNSIGNED', 'MEDIUMINT UNSIGNED', 'INT UNSIGNED',
+             'INTEGER UNSIGNED', 'BIGINT UNSIGNED'),
+    'double': ('FLOAT', 'DOUBLE', 'REAL'),
+    'boolean': ('BIT', 'BOOL', 'BOOLEAN'),
+    'blob': ('BLOB', 'TINYBLOB', 'MEDIUMBLOB', 'LONGBLOB', 'BINARY', 'VARBINARY'),
+    'decimal': ('DECIMAL', 'NUMERIC'),
+    'datetime': ('TIMESTAMP', 'DATETIME'),
+    'date': ('DATE',),
+}
+
+_KIND_BY_TYPE_NAME = {
+    type_name: kind
+    for kind, type_names in _RESULT_TYPE_NAMES.items()
+    for type_name in type_names
+}
+
+# Converters for formatRecordsAs='JSON', where values arrive as JSON scalars
+_JSON_CONVERTERS = {
+    'decimal': lambda value: value if value is None else Decimal(str(value)),
+    'datetime': lambda value: value if value is None else datetime.fromisoformat(value),
+    'date': lambda value: value if value is None else date.fromisoformat(value),
+}
+
+class ResultReader:
+    """Decodes Data API result sets using the column metadata of the first page.
+
+    The per-column decoders are chosen once; decoding a record is then a
+    straight zip over fields without any per-cell type checks.
+    """
+
+    def __init__(self, column_metadata):
+        self.names = tuple(column['name'] for column in column_metadata)
+        kinds = [_KIND_BY_TYPE_NAME.get(column.get('typeName', '').upper(), 'string')
+                 for column in column_metadata]
+        self.decoders = tuple(_RESULT_DECODERS[kind] for kind in kinds)
+        self.json_converters = tuple(_JSON_CONVERTERS.get(kind) for kind in kinds)
+
+    def rows(self, response):
+        """Return the decoded rows of a response as tuples."""
+        if 'formattedRecords' in response:
+            records = json.loads(response['formattedRecords'])
+            names = self.names
+            converters = self.json_converters
+            return [
+                tuple(convert(record.get(name)) if convert else record.get(name)
+                      for name, convert in zip(names, converters))
+                for record in records
+            ]
+        decoders = self.decoders
+        return [tuple(decode(field) for decode, field in zip(decoders, record))
+                for record in response.get('records', [])]
+
+def query(client, sql, parameters=None, as_json=False):
+    """Run a query and return (column names, rows as typed tuples)."""
+    options = {'includeResultMetadata': True}
+    if as_json:
+        options['formatRecordsAs'] = 'JSON'
+    response = execute_statement(client, sql, parameters, **options)
+    reader = ResultReader(response.get('columnMetadata', []))
+    return reader.names, reader.rows(response)
+
+def _is_response_too_large(error):
+    """Return True if the Data API rejected a result for exceeding its response size cap."""
+    return 'response size' in error.response.get('Error', {}).get('Message', '').lower()
+
+def iter_table_pages(client, table, key_column, columns='*', page_rows=READ_PAGE_ROWS, as_json=False):
+    """Yield (column names, rows) pages covering a whole table.
+
+    Pages follow the key with keyset pagination (WHERE key > :last ORDER BY key),
+    so every page is an index range scan and no page depends on OFFSET. A page
+    that exceeds the 1 MiB response cap is retried at half the size.
+    """
+    if columns != '*':
+        columns = ', '.join(columns)
+    reader = None
+    key_index = None
+    last_key = None
+
+    while True:
+        where = f"WHERE {key_column} > :last_key " if last_key is not None else ""
+        sql = f"SELECT {columns} FROM {table} {where}ORDER BY {key_column} LIMIT {page_rows}"
+        parameters = [{'name': 'last_key', 'value': {'longValue': last_key}}] if last_key is not None else None
+        options = {'includeResultMetadata': reader is None}
+        if as_json:
+            options['formatRecordsAs'] = 'JSON'
+        try:
+            response = execute_statement(client, sql, parameters, **options)
+        except ClientError as e:
+            if not _is_response_too_large(e) or page_rows <= MIN_READ_PAGE_ROWS:
+                raise
+            page_rows = max(MIN_READ_PAGE_ROWS, page_rows // 2)
+            continue
+
+        if reader is None:
+            reader = ResultReader(response.get('columnMetadata', []))
+            key_index = reader.names.index(key_column)
+        rows = reader.rows(response)
+        if rows:
+            yield reader.names, rows
+        if len(rows) < page_rows:
+            return
+        last_key = rows[-1][key_index]
+
+def read_table_columns(client, table, key_column, columns='*', page_rows=READ_PAGE_ROWS):
+    """Read a whole table into a dict of column name -> list of typed values."""
+    result = None
+    for names, rows in iter_table_pages(client, table, key_column, columns, page_rows):
+        if result is None:
+            result = {name: [] for name in names}
+        for name, values in zip(names, zip(*rows)):
+            result[name].extend(values)
+    return result or {}
+
+def export_tables(client, directory, page_rows=READ_PAGE_ROWS):
+    """Export every test table to CSV, one page in memory at a time."""
+    os.makedirs(directory, exist_ok=True)
+    for table in seed_data.TABLE_ORDER:
+        path = os.path.join(directory, f"{table}.csv")
+        exported = 0
+        started = time.time()
+        with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            header_written = False
+            for names, rows in iter_table_pages(client, table, seed_data.COLUMNS[table][0], page_rows=page_rows):
+                if not header_written:
+                    writer.writerow(names)
+                    header_written = True
+                writer.writerows(rows)
+                exported += len(rows)
+        print(f"Exported {exported} rows from {table} to {path} in {time.time() - started:.1f}s")
 
 def display_sample_data(client):
     """Display sample data from the tables."""
@@ -305,41 +1076,23 @@ def display_sample_data(client):
     # Show customers table
     print("\nCustomers Table:")
     print("-" * 30)
-    response = execute_statement(client, "SELECT * FROM customers LIMIT 5")
-    if 'records' in response:
-        for record in response['records']:
-            customer_id = record[0]['longValue'] if 'longValue' in record[0] else record[0]['stringValue']
-            first_name = record[1]['stringValue']
-            last_name = record[2]['stringValue']
-            email = record[3]['stringValue']
-            created_at = record[4]['stringValue']
-            print(f"ID: {customer_id}, Name: {first_name} {last_name}, Email: {email}, Created: {created_at}")
+    _, rows = query(client, "SELECT customer_id, first_name, last_name, email, created_at FROM customers LIMIT 5")
+    for customer_id, first_name, last_name, email, created_at in rows:
+        print(f"ID: {customer_id}, Name: {first_name} {last_name}, Email: {email}, Created: {created_at}")
 
     # Show products table
     print("\nProducts Table:")
     print("-" * 30)
-    response = execute_statement(client, "SELECT * FROM products LIMIT 5")
-    if 'records' in response:
-        for record in response['records']:
-            product_id = record[0]['longValue'] if 'longValue' in record[0] else record[0]['stringValue']
-            product_name = record[1]['stringValue']
-            description = record[2]['stringValue']
-            price = record[3]['doubleValue'] if 'doubleValue' in record[3] else record[3]['stringValue']
-            stock = record[4]['longValue'] if 'longValue' in record[4] else record[4]['stringValue']
-            print(f"ID: {product_id}, Name: {product_name}, Price: ${price}, Stock: {stock}")
+    _, rows = query(client, "SELECT product_id, product_name, price, stock_quantity FROM products LIMIT 5")
+    for product_id, product_name, price, stock in rows:
+        print(f"ID: {product_id}, Name: {product_name}, Price: ${price}, Stock: {stock}")
 
     # Show orders table
     print("\nOrders Table:")
     print("-" * 30)
-    response = execute_statement(client, "SELECT * FROM orders LIMIT 6")
-    if 'records' in response:
-        for record in response['records']:
-            order_id = record[0]['longValue'] if 'longValue' in record[0] else record[0]['stringValue']
-            customer_id = record[1]['longValue'] if 'longValue' in record[1] else record[1]['stringValue']
-            order_date = record[2]['stringValue']
-            total_amount = record[3]['doubleValue'] if 'doubleValue' in record[3] else record[3]['stringValue']
-            status = record[4]['stringValue']
-            print(f"Order ID: {order_id}, Customer: {customer_id}, Amount: ${total_amount}, Status: {status}")
+    _, rows = query(client, "SELECT order_id, customer_id, total_amount, status FROM orders LIMIT 6")
+    for order_id, customer_id, total_amount, status in rows:
+        print(f"Order ID: {order_id}, Customer: {customer_id}, Amount: ${total_amount}, Status: {status}")
 
     # Show JOIN example
     print("\nCustomer Orders (JOIN Example):")
@@ -357,21 +1110,21 @@ def display_sample_data(client):
         orders o ON c.customer_id = o.customer_id
     LIMIT 10
     """
-    response = execute_statement(client, join_sql)
-    if 'records' in response:
-        for record in response['records']:
-            first_name = record[0]['stringValue']
-            last_name = record[1]['stringValue']
-            order_id = record[2]['longValue'] if 'longValue' in record[2] else record[2]['stringValue']
-            total_amount = record[3]['doubleValue'] if 'doubleValue' in record[3] else record[3]['stringValue']
-            status = record[4]['stringValue']
-            print(f"{first_name} {last_name} - Order #{order_id}: ${total_amount} ({status})")
+    _, rows = query(client, join_sql)
+    for first_name, last_name, order_id, total_amount, status in rows:
+        print(f"{first_name} {last_name} - Order #{order_id}: ${total_amount} ({status})")
 
 def main():
     """Main function to execute the script."""
     global DATABASE_NAME
 
     check_requirements()
+    args = parse_args()
+    statement_trace.start(args)
+
+    if args.benchmark_encoder:
+        benchmark_parameter_encoding(args.benchmark_encoder, args.seed)
+        return
 
     print("Script to insert test data into Aurora MySQL using Data API")
     print(f"Target Aurora Cluster: {RESOURCE_ARN}")
@@ -380,9 +1133,26 @@ def main():
         # Get RDS Data client
         client = get_rds_data_client()
 
+        # Wake a paused cluster while the dataset is generated, instead of
+        # blocking in the first statement
+        warmup = None if args.no_warmup else ClusterWarmup(client, args.resume_timeout)
+        prefetched = None
+        if args.scale and not (args.export or args.async_inflight):
+            prefetched = prefetch_dataset(args.scale, args.seed, args.prefetch_rows)
+        if warmup:
+            print("Waiting for the cluster to answer...")
+            warmup.wait()
+            warmup.report(prefetch_busy_until(prefetched) if prefetched else None)
+            if prefetched:
+                print(f"  {sum(rows.encoded for rows in prefetched.values())} rows generated and encoded by then")
+
         # Get or create database
         DATABASE_NAME = get_or_create_database(client)
 
+        if args.export:
+            export_tables(client, args.export)
+            return
+
         # Confirm before proceeding
         if not confirm_operation():
             print("Operation cancelled.")
@@ -392,7 +1162,16 @@ def main():
         create_tables(client)
 
         # Insert sample data
-        insert_sample_data(client)
+        if args.async_inflight:
+            asyncio.run(async_loader.load_data_api(client, args.scale, args.seed, DATABASE_NAME,
+                                                   inflight=args.async_inflight,
+                                                   max_rows=args.max_batch_rows, max_bytes=args.max_batch_bytes))
+        elif args.scale:
+            insert_generated_data(client, args.scale, args.seed, args.max_batch_rows,
+                                  args.max_batch_bytes, args.concurrency,
+                                  args.commit_rows, args.commit_bytes, prefetched)
+        else:
+            insert_sample_data(client)
 
         # Display sample data
         display_sample_data(client)
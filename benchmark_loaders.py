@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+
+"""Benchmark the test data loaders at several scale factors.
+
+Paths:
+  pymysql       rds_insert_test_data.py multi-row INSERTs against a local MySQL
+  pymysql-bulk  rds_insert_test_data.py LOAD DATA LOCAL INFILE against a local MySQL
+  data-api      aurora_data_api_insert_test_data.py against an in-process fake
+                rds-data client with injectable latency and, with
+                --resume-delay, a simulated auto-paused cluster
+  mysql-cli     reset_and_insert_data.sh (mysql client) against a local MySQL
+
+Each (path, scale) run happens in its own subprocess so peak RSS is measured
+per run. Results are printed as JSON and can be compared with a stored
+baseline to flag regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+
+import seed_data
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PATHS = ('pymysql', 'pymysql-bulk', 'data-api', 'mysql-cli')
+MYSQL_PATHS = ('pymysql', 'pymysql-bulk', 'mysql-cli')
+
+DEFAULT_SCALES = '1,5,10'
+DEFAULT_THRESHOLD = 0.10
+
+def mysql_settings():
+    """Return local MySQL connection settings from the same variables as set_db_credentials.sh."""
+    return {
+        'host': os.environ.get('MYSQL_HOST', ''),
+        'port': int(os.environ.get('MYSQL_PORT', '3306')),
+        'user': os.environ.get('MYSQL_USER', ''),
+        'password': os.environ.get('MYSQL_PASS', ''),
+        'database': os.environ.get('MYSQL_DB', ''),
+    }
+
+def peak_rss_bytes(who=resource.RUSAGE_SELF):
+    """Return the peak resident set size in bytes (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class PhaseTimer:
+    """Accumulates wall time per named phase."""
+
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def time(self, phase):
+        timer = self
+
+        class _Phase:
+            def __enter__(self):
+                self.started = time.perf_counter()
+
+            def __exit__(self, *exc):
+                timer.add(phase, time.perf_counter() - self.started)
+
+        return _Phase()
+
+def timed_rows(rows, timer):
+    """Wrap a row generator, charging the time spent producing rows to the 'generate' phase."""
+    rows = iter(rows)
+    clock = time.perf_counter
+    spent = 0.0
+    try:
+        while True:
+            started = clock()
+            try:
+                row = next(rows)
+            except StopIteration:
+                return
+            spent += clock() - started
+            yield row
+    finally:
+        timer.add('generate', spent)
+
+def _server_bytes_received(cursor):
+    """Return the server's global Bytes_received counter (bytes sent by all clients)."""
+    cursor.execute("SHOW GLOBAL STATUS LIKE 'Bytes_received'")
+    return int(cursor.fetchone()[1])
+
+def _count_rows(cursor, table):
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return cursor.fetchone()[0]
+
+def run_pymysql(scale, seed, bulk=False, batch_size=seed_data.DEFAULT_BATCH_SIZE):
+    """Load through rds_insert_test_data.py into the local MySQL."""
+    import rds_insert_test_data as rds
+
+    settings = mysql_settings()
+    timer = PhaseTimer()
+    connection = rds.open_connection(settings['host'], settings['user'], settings['password'],
+                                     settings['database'], port=settings['port'], local_infile=bulk)
+    try:
+        if bulk and not rds.local_infile_enabled(connection):
+            raise RuntimeError("local_infile is disabled on the benchmark server")
+        load_rows = rds.bulk_load_rows if bulk else (
+            lambda conn, table, columns, rows: rds.insert_rows(conn, table, columns, rows, batch_size))
+
+        with connection.cursor() as cursor:
+            bytes_before = _server_bytes_received(cursor)
+
+        with timer.time('ddl'):
+            with connection.cursor() as cursor:
+                rds.create_tables(cursor)
+            connection.commit()
+
+        inserted = {}
+        with timer.time('load'):
+            for table in seed_data.TABLE_ORDER:
+                rows = timed_rows(seed_data.generate_rows(table, scale, seed), timer)
+                inserted[table] = load_rows(connection, table, seed_data.COLUMNS[table], rows)
+
+        with timer.time('verify'):
+            with connection.cursor() as cursor:
+                counts = {table: _count_rows(cursor, table) for table in seed_data.TABLE_ORDER}
+
+        with connection.cursor() as cursor:
+            bytes_sent = _server_bytes_received(cursor) - bytes_before
+    finally:
+        connection.close()
+
+    return inserted, counts, bytes_sent, timer.phases
+
+class FakeRdsDataClient:
+    """In-process stand-in for the boto3 rds-data client.
+
+    Every call sleeps `latency` seconds plus `per_kib` seconds per KiB of
+    request payload, and counts the JSON size of what a real client would
+    send. Inserted rows are only counted, per table. For the first
+    `resume_delay` seconds every call fails with DatabaseResumingException,
+    as on an auto-paused Aurora Serverless cluster.
+    """
+
+    def __init__(self, latency=0.02, per_kib=0.0, resume_delay=0.0):
+        self.latency = latency
+        self.per_kib = per_kib
+        self.resumed_at = time.monotonic() + resume_delay
+        self.bytes_sent = 0
+        self.calls = 0
+        self.rows = {}
+        self.lock = threading.Lock()
+
+    def _request(self, kwargs):
+        size = len(json.dumps(kwargs, default=str))
+        with self.lock:
+            self.bytes_sent += size
+            self.calls += 1
+        time.sleep(self.latency + self.per_kib * size / 1024)
+        if time.monotonic() < self.resumed_at:
+            from botocore.exceptions import ClientError
+            raise ClientError({'Error': {'Code': 'DatabaseResumingException',
+                                         'Message': "The Aurora DB instance is resuming after being auto-paused"}},
+                              'ExecuteStatement')
+
+    def execute_statement(self, **kwargs):
+        self._request(kwargs)
+        sql = kwargs['sql'].strip()
+        if sql.upper().startswith('SELECT COUNT(*) FROM'):
+            table = sql.split()[-1]
+            response = {'records': [[{'longValue': self.rows.get(table, 0)}]]}
+            if kwargs.get('includeResultMetadata'):
+                response['columnMetadata'] = [{'name': 'COUNT(*)', 'typeName': 'BIGINT'}]
+            return response
+        return {'numberOfRecordsUpdated': 0, 'records': []}
+
+    def batch_execute_statement(self, **kwargs):
+        self._request(kwargs)
+        table = kwargs['sql'].split()[2]
+        with self.lock:
+            self.rows[table] = self.rows.get(table, 0) + len(kwargs['parameterSets'])
+        return {'updateResults': [{} for _ in kwargs['parameterSets']]}
+
+    def begin_transaction(self, **kwargs):
+        self._request(kwargs)
+        return {'transactionId': f"tx-{self.calls}"}
+
+    def commit_transaction(self, **kwargs):
+        self._request(kwargs)
+        return {'transactionStatus': 'Transaction Committed'}
+
+    def rollback_transaction(self, **kwargs):
+        self._request(kwargs)
+        return {'transactionStatus': 'Rollback Complete'}
+
+def run_data_api(scale, seed, latency=0.02, per_kib=0.0, resume_delay=0.0):
+    """Load through aurora_data_api_insert_test_data.py into a fake rds-data client.
+
+    With a `resume_delay`, the client starts paused and the load goes through
+    the warm-up path: a background wake-up probe while the dataset is
+    generated ahead. Returns the probe summary as the last item (or None).
+    """
+    import aurora_data_api_insert_test_data as aurora
+
+    aurora.DATABASE_NAME = 'benchmark'
+    client = FakeRdsDataClient(latency, per_kib, resume_delay)
+    timer = PhaseTimer()
+
+    warmup = prefetched = None
+    if resume_delay:
+        warmup = aurora.ClusterWarmup(client)
+        prefetched = aurora.prefetch_dataset(scale, seed)
+        with timer.time('resume_wait'):
+            warmup.wait()
+        busy_until = aurora.prefetch_busy_until(prefetched)
+
+    with timer.time('ddl'):
+        aurora.create_tables(client)
+
+    inserted = {}
+    with timer.time('load'):
+        for table in seed_data.TABLE_ORDER:
+            encoder = aurora.table_encoder(table)
+            if prefetched:
+                parameter_sets = prefetched[table]
+            else:
+                parameter_sets = encoder.encode_rows(timed_rows(seed_data.generate_rows(table, scale, seed), timer))
+            inserted[table] = aurora.execute_batch_statement_chunked(
+                client, aurora.insert_statement(table, encoder.names), parameter_sets)
+
+    with timer.time('verify'):
+        counts = {table: aurora.query(client, f"SELECT COUNT(*) FROM {table}")[1][0][0]
+                  for table in seed_data.TABLE_ORDER}
+
+    cold_start = warmup.summary(busy_until) if warmup else None
+    return inserted, counts, client.bytes_sent, timer.phases, cold_start
+
+def expected_row_counts(scale, seed):
+    """Return the row count of every table in the generated dataset."""
+    counts = {table: seed_data.table_row_count(table, scale) for table in seed_data.TABLE_ORDER}
+    # order_items has one to MAX_ITEMS_PER_ORDER rows per order key
+    counts['order_items'] = sum(1 for _ in seed_data.generate_rows('order_items', scale, seed))
+    return counts
+
+def run_mysql_cli(scale, seed):
+    """Run reset_and_insert_data.sh with generated data against the local MySQL."""
+    import pymysql
+
+    settings = mysql_settings()
+    connection = pymysql.connect(host=settings['host'], port=settings['port'], user=settings['user'],
+                                 password=settings['password'], database=settings['database'])
+    with tempfile.NamedTemporaryFile('w', suffix='.sh', delete=False) as credentials:
+        for name in ('MYSQL_HOST', 'MYSQL_PORT', 'MYSQL_USER', 'MYSQL_PASS', 'MYSQL_DB'):
+            credentials.write(f"export {name}={json.dumps(os.environ.get(name, ''))}\n")
+    env = dict(os.environ, DB_CREDENTIALS_FILE=credentials.name, SCALE=str(scale), SEED=str(seed))
+    timer = PhaseTimer()
+    try:
+        with connection.cursor() as cursor:
+            bytes_before = _server_bytes_received(cursor)
+        # The script interleaves DDL and loading, so only its total time is reported as 'load'
+        with timer.time('load'):
+            subprocess.run(['bash', os.path.join(SCRIPT_DIR, 'reset_and_insert_data.sh')], env=env,
+                           check=True, stdout=subprocess.DEVNULL)
+        with timer.time('verify'):
+            with connection.cursor() as cursor:
+                counts = {table: _count_rows(cursor, table) for table in seed_data.TABLE_ORDER}
+        with connection.cursor() as cursor:
+            bytes_sent = _server_bytes_received(cursor) - bytes_before
+    finally:
+        connection.close()
+        os.unlink(credentials.name)
+
+    # The script reports no row counts of its own, so the server's are checked against the dataset
+    return expected_row_counts(scale, seed), counts, bytes_sent, timer.phases
+
+def run_one(path, scale, seed, latency, resume_delay=0.0):
+    """Run a single benchmark and return its result record."""
+    started = time.perf_counter()
+    cold_start = None
+    if path == 'pymysql':
+        inserted, counts, bytes_sent, phases = run_pymysql(scale, seed)
+    elif path == 'pymysql-bulk':
+        inserted, counts, bytes_sent, phases = run_pymysql(scale, seed, bulk=True)
+    elif path == 'data-api':
+        inserted, counts, bytes_sent, phases, cold_start = run_data_api(scale, seed, latency,
+                                                                        resume_delay=resume_delay)
+    elif path == 'mysql-cli':
+        inserted, counts, bytes_sent, phases = run_mysql_cli(scale, seed)
+    else:
+        raise ValueError(f"Unknown path: {path}")
+    elapsed = time.perf_counter() - started
+
+    rows = sum(inserted.values())
+    load_seconds = phases.get('load', elapsed)
+    record = {
+        'path': path,
+        'scale': scale,
+        'seed': seed,
+        'rows': rows,
+        'rows_per_sec': rows / max(load_seconds, 1e-9),
+        'bytes_sent': bytes_sent,
+        'peak_rss_bytes': max(peak_rss_bytes(), peak_rss_bytes(resource.RUSAGE_CHILDREN)),
+        'phases': {phase: round(seconds, 4) for phase, seconds in phases.items()},
+        'elapsed': round(elapsed, 4),
+        'verified': counts == inserted,
+    }
+    if cold_start:
+        record['cold_start'] = cold_start
+    return record
+
+def run_isolated(path, scale, seed, latency, resume_delay=0.0):
+    """Run one benchmark in a fresh interpreter so its peak RSS is its own."""
+    command = [sys.executable, os.path.abspath(__file__), '--run-one', path, '--scales', str(scale),
+               '--seed', str(seed), '--latency', str(latency), '--resume-delay', str(resume_delay)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'path': path, 'scale': scale, 'error': completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare_with_baseline(results, baseline, threshold):
+    """Return regression messages for runs slower or bigger than the baseline by more than `threshold`."""
+    previous = {(run['path'], run['scale']): run for run in baseline.get('runs', []) if 'error' not in run}
+    regressions = []
+    for run in results['runs']:
+        old = previous.get((run['path'], run['scale']))
+        if old is None or 'error' in run:
+            continue
+        if run['rows_per_sec'] < old['rows_per_sec'] * (1 - threshold):
+            regressions.append(f"{run['path']} scale {run['scale']}: {run['rows_per_sec']:.0f} rows/sec "
+                               f"vs baseline {old['rows_per_sec']:.0f}")
+        if run['peak_rss_bytes'] > old['peak_rss_bytes'] * (1 + threshold):
+            regressions.append(f"{run['path']} scale {run['scale']}: peak RSS {run['peak_rss_bytes']} bytes "
+                               f"vs baseline {old['peak_rss_bytes']}")
+    return regressions
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Benchmark the test data loaders")
+    parser.add_argument('--paths', default=','.join(PATHS),
+                        help=f"Comma-separated loader paths to run (default: {','.join(PATHS)})")
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"Comma-separated scale factors (default: {DEFAULT_SCALES})")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed for generated data")
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help="Per-call latency in seconds for the fake Data API endpoint (default: 0.02)")
+    parser.add_argument('--resume-delay', type=float, default=0.0,
+                        help="Start the fake Data API endpoint paused for this many seconds, as an auto-paused "
+                             "Aurora Serverless cluster, and load through the warm-up path (default: 0)")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--baseline', help="Compare against a previously saved JSON report")
+    parser.add_argument('--save-baseline', help="Also save the report as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative change that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--run-one', choices=PATHS, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def main():
+    """Run the benchmark matrix and report JSON."""
+    args = parse_args()
+    scales = [int(scale) for scale in args.scales.split(',')]
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, scales[0], args.seed, args.latency, args.resume_delay)))
+        return 0
+
+    paths = args.paths.split(',')
+    if not os.environ.get('MYSQL_HOST'):
+        skipped = [path for path in paths if path in MYSQL_PATHS]
+        if skipped:
+            print(f"MYSQL_HOST is not set; skipping {', '.join(skipped)}", file=sys.stderr)
+        paths = [path for path in paths if path not in MYSQL_PATHS]
+
+    results = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                        'data_api_latency': args.latency, 'data_api_resume_delay': args.resume_delay},
+        'runs': [],
+    }
+    for path in paths:
+        for scale in scales:
+            print(f"Running {path} at scale {scale}...", file=sys.stderr)
+            results['runs'].append(run_isolated(path, scale, args.seed, args.latency, args.resume_delay))
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_with_baseline(results, json.load(baseline_file), args.threshold)
+        results['regressions'] = regressions
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as baseline_file:
+            baseline_file.write(report + "\n")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
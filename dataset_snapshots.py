@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+"""Local cache of compressed snapshots of generated test datasets.
+
+A snapshot holds one gzip-compressed CSV file per table (in the dialect
+written by seed_data.write_csv) plus a manifest with each file's row count,
+size, SHA-256 and row digest (seed_data.RowDigest). Snapshots are keyed by
+(schema version, seed, scale), so a reset that would regenerate an identical
+dataset can load it from disk instead. The cache is bounded in size; the least recently used snapshots are
+evicted first.
+"""
+
+import os
+import csv
+import sys
+import json
+import gzip
+import time
+import shutil
+import hashlib
+import argparse
+
+import seed_data
+
+DEFAULT_CACHE_DIR = os.environ.get('SNAPSHOT_CACHE_DIR',
+                                   os.path.join(os.path.expanduser('~'), '.cache', 'mcp-test-data'))
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+
+MANIFEST = 'manifest.json'
+HASH_CHUNK_BYTES = 1024 * 1024
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing files or fails its integrity check."""
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as snapshot_file:
+        for chunk in iter(lambda: snapshot_file.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+class Snapshot:
+    """A verified snapshot in the cache."""
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+
+    def table_path(self, table):
+        """Return the path of a table's compressed CSV file."""
+        return os.path.join(self.path, self.manifest['tables'][table]['file'])
+
+    def row_count(self, table):
+        return self.manifest['tables'][table]['rows']
+
+    def digest(self, table):
+        """Return the seed_data.RowDigest recorded for a table's rows."""
+        return seed_data.RowDigest(*self.manifest['tables'][table]['digest'])
+
+    def open_table(self, table):
+        """Open a table's CSV for reading as a decompressing binary stream."""
+        return gzip.open(self.table_path(table), 'rb')
+
+    def table_rows(self, table):
+        """Yield a table's rows as tuples of strings (None for NULL), decompressing as it goes."""
+        with gzip.open(self.table_path(table), 'rt', newline='', encoding='utf-8') as csv_file:
+            for row in csv.reader(csv_file):
+                yield tuple(None if value == 'NULL' else value for value in row)
+
+class SnapshotWriter:
+    """Writes a snapshot into a temporary directory and publishes it on success.
+
+    Use as a context manager; wrap each table's row iterator with tee(). The
+    snapshot only becomes visible in the cache if the block exits cleanly.
+    """
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.path = os.path.join(cache.directory, f".{key}.{os.getpid()}.tmp")
+        self.tables = {}
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        return self
+
+    def tee(self, table, rows, digest):
+        """Yield rows unchanged while appending them to the table's compressed CSV.
+
+        `digest` is the seed_data.RowDigest the rows are tracked into; it is
+        recorded in the manifest once the table is complete so restores can
+        be verified without regenerating the rows.
+        """
+        filename = f"{table}.csv.gz"
+        count = 0
+        # Low compression level: snapshots are written during a load and must not slow it down
+        with gzip.open(os.path.join(self.path, filename), 'wt', newline='', encoding='utf-8',
+                       compresslevel=1) as csv_file:
+            for chunk in seed_data.chunked(rows, seed_data.DEFAULT_BATCH_SIZE):
+                seed_data.write_csv(chunk, csv_file)
+                count += len(chunk)
+                yield from chunk
+        self.tables[table] = {'file': filename, 'rows': count, 'digest': list(digest.as_tuple())}
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            return False
+        for table, entry in self.tables.items():
+            file_path = os.path.join(self.path, entry['file'])
+            entry['bytes'] = os.path.getsize(file_path)
+            entry['sha256'] = _file_sha256(file_path)
+        manifest = {'key': self.key, 'created_at': time.time(), 'tables': self.tables}
+        with open(os.path.join(self.path, MANIFEST), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        self.cache.publish(self.path, self.key)
+        return False
+
+class SnapshotCache:
+    """Size-bounded, least-recently-used cache of dataset snapshots."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(schema_version, seed, scale):
+        """Return the cache key of a generated dataset."""
+        identity = json.dumps([seed_data.DATASET_VERSION, seed_data.ROW_DIGEST_VERSION, schema_version, seed, scale])
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:24]
+
+    def path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key, tables=seed_data.TABLE_ORDER):
+        """Return the verified snapshot for a key, or None if absent or corrupt.
+
+        A snapshot that fails verification is deleted so it gets rewritten.
+        """
+        path = self.path(key)
+        try:
+            with open(os.path.join(path, MANIFEST)) as manifest_file:
+                manifest = json.load(manifest_file)
+            self.verify(path, manifest, tables)
+        except FileNotFoundError:
+            return None
+        except (SnapshotError, ValueError, KeyError) as e:
+            print(f"Warning: discarding snapshot {key}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        # The manifest's mtime is the snapshot's last use, for LRU eviction
+        os.utime(os.path.join(path, MANIFEST))
+        return Snapshot(path, manifest)
+
+    @staticmethod
+    def verify(path, manifest, tables):
+        """Check that every table file is present with the recorded size and SHA-256."""
+        for table in tables:
+            if table not in manifest['tables']:
+                raise SnapshotError(f"no data for table {table}")
+            entry = manifest['tables'][table]
+            if 'digest' not in entry:
+                raise SnapshotError(f"{entry['file']} has no row digest (written by an older version)")
+            file_path = os.path.join(path, entry['file'])
+            if not os.path.exists(file_path):
+                raise SnapshotError(f"missing {entry['file']}")
+            if os.path.getsize(file_path) != entry['bytes']:
+                raise SnapshotError(f"{entry['file']} has the wrong size")
+            if _file_sha256(file_path) != entry['sha256']:
+                raise SnapshotError(f"{entry['file']} fails its checksum")
+
+    def writer(self, key):
+        """Return a SnapshotWriter that publishes under `key` when it completes."""
+        return SnapshotWriter(self, key)
+
+    def publish(self, temporary_path, key):
+        """Move a completed snapshot into place, then evict down to the size bound."""
+        path = self.path(key)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(temporary_path, path)
+        self.evict(keep=key)
+
+    def entries(self):
+        """Return (last used, size, key) for every published snapshot, oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            manifest_path = os.path.join(entry.path, MANIFEST)
+            if entry.is_dir() and not entry.name.startswith('.') and os.path.exists(manifest_path):
+                entries.append((os.path.getmtime(manifest_path), _directory_size(entry.path), entry.name))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """Delete least recently used snapshots until the cache fits in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            total -= size
+            print(f"Evicted snapshot {key} ({size} bytes)")
+
+def main():
+    """List or clear the snapshot cache."""
+    parser = argparse.ArgumentParser(description="Manage the generated dataset snapshot cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f"Snapshot cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--clear', action='store_true', help="Delete every snapshot")
+    args = parser.parse_args()
+
+    cache = SnapshotCache(args.cache_dir)
+    for last_used, size, key in cache.entries():
+        if args.clear:
+            shutil.rmtree(cache.path(key), ignore_errors=True)
+            print(f"Deleted {key}")
+        else:
+            print(f"{key}  {size:>12} bytes  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(last_used))}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+
+"""Create the DynamoDB test tables and load the generated test dataset.
+
+Customers, Products and Orders hold the same rows seed_data.py generates for
+MySQL; each order item embeds its line items. Items are written with
+BatchWriteItem in groups of 25 from parallel workers, and UnprocessedItems
+are retried with jittered exponential backoff.
+
+Works against DynamoDB Local or a moto server via --endpoint-url:
+
+    python3 dynamodb_insert_test_data.py --scale 1 --endpoint-url http://localhost:8000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError, BotoCoreError
+
+import seed_data
+
+BATCH_WRITE_ITEMS = 25
+DEFAULT_WORKERS = 8
+MAX_BATCH_RETRIES = 10
+MAX_BACKOFF_SECONDS = 20.0
+
+THROTTLING_ERROR_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+)
+
+# Table name, key schema and seed_data table of every DynamoDB table
+TABLES = {
+    'Customers': {'source': 'customers', 'keys': (('CustomerId', 'HASH'),)},
+    'Products': {'source': 'products', 'keys': (('ProductId', 'HASH'),)},
+    'Orders': {'source': 'orders', 'keys': (('CustomerId', 'HASH'), ('OrderId', 'RANGE'))},
+}
+STATUS_INDEX = 'StatusShardIndex'
+
+def check_requirements():
+    """Check if required modules are installed."""
+    try:
+        import boto3
+    except ImportError:
+        print("Error: boto3 module is required but not installed.")
+        print("Please install it using: pip install boto3")
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Create DynamoDB test tables and load generated data")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Scale factor of the generated dataset (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Parallel BatchWriteItem workers (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--write-shards', type=int, metavar='N',
+                        help="Add a StatusShard attribute (status#0 .. status#N-1) and a GSI on it, "
+                             "spreading writes for each order status over N partitions")
+    parser.add_argument('--endpoint-url', default=os.environ.get('DYNAMODB_ENDPOINT_URL'),
+                        help="DynamoDB endpoint, e.g. http://localhost:8000 for DynamoDB Local "
+                             "(default: $DYNAMODB_ENDPOINT_URL or AWS)")
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help="AWS region (default: $AWS_REGION or us-east-1)")
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be a positive integer")
+    if args.workers < 1:
+        parser.error("--workers must be a positive integer")
+    if args.write_shards is not None and args.write_shards < 1:
+        parser.error("--write-shards must be a positive integer")
+    return args
+
+def get_dynamodb_client(region, endpoint_url=None):
+    """Create and return a DynamoDB client."""
+    try:
+        # Retries are handled per batch below, with backoff on UnprocessedItems as well
+        return boto3.client('dynamodb', region_name=region, endpoint_url=endpoint_url,
+                            config=Config(retries={'max_attempts': 1}, max_pool_connections=64))
+    except Exception as e:
+        print(f"Error creating DynamoDB client: {e}")
+        sys.exit(1)
+
+def customer_id(key):
+    return f"CUST{key:03d}"
+
+def product_id(key):
+    return f"PROD{key:03d}"
+
+def order_id(key):
+    # Zero-padded so the sort key orders a customer's orders numerically
+    return f"ORD{key:08d}"
+
+def customer_item(row):
+    """Convert a generated customers row to a DynamoDB item."""
+    key, first_name, last_name, email, created_at = row
+    return {
+        'CustomerId': {'S': customer_id(key)},
+        'FirstName': {'S': first_name},
+        'LastName': {'S': last_name},
+        'Email': {'S': email},
+        'CreatedAt': {'S': created_at},
+    }
+
+def product_item(row):
+    """Convert a generated products row to a DynamoDB item."""
+    key, name, description, price, stock_quantity = row
+    return {
+        'ProductId': {'S': product_id(key)},
+        'Name': {'S': name},
+        'Description': {'S': description},
+        'Price': {'N': price},
+        'StockQuantity': {'N': str(stock_quantity)},
+    }
+
+def order_item(row, line_items, write_shards=None):
+    """Convert a generated orders row and its order_items rows to one DynamoDB item."""
+    key, customer_key, order_date, total_amount, status = row
+    item = {
+        'CustomerId': {'S': customer_id(customer_key)},
+        'OrderId': {'S': order_id(key)},
+        'OrderDate': {'S': order_date},
+        'TotalAmount': {'N': total_amount},
+        'Status': {'S': status},
+        'Items': {'L': [
+            {'M': {'ProductId': {'S': product_id(product_key)}, 'Quantity': {'N': str(quantity)},
+                   'UnitPrice': {'N': unit_price}}}
+            for _, _, product_key, quantity, unit_price in line_items
+        ]},
+    }
+    if write_shards:
+        item['StatusShard'] = {'S': f"{status}#{key % write_shards}"}
+    return item
+
+def generate_items(table, scale, seed, start, stop, write_shards=None):
+    """Yield the DynamoDB items of a table for generation keys in [start, stop)."""
+    source = TABLES[table]['source']
+    if source == 'customers':
+        for row in seed_data.generate_rows(source, scale, seed, start, stop):
+            yield customer_item(row)
+    elif source == 'products':
+        for row in seed_data.generate_rows(source, scale, seed, start, stop):
+            yield product_item(row)
+    else:
+        products = seed_data.table_row_count('products', scale)
+        for row in seed_data.generate_rows(source, scale, seed, start, stop):
+            yield order_item(row, seed_data.order_item_rows(seed, row[0], products), write_shards)
+
+def table_definition(table, write_shards=None):
+    """Return the CreateTable parameters of a table."""
+    keys = TABLES[table]['keys']
+    attributes = [name for name, _ in keys]
+    definition = {
+        'TableName': table,
+        'KeySchema': [{'AttributeName': name, 'KeyType': key_type} for name, key_type in keys],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+    if table == 'Orders' and write_shards:
+        attributes += ['StatusShard', 'OrderDate']
+        definition['GlobalSecondaryIndexes'] = [{
+            'IndexName': STATUS_INDEX,
+            'KeySchema': [{'AttributeName': 'StatusShard', 'KeyType': 'HASH'},
+                          {'AttributeName': 'OrderDate', 'KeyType': 'RANGE'}],
+            'Projection': {'ProjectionType': 'ALL'},
+        }]
+    definition['AttributeDefinitions'] = [{'AttributeName': name, 'AttributeType': 'S'} for name in attributes]
+    return definition
+
+def create_tables(client, write_shards=None):
+    """Drop and recreate the test tables, waiting until they are active."""
+    existing = set(client.list_tables()['TableNames'])
+    for table in TABLES:
+        if table in existing:
+            print(f"Deleting existing {table} table...")
+            client.delete_table(TableName=table)
+            client.get_waiter('table_not_exists').wait(TableName=table)
+    for table in TABLES:
+        print(f"Creating {table} table...")
+        client.create_table(**table_definition(table, write_shards))
+    for table in TABLES:
+        client.get_waiter('table_exists').wait(TableName=table)
+
+def is_throttling_error(error):
+    """Return True if a ClientError means DynamoDB is shedding load."""
+    return error.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+class LoadStats:
+    """Thread-safe per-table counters of items written, consumed capacity and retries."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = {}
+        self.capacity = {}
+        self.retries = 0
+
+    def record(self, table, items, consumed_capacity):
+        with self.lock:
+            self.items[table] = self.items.get(table, 0) + items
+            for entry in consumed_capacity:
+                name = entry['TableName']
+                self.capacity[name] = self.capacity.get(name, 0.0) + entry.get('CapacityUnits', 0.0)
+
+    def retried(self):
+        with self.lock:
+            self.retries += 1
+
+def batch_write(client, table, items, stats):
+    """Write up to 25 items, retrying unprocessed items and throttling with jittered backoff."""
+    pending = [{'PutRequest': {'Item': item}} for item in items]
+    for attempt in range(MAX_BATCH_RETRIES + 1):
+        try:
+            response = client.batch_write_item(RequestItems={table: pending}, ReturnConsumedCapacity='TOTAL')
+        except ClientError as e:
+            if not is_throttling_error(e) or attempt == MAX_BATCH_RETRIES:
+                raise
+        else:
+            unprocessed = response.get('UnprocessedItems', {}).get(table, [])
+            stats.record(table, len(pending) - len(unprocessed), response.get('ConsumedCapacity', []))
+            if not unprocessed:
+                return
+            pending = unprocessed
+        if attempt == MAX_BATCH_RETRIES:
+            break
+        stats.retried()
+        # Full jitter exponential backoff
+        time.sleep(random.uniform(0, min(MAX_BACKOFF_SECONDS, 0.05 * 2 ** attempt)))
+    raise RuntimeError(f"{len(pending)} items for {table} still unprocessed after {MAX_BATCH_RETRIES} retries")
+
+def load_range(client, table, scale, seed, start, stop, stats, write_shards=None):
+    """Generate one key range of a table and write it in BatchWriteItem groups."""
+    for batch in seed_data.chunked(generate_items(table, scale, seed, start, stop, write_shards),
+                                   BATCH_WRITE_ITEMS):
+        batch_write(client, table, batch, stats)
+
+def load_tables(client, scale, seed, workers=DEFAULT_WORKERS, write_shards=None):
+    """Load every table by key range over `workers` threads and report throughput.
+
+    Returns the LoadStats of the run.
+    """
+    stats = LoadStats()
+    # DynamoDB has no foreign keys, so ranges of every table load at once
+    ranges = [(table, start, stop) for table, definition in TABLES.items()
+              for start, stop in seed_data.key_ranges(definition['source'], scale, workers * 4)]
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dynamodb') as pool:
+        futures = [pool.submit(load_range, client, table, scale, seed, start, stop, stats, write_shards)
+                   for table, start, stop in ranges]
+        for future in futures:
+            future.result()
+    elapsed = time.time() - started
+
+    print("\nLoad summary:")
+    for table in TABLES:
+        items = stats.items.get(table, 0)
+        print(f"  {table}: {items} items, {stats.capacity.get(table, 0.0):.1f} write capacity units")
+    total = sum(stats.items.values())
+    print(f"  total: {total} items in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} items/sec), "
+          f"{sum(stats.capacity.values()):.1f} write capacity units, {stats.retries} retried batches")
+    return stats
+
+def display_sample_data(client):
+    """Show a customer's orders, as the DynamoDB MCP server would query them."""
+    response = client.query(TableName='Orders', KeyConditionExpression='CustomerId = :customer',
+                            ExpressionAttributeValues={':customer': {'S': customer_id(1)}})
+    print(f"\nOrders of {customer_id(1)}:")
+    for item in response['Items']:
+        print(f"- {item['OrderId']['S']}: ${item['TotalAmount']['N']} ({item['Status']['S']}), "
+              f"{len(item['Items']['L'])} items")
+
+def confirm_operation(region, endpoint_url):
+    """Ask user for confirmation before proceeding."""
+    print(f"You are about to reset and insert test data into DynamoDB tables {', '.join(TABLES)}")
+    print(f"Endpoint: {endpoint_url or 'AWS'} ({region})")
+    confirm = input("Continue? (y/n): ")
+    return confirm.lower() in ['y', 'yes']
+
+def main():
+    """Main function to execute the script."""
+    check_requirements()
+    args = parse_args()
+
+    print("Script to insert test data into DynamoDB")
+    if not confirm_operation(args.region, args.endpoint_url):
+        print("Operation cancelled.")
+        sys.exit(0)
+
+    try:
+        client = get_dynamodb_client(args.region, args.endpoint_url)
+        create_tables(client, args.write_shards)
+        print(f"Loading generated data (scale {args.scale}, seed {args.seed}) with {args.workers} workers...")
+        load_tables(client, args.scale, args.seed, args.workers, args.write_shards)
+        display_sample_data(client)
+        print("\nSuccess! Test data has been inserted into DynamoDB.")
+    except ClientError as e:
+        print(f"AWS Error ({e.response['Error']['Code']}): {e.response['Error']['Message']}")
+        sys.exit(1)
+    except (BotoCoreError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+
+"""Seed several engines from one pass over the generated dataset.
+
+The generator produces each batch of rows once and hands it to every
+selected sink: MySQL (pymysql), Aurora (Data API), DynamoDB, MongoDB and
+Redis. Each sink has its own bounded queue and worker pool, so a slow sink
+only holds the generator back once its queue is full, while the other
+sinks keep draining theirs. Orders travel together with their order_items
+rows, which lets the document stores embed them without a second pass.
+
+    python3 fanout_seed.py --sinks mysql,dynamodb,mongodb,redis --scale 10
+
+Connection settings come from the same environment as the single-engine
+scripts (MYSQL_*, MONGODB_URI, REDIS_HOST/REDIS_PORT, AWS_REGION).
+"""
+
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import seed_data
+
+SINK_NAMES = ('mysql', 'data-api', 'dynamodb', 'mongodb', 'redis')
+# Redis applies commands in order (customer order lists, sessions), so it
+# gets one worker: a single deep pipeline is its fast path anyway
+DEFAULT_WORKERS = {'mysql': 4, 'data-api': 4, 'dynamodb': 8, 'mongodb': 4, 'redis': 1}
+DEFAULT_QUEUE_BATCHES = 16
+
+def parse_workers(text):
+    """Parse 'sink=N,...' worker overrides."""
+    workers = {}
+    for entry in filter(None, text.split(',')):
+        name, _, count = entry.partition('=')
+        if name not in SINK_NAMES or not count.isdigit() or int(count) < 1:
+            raise argparse.ArgumentTypeError(f"invalid worker override '{entry}' (expected sink=N)")
+        workers[name] = int(count)
+    return workers
+
+def parse_sinks(text):
+    """Parse a comma-separated list of sink names."""
+    sinks = [name for name in text.split(',') if name]
+    unknown = set(sinks) - set(SINK_NAMES)
+    if unknown or not sinks:
+        raise argparse.ArgumentTypeError(f"choose sinks from {', '.join(SINK_NAMES)}")
+    return list(dict.fromkeys(sinks))
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Seed several database engines from one generation pass")
+    parser.add_argument('--sinks', type=parse_sinks, required=True,
+                        help=f"Comma-separated sinks: {', '.join(SINK_NAMES)}")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Scale factor of the generated dataset (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--batch-rows', type=int, default=seed_data.DEFAULT_BATCH_SIZE,
+                        help=f"Rows (or orders) per generated batch (default: {seed_data.DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--queue-batches', type=int, default=DEFAULT_QUEUE_BATCHES,
+                        help=f"Batches each sink may have queued before it holds the generator back "
+                             f"(default: {DEFAULT_QUEUE_BATCHES})")
+    parser.add_argument('--workers', type=parse_workers, default={},
+                        help="Per-sink worker overrides, e.g. mysql=8,dynamodb=16 (defaults: " +
+                             ", ".join(f"{name}={count}" for name, count in DEFAULT_WORKERS.items()) + ")")
+    parser.add_argument('--dynamodb-endpoint-url', default=os.environ.get('DYNAMODB_ENDPOINT_URL'),
+                        help="DynamoDB endpoint, e.g. http://localhost:8000 (default: $DYNAMODB_ENDPOINT_URL or AWS)")
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help="AWS region for DynamoDB (default: $AWS_REGION or us-east-1)")
+    args = parser.parse_args()
+    if args.scale < 1 or args.batch_rows < 1 or args.queue_batches < 1:
+        parser.error("--scale, --batch-rows and --queue-batches must be positive integers")
+    return args
+
+def _batch_ranges(table, scale, rows):
+    total = seed_data.table_row_count(table, scale)
+    return [(start, min(start + rows, total + 1)) for start in range(1, total + 1, rows)]
+
+def generate_batches(scale, seed, batch_rows=seed_data.DEFAULT_BATCH_SIZE):
+    """Yield {table: rows} batches covering the dataset, each row generated once.
+
+    Orders batches also carry the order_items rows of the same orders.
+    """
+    for table in ('customers', 'products'):
+        for start, stop in _batch_ranges(table, scale, batch_rows):
+            yield {table: list(seed_data.generate_rows(table, scale, seed, start, stop))}
+    for start, stop in _batch_ranges('orders', scale, batch_rows):
+        yield {'orders': list(seed_data.generate_rows('orders', scale, seed, start, stop)),
+               'order_items': list(seed_data.generate_rows('order_items', scale, seed, start, stop))}
+
+def items_by_order(item_rows):
+    """Group order_items rows (generated in order_id order) by order_id."""
+    return {order_id: list(items) for order_id, items in groupby(item_rows, key=itemgetter(1))}
+
+def count_rows(batch):
+    return sum(len(rows) for rows in batch.values())
+
+class Sink:
+    """A load target. write() is called concurrently from the sink's worker pool."""
+
+    name = None
+
+    def prepare(self):
+        """Reset the target before any batch is written."""
+
+    def write(self, batch):
+        raise NotImplementedError
+
+    def finish(self):
+        """Run post-load work (indexes, constraints) once every batch is written."""
+
+    def close(self):
+        """Release connections."""
+
+class MySQLSink(Sink):
+    """Multi-row INSERTs over one pymysql connection per worker."""
+
+    name = 'mysql'
+
+    def __init__(self, connect, batch_size=seed_data.DEFAULT_BATCH_SIZE):
+        self.connect = connect
+        self.batch_size = batch_size
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []
+
+    def prepare(self):
+        import rds_insert_test_data as rds
+        connection = self.connect()
+        try:
+            with connection.cursor() as cursor:
+                rds.create_tables(cursor)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def write(self, batch):
+        import rds_insert_test_data as rds
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = self.connect()
+            with self.lock:
+                self.connections.append(connection)
+        for table in seed_data.TABLE_ORDER:
+            if table in batch:
+                rds.insert_rows(connection, table, seed_data.COLUMNS[table], batch[table], self.batch_size)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+
+class DataApiSink(Sink):
+    """batch_execute_statement calls under the Data API loader's adaptive concurrency limit."""
+
+    name = 'data-api'
+
+    def __init__(self, client, database, workers):
+        import aurora_data_api_insert_test_data as aurora
+        self.aurora = aurora
+        self.client = client
+        self.database = database
+        self.limiter = aurora.AdaptiveConcurrency(workers)
+        self.encoders = {table: aurora.table_encoder(table) for table in seed_data.TABLE_ORDER}
+
+    def prepare(self):
+        self.aurora.create_tables(self.client)
+
+    def write(self, batch):
+        for table in seed_data.TABLE_ORDER:
+            if table not in batch:
+                continue
+            encoder = self.encoders[table]
+            sql = self.aurora.insert_statement(table, encoder.names)
+            for chunk, chunk_bytes in self.aurora.chunk_parameter_sets(encoder.encode_rows(batch[table])):
+                self.aurora.execute_chunk_with_backoff(self.client, sql, chunk, chunk_bytes, self.limiter,
+                                                       self.database)
+
+class DynamoDBSink(Sink):
+    """BatchWriteItem groups of 25 with the DynamoDB seeder's retry and item layout."""
+
+    name = 'dynamodb'
+
+    def __init__(self, client, write_shards=None):
+        import dynamodb_insert_test_data as dynamodb
+        self.dynamodb = dynamodb
+        self.client = client
+        self.write_shards = write_shards
+        self.stats = dynamodb.LoadStats()
+
+    def prepare(self):
+        self.dynamodb.create_tables(self.client, self.write_shards)
+
+    def write(self, batch):
+        dynamodb = self.dynamodb
+        if 'customers' in batch:
+            table, items = 'Customers', map(dynamodb.customer_item, batch['customers'])
+        elif 'products' in batch:
+            table, items = 'Products', map(dynamodb.product_item, batch['products'])
+        else:
+            line_items = items_by_order(batch['order_items'])
+            table = 'Orders'
+            items = (dynamodb.order_item(row, line_items.get(row[0], []), self.write_shards)
+                     for row in batch['orders'])
+        for group in seed_data.chunked(items, dynamodb.BATCH_WRITE_ITEMS):
+            dynamodb.batch_write(self.client, table, group, self.stats)
+
+class MongoDBSink(Sink):
+    """Unordered insert_many of embedded documents; indexes are built in finish()."""
+
+    name = 'mongodb'
+
+    def __init__(self, database, seed):
+        import mongodb_insert_test_data as mongodb
+        self.mongodb = mongodb
+        self.database = database
+        self.seed = seed
+        self.max_docs, self.max_bytes = mongodb.server_batch_limits(
+            database.client, mongodb.MAX_BATCH_DOCS, mongodb.MAX_BATCH_BYTES)
+
+    def prepare(self):
+        for collection in self.mongodb.COLLECTIONS:
+            self.database.drop_collection(collection)
+
+    def write(self, batch):
+        mongodb = self.mongodb
+        if 'customers' in batch:
+            collection, documents = 'users', (mongodb.user_document(self.seed, row) for row in batch['customers'])
+        elif 'products' in batch:
+            collection, documents = 'products', map(mongodb.product_document, batch['products'])
+        else:
+            line_items = items_by_order(batch['order_items'])
+            collection = 'orders'
+            documents = (mongodb.order_document(row, line_items.get(row[0], [])) for row in batch['orders'])
+        for group in mongodb.encoded_batches(documents, self.max_docs, self.max_bytes):
+            self.database[collection].insert_many(group, ordered=False)
+
+    def finish(self):
+        self.mongodb.build_indexes(self.database)
+
+class RedisSink(Sink):
+    """Pipelined commands over the Redis seeder's key layout."""
+
+    name = 'redis'
+
+    def __init__(self, client):
+        import redis_insert_test_data as redis_seeder
+        self.redis_seeder = redis_seeder
+        self.client = client
+
+    def prepare(self):
+        self.redis_seeder.load_pipelined(self.client, self.redis_seeder.reset_commands())
+
+    def write(self, batch):
+        redis_seeder = self.redis_seeder
+        if 'customers' in batch:
+            commands = (command for row in batch['customers'] for command in redis_seeder.customer_commands(row))
+        elif 'products' in batch:
+            commands = (command for row in batch['products'] for command in redis_seeder.product_commands(row))
+        else:
+            line_items = items_by_order(batch['order_items'])
+            commands = (command for row in batch['orders']
+                        for command in redis_seeder.order_commands(row, line_items.get(row[0], [])))
+        redis_seeder.load_pipelined(self.client, commands)
+
+class SinkRunner:
+    """Feeds one sink from its own bounded queue through its own worker pool.
+
+    Batches of a table are only started once every batch of the previous
+    table has been written, so relational sinks never insert a row before
+    the rows it references. After a failure the runner keeps draining its
+    queue so the generator is never blocked by a dead sink.
+    """
+
+    def __init__(self, sink, workers, queue_batches=DEFAULT_QUEUE_BATCHES):
+        self.sink = sink
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_batches)
+        self.lock = threading.Lock()
+        self.rows = 0
+        self.busy = 0.0
+        self.blocked = 0.0
+        self.max_lag = 0
+        self.finished_at = None
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def put(self, batch, emitted):
+        """Queue a batch, recording how long the generator waited and how far behind this sink is."""
+        started = time.time()
+        self.queue.put(batch)
+        self.blocked += time.time() - started
+        with self.lock:
+            self.max_lag = max(self.max_lag, emitted - self.rows)
+
+    def _write(self, batch):
+        started = time.time()
+        self.sink.write(batch)
+        with self.lock:
+            self.rows += count_rows(batch)
+            self.busy += time.time() - started
+
+    def _collect(self, futures):
+        for future in futures:
+            if future.exception() and not self.error:
+                self.error = future.exception()
+
+    def _run(self):
+        pending = set()
+        current_tables = None
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.sink.name) as pool:
+            while True:
+                batch = self.queue.get()
+                if batch is None:
+                    break
+                if self.error:
+                    continue
+                if batch.keys() != current_tables:
+                    done, pending = wait(pending)
+                    self._collect(done)
+                    current_tables = batch.keys()
+                while len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect(done)
+                if not self.error:
+                    pending.add(pool.submit(self._write, batch))
+            self._collect(wait(pending).done)
+        if not self.error:
+            try:
+                self.sink.finish()
+            except Exception as e:
+                self.error = e
+        self.finished_at = time.time()
+
+    def join(self):
+        self.queue.put(None)
+        self.thread.join()
+
+def fan_out(sinks, scale, seed, workers=None, batch_rows=seed_data.DEFAULT_BATCH_SIZE,
+            queue_batches=DEFAULT_QUEUE_BATCHES):
+    """Generate the dataset once and write it to every sink; return True if all succeeded."""
+    workers = {**DEFAULT_WORKERS, **(workers or {})}
+    for sink in sinks:
+        print(f"Preparing {sink.name}...")
+        sink.prepare()
+
+    runners = [SinkRunner(sink, workers[sink.name], queue_batches) for sink in sinks]
+    started = time.time()
+    for runner in runners:
+        runner.start()
+    emitted = 0
+    generating = 0.0
+    batches = generate_batches(scale, seed, batch_rows)
+    while True:
+        generate_started = time.time()
+        batch = next(batches, None)
+        generating += time.time() - generate_started
+        if batch is None:
+            break
+        emitted += count_rows(batch)
+        for runner in runners:
+            runner.put(batch, emitted)
+    produced_at = time.time()
+    for runner in runners:
+        runner.join()
+    for sink in sinks:
+        sink.close()
+
+    print(f"\nGenerated {emitted} rows once in {produced_at - started:.1f}s ({generating:.1f}s generating)")
+    print(f"{'sink':<10} {'rows':>10} {'rows/sec':>10} {'busy s':>8} {'max lag':>9} {'blocked s':>9} "
+          f"{'drain s':>8}  status")
+    ok = True
+    for runner in runners:
+        elapsed = runner.finished_at - started
+        status = "OK" if runner.error is None else f"FAILED: {runner.error}"
+        ok = ok and runner.error is None
+        print(f"{runner.sink.name:<10} {runner.rows:>10} {runner.rows / max(elapsed, 1e-9):>10.0f} "
+              f"{runner.busy:>8.1f} {runner.max_lag:>9} {runner.blocked:>9.1f} "
+              f"{max(runner.finished_at - produced_at, 0):>8.1f}  {status}")
+    print("(max lag: rows generated but not yet written; blocked: time the generator waited on this "
+          "sink's full queue; drain: time the sink needed after generation ended)")
+    return ok
+
+def open_sinks(names, args):
+    """Connect to every selected engine and return its sink."""
+    sinks = []
+    for name in names:
+        if name == 'mysql':
+            import rds_insert_test_data as rds
+            try:
+                host, user, password, database = (os.environ['MYSQL_HOST'], os.environ['MYSQL_USER'],
+                                                  os.environ['MYSQL_PASS'], os.environ['MYSQL_DB'])
+            except KeyError as e:
+                print(f"Error: {e.args[0]} not set. Please source your credentials first: "
+                      "source ./set_db_credentials.sh")
+                sys.exit(1)
+            port = int(os.environ.get('MYSQL_PORT', 3306))
+            sinks.append(MySQLSink(lambda: rds.open_connection(host, user, password, database, port=port)))
+        elif name == 'data-api':
+            import aurora_data_api_insert_test_data as aurora
+            client = aurora.get_rds_data_client()
+            aurora.DATABASE_NAME = aurora.get_or_create_database(client)
+            sinks.append(DataApiSink(client, aurora.DATABASE_NAME, args.workers.get(name, DEFAULT_WORKERS[name])))
+        elif name == 'dynamodb':
+            import dynamodb_insert_test_data as dynamodb
+            sinks.append(DynamoDBSink(dynamodb.get_dynamodb_client(args.region, args.dynamodb_endpoint_url)))
+        elif name == 'mongodb':
+            import mongodb_insert_test_data as mongodb
+            import pymongo
+            client = pymongo.MongoClient(os.environ.get('MONGODB_URI', mongodb.DEFAULT_URI))
+            sinks.append(MongoDBSink(client.get_default_database(mongodb.DEFAULT_DATABASE), args.seed))
+        elif name == 'redis':
+            import redis_insert_test_data as redis_seeder
+            redis_seeder.check_requirements()
+            sinks.append(RedisSink(redis_seeder.get_redis_client(os.environ.get('REDIS_HOST', 'localhost'),
+                                                                 int(os.environ.get('REDIS_PORT', 6379)))))
+    return sinks
+
+def confirm_operation(names):
+    """Ask user for confirmation before proceeding."""
+    print(f"You are about to reset and insert test data into: {', '.join(names)}")
+    confirm = input("Continue? (y/n): ")
+    return confirm.lower() in ['y', 'yes']
+
+def main():
+    """Seed the selected engines from one generation pass."""
+    args = parse_args()
+    if not confirm_operation(args.sinks):
+        print("Operation cancelled.")
+        return 0
+    sinks = open_sinks(args.sinks, args)
+    print(f"Fanning out generated data (scale {args.scale}, seed {args.seed}) to {', '.join(args.sinks)}...")
+    ok = fan_out(sinks, args.scale, args.seed, args.workers, args.batch_rows, args.queue_batches)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
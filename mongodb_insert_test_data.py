@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+"""Load the generated test dataset into MongoDB or Amazon DocumentDB.
+
+The relational rows become three collections of embedded documents:
+
+    users      customers, with an age (from seed_data.customer_age)
+    products   products, prices as Decimal128
+    orders     orders with their order_items embedded as an array
+
+Documents are BSON-encoded once, grouped into batches bounded by count and
+encoded size, and written with unordered insert_many calls from a worker
+pool. Indexes are built after the load, when building them is one sorted
+pass instead of a per-document update.
+
+    python3 mongodb_insert_test_data.py --scale 10 --uri mongodb://localhost:27017/mcp
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from datetime import datetime, timezone
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+
+import seed_data
+
+DEFAULT_URI = 'mongodb://localhost:27017/mcp'
+DEFAULT_DATABASE = 'mcp'
+DEFAULT_WORKERS = 8
+MAX_BATCH_DOCS = 1000
+# Well under the 48 MB message limit of both MongoDB and DocumentDB, so one
+# batch never has to be split by the driver
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+COLLECTIONS = {
+    'users': 'customers',
+    'products': 'products',
+    'orders': 'orders',
+}
+
+# (collection, keys, options) of the indexes built after the load
+INDEXES = (
+    ('users', [('email', 1)], {'unique': True}),
+    ('users', [('age', 1)], {}),
+    ('products', [('name', 1)], {}),
+    ('orders', [('customer_id', 1), ('order_date', -1)], {}),
+    ('orders', [('status', 1)], {}),
+    ('orders', [('order_items.product_id', 1)], {}),
+)
+
+# Credentials and the database path of a mongodb:// or mongodb+srv:// URI
+_URI_CREDENTIALS = re.compile(r"(?<=://)[^@/]*@")
+_URI_DATABASE = re.compile(r"^mongodb(?:\+srv)?://[^/?]*/([^?]+)")
+
+def check_requirements():
+    """Check if required modules are installed."""
+    try:
+        import pymongo
+    except ImportError:
+        print("Error: pymongo module is required but not installed.")
+        print("Please install it using: pip install pymongo")
+        sys.exit(1)
+
+def confirm_operation(uri, database):
+    """Ask user for confirmation before proceeding."""
+    print(f"You are about to drop and reload collections {', '.join(COLLECTIONS)} in database '{database}'")
+    print(f"Server: {_URI_CREDENTIALS.sub('', uri)}")
+    confirm = input("Continue? (y/n): ")
+    return confirm.lower() in ['y', 'yes']
+
+def database_name(uri, database=None):
+    """Return the database to load: `database`, else the one in the URI, else DEFAULT_DATABASE."""
+    match = _URI_DATABASE.match(uri)
+    return database or (match.group(1) if match else DEFAULT_DATABASE)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Load the generated test dataset into MongoDB or DocumentDB")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Scale factor of the generated dataset (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--uri', default=os.environ.get('MONGODB_URI', DEFAULT_URI),
+                        help=f"Connection string (default: $MONGODB_URI or {DEFAULT_URI})")
+    parser.add_argument('--database',
+                        help=f"Database name (default: the one in the URI, or {DEFAULT_DATABASE})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Parallel insert_many workers (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--batch-docs', type=int, default=MAX_BATCH_DOCS,
+                        help=f"Documents per insert_many call (default: {MAX_BATCH_DOCS})")
+    parser.add_argument('--batch-bytes', type=int, default=MAX_BATCH_BYTES,
+                        help=f"Encoded bytes per insert_many call (default: {MAX_BATCH_BYTES})")
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be a positive integer")
+    if args.workers < 1 or args.batch_docs < 1 or args.batch_bytes < 1:
+        parser.error("--workers, --batch-docs and --batch-bytes must be positive")
+    return args
+
+def _datetime(text):
+    return datetime.strptime(text, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+def user_document(seed, row):
+    """Convert a generated customers row to a users document."""
+    customer_id, first_name, last_name, email, created_at = row
+    return {'_id': customer_id, 'first_name': first_name, 'last_name': last_name, 'email': email,
+            'age': seed_data.customer_age(seed, customer_id), 'created_at': _datetime(created_at)}
+
+def product_document(row):
+    """Convert a generated products row to a products document."""
+    from bson.decimal128 import Decimal128
+    product_id, name, description, price, stock_quantity = row
+    return {'_id': product_id, 'name': name, 'description': description,
+            'price': Decimal128(Decimal(price)), 'stock_quantity': stock_quantity}
+
+def order_document(row, item_rows):
+    """Convert a generated orders row and its order_items rows to one orders document."""
+    from bson.decimal128 import Decimal128
+    order_id, customer_id, order_date, total_amount, status = row
+    return {
+        '_id': order_id, 'customer_id': customer_id, 'order_date': _datetime(order_date),
+        'total_amount': Decimal128(Decimal(total_amount)), 'status': status,
+        'order_items': [
+            {'order_item_id': order_item_id, 'product_id': product_id, 'quantity': quantity,
+             'unit_price': Decimal128(Decimal(unit_price))}
+            for order_item_id, _, product_id, quantity, unit_price in item_rows
+        ],
+    }
+
+def generate_documents(collection, scale, seed, start, stop):
+    """Yield the documents of a collection for generation keys in [start, stop)."""
+    table = COLLECTIONS[collection]
+    rows = seed_data.generate_rows(table, scale, seed, start, stop)
+    if table == 'customers':
+        for row in rows:
+            yield user_document(seed, row)
+    elif table == 'products':
+        for row in rows:
+            yield product_document(row)
+    else:
+        products = seed_data.table_row_count('products', scale)
+        for row in rows:
+            yield order_document(row, seed_data.order_item_rows(seed, row[0], products))
+
+def encoded_batches(documents, max_docs=MAX_BATCH_DOCS, max_bytes=MAX_BATCH_BYTES):
+    """Yield lists of RawBSONDocuments bounded by count and total encoded size.
+
+    Each document is encoded exactly once; the driver sends RawBSONDocument
+    bytes as they are.
+    """
+    import bson
+    from bson.raw_bson import RawBSONDocument
+    batch = []
+    batch_bytes = 0
+    for document in documents:
+        encoded = bson.encode(document)
+        if batch and (len(batch) >= max_docs or batch_bytes + len(encoded) > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(RawBSONDocument(encoded))
+        batch_bytes += len(encoded)
+    if batch:
+        yield batch
+
+def server_batch_limits(client, max_docs, max_bytes):
+    """Clamp the batch limits to what the server reports (DocumentDB's are lower than MongoDB's)."""
+    # isMaster rather than hello: DocumentDB 3.6 and 4.0 do not implement hello
+    limits = client.admin.command('isMaster')
+    max_docs = min(max_docs, limits.get('maxWriteBatchSize', max_docs))
+    max_bytes = min(max_bytes, limits.get('maxMessageSizeBytes', max_bytes) // 2)
+    return max_docs, max_bytes
+
+def load_range(database, collection, scale, seed, start, stop, max_docs, max_bytes):
+    """Generate one key range of a collection and write it with unordered insert_many calls."""
+    inserted = 0
+    for batch in encoded_batches(generate_documents(collection, scale, seed, start, stop), max_docs, max_bytes):
+        # inserted_ids stays empty for RawBSONDocuments; a failed write raises BulkWriteError instead
+        database[collection].insert_many(batch, ordered=False)
+        inserted += len(batch)
+    return inserted
+
+def load_collections(database, scale, seed, workers=DEFAULT_WORKERS, max_docs=MAX_BATCH_DOCS,
+                     max_bytes=MAX_BATCH_BYTES):
+    """Drop and reload every collection by key range over `workers` threads; report docs/sec."""
+    for collection in COLLECTIONS:
+        database.drop_collection(collection)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mongodb') as pool:
+        futures = {}
+        for collection, table in COLLECTIONS.items():
+            for start, stop in seed_data.key_ranges(table, scale, workers * 4):
+                future = pool.submit(load_range, database, collection, scale, seed, start, stop,
+                                     max_docs, max_bytes)
+                futures[future] = collection
+        counts = dict.fromkeys(COLLECTIONS, 0)
+        for future, collection in futures.items():
+            counts[collection] += future.result()
+    elapsed = time.time() - started
+
+    print("\nLoad summary:")
+    for collection, count in counts.items():
+        print(f"  {collection}: {count} documents")
+    total = sum(counts.values())
+    print(f"  total: {total} documents in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} docs/sec)")
+    return counts
+
+def build_indexes(database):
+    """Create the secondary indexes after the load and report how long each took."""
+    import pymongo
+    print("\nBuilding indexes...")
+    started = time.time()
+    for collection, keys, options in INDEXES:
+        index_started = time.time()
+        database[collection].create_indexes([pymongo.IndexModel(keys, **options)])
+        print(f"  {collection} {keys}: {time.time() - index_started:.2f}s")
+    print(f"  total index build time: {time.time() - started:.2f}s")
+
+def verify_counts(database, counts, scale):
+    """Compare each collection's count_documents with the generated dataset; return True if all match."""
+    print("\nVerifying document counts...")
+    matched = True
+    for collection, table in COLLECTIONS.items():
+        expected = seed_data.table_row_count(table, scale)
+        stored = database[collection].count_documents({})
+        if stored == expected == counts[collection]:
+            print(f"  {collection}: {stored} documents")
+        else:
+            print(f"  {collection}: MISMATCH - {stored} stored, {counts[collection]} inserted, {expected} expected")
+            matched = False
+    return matched
+
+def display_sample_data(database):
+    """Show a few documents, as the MongoDB MCP server would query them."""
+    print(f"\nUsers older than 30: {database.users.count_documents({'age': {'$gt': 30}})}")
+    print(f"Sample order: {database.orders.find_one({'customer_id': 1})}")
+
+def main():
+    """Main function to execute the script."""
+    check_requirements()
+    args = parse_args()
+    import pymongo
+    from pymongo.errors import PyMongoError
+
+    print("Script to insert test data into MongoDB/DocumentDB")
+    name = database_name(args.uri, args.database)
+    if not confirm_operation(args.uri, name):
+        print("Operation cancelled.")
+        sys.exit(0)
+
+    try:
+        client = pymongo.MongoClient(args.uri)
+        database = client[name]
+        max_docs, max_bytes = server_batch_limits(client, args.batch_docs, args.batch_bytes)
+        print(f"Loading generated data (scale {args.scale}, seed {args.seed}) into database '{database.name}' "
+              f"with {args.workers} workers, up to {max_docs} documents / {max_bytes} bytes per batch...")
+        counts = load_collections(database, args.scale, args.seed, args.workers, max_docs, max_bytes)
+        if not verify_counts(database, counts, args.scale):
+            print("Error: The collections do not hold the generated dataset.")
+            sys.exit(1)
+        build_indexes(database)
+        display_sample_data(database)
+        print("\nSuccess! Test data has been inserted into MongoDB/DocumentDB.")
+    except PyMongoError as e:
+        print(f"Error: MongoDB error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
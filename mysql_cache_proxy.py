@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+
+"""Read-through result cache in front of the MySQL MCP server.
+
+Runs the real MCP server as a child process and relays MCP's stdio transport
+(newline-delimited JSON-RPC) in both directions. Query tool calls are
+answered from the cache when possible:
+
+- SELECTs are cached by a hash of the normalized query text for --ttl
+  seconds, in an LRU bounded by entry count and result bytes.
+- Schema metadata (SHOW TABLES/COLUMNS/CREATE TABLE/INDEX, DESCRIBE,
+  information_schema queries and resources/read) is kept in a separate
+  LRU for the longer --schema-ttl.
+- A successful INSERT, UPDATE, DELETE or REPLACE (when the server's
+  ALLOW_*_OPERATION flags let it through) drops the cached results that
+  read the tables it wrote; DDL also drops all schema metadata, and any
+  other statement clears both caches.
+
+Hit ratio, saved upstream latency and cache sizes are reported by an extra
+mysql_cache_stats tool and written to stderr on exit.
+
+setup_db_mcp_servers_secure.sh registers it in place of the direct entry
+when MYSQL_MCP_CACHE=true:
+
+    python3 mysql_cache_proxy.py --ttl 30 -- npx -y @benborla29/mcp-server-mysql
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+from collections import OrderedDict
+
+DEFAULT_QUERY_TOOL = 'mysql_query'
+STATS_TOOL = 'mysql_cache_stats'
+DEFAULT_TTL = 30.0
+DEFAULT_SCHEMA_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+LITERAL = re.compile(r"""('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*"|`[^`]*`)""")
+LEADING_COMMENT = re.compile(r"^(?:/\*.*?\*/|(?:--|#)[^\n]*(?:\n|$))\s*", re.S)
+SCHEMA_SHOW = re.compile(r"^show (?:full )?(?:tables|columns|fields|create table|index|indexes|keys|databases|schemas)\b")
+# Results that change between identical calls, or statements with side effects
+UNCACHEABLE = re.compile(r"\b(?:now|sysdate|curdate|curtime|current_date|current_time|current_timestamp|"
+                         r"localtime|localtimestamp|unix_timestamp|utc_date|utc_time|utc_timestamp|rand|uuid|"
+                         r"uuid_short|connection_id|last_insert_id|found_rows|row_count|sleep|get_lock|"
+                         r"release_lock|benchmark)\b|\bfor update\b|\block in share mode\b|\bfor share\b|"
+                         r"\binto (?:outfile|dumpfile)\b|@")
+IDENTIFIER = r"(?:`[^`]+`|[\w$]+)(?:\.(?:`[^`]+`|[\w$]+))?"
+TABLE_REFERENCE = re.compile(rf"\b(?:join|into|update|table|describe|desc|straight_join)\s+({IDENTIFIER})")
+FROM_CLAUSE = re.compile(r"\bfrom\s+(.+?)(?=\b(?:where|join|straight_join|left|right|inner|outer|cross|natural|"
+                         r"on|using|group|order|limit|having|union|for|lock|window|select|set)\b|[()]|$)")
+WRITE_STATEMENTS = ('insert', 'update', 'delete', 'replace')
+DDL_STATEMENTS = ('create', 'alter', 'drop', 'truncate', 'rename')
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Caching stdio proxy for the MySQL MCP server",
+                                     usage="%(prog)s [options] -- command [args...]")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL,
+                        help=f"Seconds a SELECT result stays cached (default: {DEFAULT_TTL:g})")
+    parser.add_argument('--schema-ttl', type=float, default=DEFAULT_SCHEMA_TTL,
+                        help=f"Seconds schema metadata stays cached (default: {DEFAULT_SCHEMA_TTL:g})")
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"Cached results per cache (default: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help=f"Encoded result bytes per cache (default: {DEFAULT_MAX_BYTES})")
+    parser.add_argument('--query-tool', default=DEFAULT_QUERY_TOOL,
+                        help=f"Name of the upstream tool that runs SQL (default: {DEFAULT_QUERY_TOOL})")
+    parser.add_argument('command', nargs=argparse.REMAINDER, help="The MCP server command to run")
+    args = parser.parse_args()
+    if args.command and args.command[0] == '--':
+        args.command = args.command[1:]
+    if not args.command:
+        parser.error("give the MCP server command after --")
+    if args.ttl < 0 or args.schema_ttl < 0 or args.max_entries < 1 or args.max_bytes < 1:
+        parser.error("--ttl and --schema-ttl must not be negative, --max-entries and --max-bytes must be positive")
+    return args
+
+def normalize_query(sql):
+    """Return the query with comments, case and whitespace outside literals normalized."""
+    sql = sql.strip()
+    while True:
+        stripped = LEADING_COMMENT.sub('', sql, count=1)
+        if stripped == sql:
+            break
+        sql = stripped
+    sql = sql.rstrip(';').strip()
+    parts = LITERAL.split(sql)
+    for index in range(0, len(parts), 2):
+        parts[index] = re.sub(r'\s+', ' ', parts[index]).lower()
+    return ''.join(parts).strip()
+
+def query_key(normalized):
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def _table_name(identifier):
+    return identifier.split('.')[-1].strip('`').lower()
+
+def referenced_tables(normalized):
+    """Return the set of table names a normalized statement reads or writes."""
+    # Mask literals so table-like words inside strings are not matched
+    masked = LITERAL.sub(lambda match: match.group(0) if match.group(0).startswith('`') else "''", normalized)
+    tables = {_table_name(match.group(1)) for match in TABLE_REFERENCE.finditer(masked)}
+    for match in FROM_CLAUSE.finditer(masked):
+        for source in match.group(1).split(','):
+            identifier = re.match(IDENTIFIER, source.strip())
+            if identifier:
+                tables.add(_table_name(identifier.group(0)))
+    return tables
+
+def classify(normalized):
+    """Return 'schema', 'read', 'write', 'ddl', 'uncacheable' or 'other' for a normalized statement."""
+    first = normalized.split(' ', 1)[0]
+    if SCHEMA_SHOW.match(normalized) or first in ('describe', 'desc'):
+        return 'schema'
+    if first == 'select':
+        if UNCACHEABLE.search(LITERAL.sub("''", normalized)):
+            return 'uncacheable'
+        return 'schema' if 'information_schema' in normalized else 'read'
+    if first in WRITE_STATEMENTS:
+        return 'write'
+    if first in DDL_STATEMENTS:
+        return 'ddl'
+    if first in ('show', 'explain'):
+        return 'uncacheable'
+    return 'other'
+
+class ResultCache:
+    """LRU of results with per-entry expiry, bounded by entry count and encoded bytes."""
+
+    def __init__(self, ttl, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (result, size, expires, upstream seconds, tables)
+        self.by_table = {}
+        self.bytes = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, now):
+        """Return (result, upstream seconds) of a live entry, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= now:
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry[0], entry[3]
+
+    def put(self, key, result, upstream_seconds, tables, now):
+        """Cache a result, evicting least recently used entries to stay within the bounds."""
+        if key in self.entries:
+            self._remove(key)
+        size = len(json.dumps(result, separators=(',', ':')))
+        if size > self.max_bytes or not self.ttl:
+            return
+        self.entries[key] = (result, size, now + self.ttl, upstream_seconds, tables)
+        self.bytes += size
+        for table in tables:
+            self.by_table.setdefault(table, set()).add(key)
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate_tables(self, tables):
+        """Drop every entry that read one of the tables; return how many were dropped."""
+        keys = set()
+        for table in tables:
+            keys |= self.by_table.get(table, set())
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.by_table.clear()
+        self.bytes = 0
+
+    def _remove(self, key):
+        _, size, _, _, tables = self.entries.pop(key)
+        self.bytes -= size
+        for table in tables:
+            keys = self.by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.by_table[table]
+
+class CacheProxy:
+    """Relay MCP messages between the client and the MySQL MCP server, answering cached reads itself."""
+
+    def __init__(self, server, output, args):
+        self.server = server
+        self.output = output
+        self.query_tool = args.query_tool
+        self.results = ResultCache(args.ttl, args.max_entries, args.max_bytes)
+        self.schema = ResultCache(args.schema_ttl, args.max_entries, args.max_bytes)
+        self.pending = {}  # request id -> (kind, key, tables, started, generation)
+        # Bumped on every invalidation, so a read that raced a write is not cached
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.output_lock = threading.Lock()
+        self.hits = {'read': 0, 'schema': 0}
+        self.misses = {'read': 0, 'schema': 0}
+        self.passed = 0
+        self.saved_seconds = 0.0
+
+    def send(self, message):
+        """Write one message to the client."""
+        line = json.dumps(message, separators=(',', ':')) + "\n"
+        with self.output_lock:
+            self.output.write(line)
+            self.output.flush()
+
+    def forward(self, line):
+        """Write one raw message line to the server."""
+        self.server.stdin.write(line if line.endswith("\n") else line + "\n")
+        self.server.stdin.flush()
+
+    def lookup(self, message):
+        """Classify a client request; return (kind, cache, key, tables) or None to pass it through."""
+        method = message.get('method')
+        params = message.get('params') or {}
+        if method == 'resources/read' and 'uri' in params:
+            return 'schema', self.schema, query_key(f"resource:{params['uri']}"), set()
+        if method != 'tools/call' or params.get('name') != self.query_tool:
+            return None
+        sql = (params.get('arguments') or {}).get('sql')
+        if not isinstance(sql, str):
+            return None
+        normalized = normalize_query(sql)
+        kind = classify(normalized)
+        cache = {'read': self.results, 'schema': self.schema}.get(kind)
+        return kind, cache, query_key(normalized), referenced_tables(normalized)
+
+    def handle_client_message(self, line):
+        """Answer a request from the cache, or remember it and pass it to the server."""
+        try:
+            message = json.loads(line)
+        except ValueError:
+            self.forward(line)
+            return
+        if not isinstance(message, dict) or 'id' not in message or 'method' not in message:
+            self.forward(line)
+            return
+
+        params = message.get('params') or {}
+        if message['method'] == 'tools/call' and params.get('name') == STATS_TOOL:
+            self.send({'jsonrpc': '2.0', 'id': message['id'],
+                       'result': {'content': [{'type': 'text', 'text': json.dumps(self.stats(), indent=2)}]}})
+            return
+
+        request = self.lookup(message)
+        with self.lock:
+            if message['method'] == 'tools/list':
+                self.pending[message['id']] = ('tools_list', None, None, None, None)
+            elif request is not None:
+                kind, cache, key, tables = request
+                if cache is not None:
+                    started = time.monotonic()
+                    cached = cache.get(key, started)
+                    if cached is not None:
+                        result, upstream_seconds = cached
+                        self.hits[kind] += 1
+                        self.saved_seconds += max(upstream_seconds - (time.monotonic() - started), 0.0)
+                        self.send({'jsonrpc': '2.0', 'id': message['id'], 'result': result})
+                        return
+                    self.misses[kind] += 1
+                else:
+                    self.passed += 1
+                self.pending[message['id']] = (kind, key, tables, time.monotonic(), self.generation)
+        self.forward(line)
+
+    def handle_server_message(self, line):
+        """Cache or act on the server's reply to a remembered request, then relay it."""
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict) or 'id' not in message or 'method' in message:
+            self._relay(line)
+            return
+
+        with self.lock:
+            request = self.pending.pop(message['id'], None)
+            result = message.get('result')
+            succeeded = isinstance(result, dict) and not result.get('isError')
+            if request is None or not succeeded:
+                pass
+            elif request[0] == 'tools_list' and isinstance(result.get('tools'), list):
+                result['tools'].append(self.stats_tool())
+                line = json.dumps(message, separators=(',', ':'))
+            else:
+                kind, key, tables, started, generation = request
+                now = time.monotonic()
+                if kind in ('read', 'schema'):
+                    if generation == self.generation:
+                        cache = self.results if kind == 'read' else self.schema
+                        cache.put(key, result, now - started, tables, now)
+                elif kind != 'uncacheable':
+                    self.generation += 1
+                    if kind == 'write' and tables:
+                        self.results.invalidate_tables(tables)
+                    elif kind == 'ddl' and tables:
+                        self.results.invalidate_tables(tables)
+                        self.schema.clear()
+                    else:
+                        self.results.clear()
+                        self.schema.clear()
+        self._relay(line)
+
+    def _relay(self, line):
+        with self.output_lock:
+            self.output.write(line if line.endswith("\n") else line + "\n")
+            self.output.flush()
+
+    def stats_tool(self):
+        return {'name': STATS_TOOL,
+                'description': "Hit ratio, saved latency and size of the MySQL query result cache",
+                'inputSchema': {'type': 'object', 'properties': {}}}
+
+    def stats(self):
+        """Return the cache statistics."""
+        with self.lock:
+            hits = sum(self.hits.values())
+            lookups = hits + sum(self.misses.values())
+            return {
+                'hits': dict(self.hits), 'misses': dict(self.misses), 'passed_through': self.passed,
+                'hit_ratio': round(hits / lookups, 4) if lookups else None,
+                'saved_latency_ms': round(self.saved_seconds * 1000, 1),
+                'results': {'entries': len(self.results.entries), 'bytes': self.results.bytes,
+                            'evictions': self.results.evictions, 'invalidations': self.results.invalidations},
+                'schema': {'entries': len(self.schema.entries), 'bytes': self.schema.bytes,
+                           'evictions': self.schema.evictions, 'invalidations': self.schema.invalidations},
+            }
+
+    def relay_server_output(self):
+        for line in self.server.stdout:
+            if line.strip():
+                self.handle_server_message(line)
+
+    def run(self, client_input):
+        """Relay until the client closes its input and the server exits; return its exit status."""
+        reader = threading.Thread(target=self.relay_server_output, name='server-output', daemon=True)
+        reader.start()
+        try:
+            for line in client_input:
+                if line.strip():
+                    self.handle_client_message(line)
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                self.server.stdin.close()
+            except BrokenPipeError:
+                pass
+        status = self.server.wait()
+        reader.join()
+        return status
+
+def main():
+    """Start the MCP server behind the cache and relay stdio until the client disconnects."""
+    args = parse_args()
+    try:
+        server = subprocess.Popen(args.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                  text=True, encoding='utf-8', bufsize=1)
+    except OSError as e:
+        print(f"Error: Could not start {args.command[0]}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    proxy = CacheProxy(server, sys.stdout, args)
+    status = proxy.run(sys.stdin)
+    print(f"mysql_cache_proxy stats: {json.dumps(proxy.stats())}", file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+"""Replay the MCP tool query mix against the seeded MySQL and report latency.
+
+The README's usage examples reduce to four query shapes:
+
+  list_tables   SHOW TABLES
+  select_limit  SELECT * FROM <table> LIMIT 10
+  describe      column names and types of a table from information_schema
+  join          the customers/orders JOIN run by display_sample_data
+
+N clients (one connection each) replay a weighted mix of these shapes.
+
+- Closed loop (--mode closed): every client issues its next query when the
+  previous one returns, optionally paced to --qps overall. Latencies are
+  recorded with coordinated-omission correction against the pacing interval.
+- Open loop (--mode open): queries are scheduled at --qps regardless of how
+  fast earlier ones return, and latency is measured from each query's
+  scheduled start, so queueing delay is included.
+
+--write-tps runs write_workload.py's OLTP transactions alongside, so read
+latency is measured under concurrent write load.
+
+Latencies go into HDR histograms (pip install hdrhistogram); p50, p99 and
+p99.9 are reported per shape for each scale factor. Needs a disposable
+MySQL named by MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASS and MYSQL_DB;
+each scale is loaded with rds_insert_test_data.py before it is measured.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from functools import partial
+
+import seed_data
+from benchmark_loaders import mysql_settings
+
+QUERY_SHAPES = ('list_tables', 'select_limit', 'describe', 'join')
+DEFAULT_MIX = 'list_tables=1,select_limit=4,describe=2,join=3'
+DEFAULT_SCALES = '1,5,10'
+DEFAULT_CLIENTS = 8
+
+# HDR histogram range in microseconds, with 3 significant digits
+LOWEST_US = 1
+HIGHEST_US = 60 * 1000 * 1000
+SIGNIFICANT_DIGITS = 3
+
+DESCRIBE_SQL = ("SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s ORDER BY ordinal_position")
+JOIN_SQL = ("SELECT c.first_name, c.last_name, o.order_id, o.total_amount, o.status "
+            "FROM customers c JOIN orders o ON c.customer_id = o.customer_id LIMIT 10")
+
+def check_requirements():
+    """Check if required modules are installed."""
+    for module, package in (('pymysql', 'pymysql'), ('hdrh', 'hdrhistogram')):
+        try:
+            __import__(module)
+        except ImportError:
+            print(f"Error: {package} module is required but not installed.")
+            print(f"Please install it using: pip install {package}")
+            sys.exit(1)
+
+def parse_mix(text, names=QUERY_SHAPES):
+    """Parse 'name=weight,...' into {name: weight}, accepting only the given names."""
+    mix = {}
+    for entry in filter(None, text.split(',')):
+        name, _, weight = entry.partition('=')
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid mix entry '{entry}' (expected name=weight)")
+        if name not in names or mix[name] < 0:
+            raise argparse.ArgumentTypeError(f"invalid mix entry '{entry}' (names: {', '.join(names)})")
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one entry with a positive weight")
+    return mix
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Replay the MCP query mix against MySQL and report latency")
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed',
+                        help="closed: clients wait for each reply; open: queries start on a fixed schedule "
+                             "(default: closed)")
+    parser.add_argument('--clients', type=int, default=DEFAULT_CLIENTS,
+                        help=f"Concurrent clients, one connection each (default: {DEFAULT_CLIENTS})")
+    parser.add_argument('--qps', type=float,
+                        help="Target queries/sec across all clients (required for --mode open)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Measured seconds per scale (default: 30)")
+    parser.add_argument('--warmup', type=float, default=5.0, help="Unmeasured seconds per scale (default: 5)")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Query shape weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"Comma-separated scale factors to load and measure (default: {DEFAULT_SCALES})")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed for generated data")
+    parser.add_argument('--no-load', action='store_true',
+                        help="Measure the data already loaded instead of loading each scale "
+                             "(--scales then only labels the run)")
+    parser.add_argument('--write-tps', type=float,
+                        help="Run write_workload.py's OLTP transactions at this rate during warmup and "
+                             "measurement, to measure reads under concurrent writes")
+    parser.add_argument('--write-connections', type=int, default=DEFAULT_CLIENTS,
+                        help=f"Connections of the write workload (default: {DEFAULT_CLIENTS})")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    if args.write_tps is not None and (args.write_tps <= 0 or args.write_connections < 1):
+        parser.error("--write-tps and --write-connections must be positive")
+    if args.clients < 1 or args.duration <= 0 or args.warmup < 0:
+        parser.error("--clients and --duration must be positive and --warmup not negative")
+    if args.qps is not None and args.qps <= 0:
+        parser.error("--qps must be positive")
+    if args.mode == 'open' and not args.qps:
+        parser.error("--mode open requires --qps")
+    args.scales = [int(scale) for scale in args.scales.split(',')]
+    if args.no_load and len(args.scales) != 1:
+        parser.error("--no-load measures one dataset; give a single --scales value")
+    return args
+
+def new_histogram():
+    from hdrh.histogram import HdrHistogram
+    return HdrHistogram(LOWEST_US, HIGHEST_US, SIGNIFICANT_DIGITS)
+
+def run_query(cursor, shape, rng):
+    """Run one query of a shape against a randomly chosen table."""
+    if shape == 'list_tables':
+        cursor.execute("SHOW TABLES")
+    elif shape == 'select_limit':
+        cursor.execute(f"SELECT * FROM {rng.choice(seed_data.TABLE_ORDER)} LIMIT 10")
+    elif shape == 'describe':
+        cursor.execute(DESCRIBE_SQL, (rng.choice(seed_data.TABLE_ORDER),))
+    else:
+        cursor.execute(JOIN_SQL)
+    cursor.fetchall()
+
+def record_latency(histogram, latency_us, interval_us=None):
+    """Record a latency in microseconds, correcting for coordinated omission if `interval_us` is given."""
+    latency_us = min(max(int(latency_us), LOWEST_US), HIGHEST_US)
+    if interval_us:
+        # Back-fill the samples a stalled closed-loop client would have sent
+        histogram.record_corrected_value(latency_us, interval_us)
+    else:
+        histogram.record_value(latency_us)
+
+class Schedule:
+    """Open-loop arrival times at a fixed rate, handed out to clients in order."""
+
+    def __init__(self, started, qps, deadline):
+        self.started = started
+        self.interval = 1.0 / qps
+        self.deadline = deadline
+        self.next_index = 0
+        self.lock = threading.Lock()
+
+    def next(self):
+        """Return the next intended start time, or None once the run is over."""
+        with self.lock:
+            intended = self.started + self.next_index * self.interval
+            self.next_index += 1
+        return intended if intended < self.deadline else None
+
+def closed_loop_client(connection, mix, rng, deadline, histograms, interval=None):
+    """Issue queries back to back (or paced to `interval` seconds) until the deadline; return the count."""
+    shapes, weights = zip(*mix.items())
+    interval_us = interval * 1e6 if interval else None
+    clock = time.perf_counter
+    count = 0
+    with connection.cursor() as cursor:
+        while clock() < deadline:
+            count += 1
+            shape = rng.choices(shapes, weights)[0]
+            started = clock()
+            run_query(cursor, shape, rng)
+            finished = clock()
+            record_latency(histograms[shape], (finished - started) * 1e6, interval_us)
+            if interval and started + interval > finished:
+                time.sleep(started + interval - finished)
+    return count
+
+def open_loop_client(connection, mix, rng, schedule, histograms):
+    """Run queries at their scheduled times, measuring latency from the scheduled start; return the count."""
+    shapes, weights = zip(*mix.items())
+    clock = time.perf_counter
+    count = 0
+    with connection.cursor() as cursor:
+        while True:
+            intended = schedule.next()
+            if intended is None:
+                return count
+            count += 1
+            if intended > clock():
+                time.sleep(intended - clock())
+            shape = rng.choices(shapes, weights)[0]
+            run_query(cursor, shape, rng)
+            record_latency(histograms[shape], (clock() - intended) * 1e6, None)
+
+def run_clients(connections, mode, mix, duration, qps=None, seed=seed_data.DEFAULT_SEED):
+    """Run every client for `duration` seconds; return {shape: merged histogram} and the query count."""
+    per_client = [{shape: new_histogram() for shape in mix} for _ in connections]
+    counts = [0] * len(connections)
+    started = time.perf_counter()
+    deadline = started + duration
+    schedule = Schedule(started, qps, deadline) if mode == 'open' else None
+    threads = []
+    for index, connection in enumerate(connections):
+        rng = random.Random(seed * 1000 + index)
+        if mode == 'open':
+            target = partial(open_loop_client, connection, mix, rng, schedule, per_client[index])
+        else:
+            interval = len(connections) / qps if qps else None
+            target = partial(closed_loop_client, connection, mix, rng, deadline, per_client[index], interval)
+        threads.append(threading.Thread(target=_run_client, args=(target, counts, index), name=f"client-{index}"))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = {shape: new_histogram() for shape in mix}
+    for histograms in per_client:
+        for shape, histogram in histograms.items():
+            merged[shape].add(histogram)
+    return merged, sum(counts)
+
+def _run_client(target, counts, index):
+    counts[index] = target()
+
+def _ms(histogram, value_us):
+    return round(value_us / 1000, 3) if histogram.get_total_count() else None
+
+def summarize(histograms):
+    """Return {shape: {count, p50_ms, p99_ms, p999_ms, max_ms}}; counts include corrected samples."""
+    return {shape: {'count': histogram.get_total_count(),
+                    'p50_ms': _ms(histogram, histogram.get_value_at_percentile(50.0)),
+                    'p99_ms': _ms(histogram, histogram.get_value_at_percentile(99.0)),
+                    'p999_ms': _ms(histogram, histogram.get_value_at_percentile(99.9)),
+                    'max_ms': _ms(histogram, histogram.get_max_value())}
+            for shape, histogram in histograms.items()}
+
+def load_scale(settings, scale, seed):
+    """Reset the tables and load a generated dataset of the given scale."""
+    import rds_insert_test_data as rds
+    connection = rds.open_connection(settings['host'], settings['user'], settings['password'],
+                                     settings['database'], port=settings['port'])
+    try:
+        rds.insert_generated_data(connection, scale, seed, rds.insert_rows)
+    finally:
+        connection.close()
+
+def measure_scale(settings, args, scale):
+    """Warm up, then measure the query mix against the current dataset."""
+    import rds_insert_test_data as rds
+    connections = [rds.open_connection(settings['host'], settings['user'], settings['password'],
+                                       settings['database'], port=settings['port'])
+                   for _ in range(args.clients)]
+    writer = start_write_workload(settings, args) if args.write_tps else None
+    try:
+        if args.warmup:
+            run_clients(connections, args.mode, args.mix, args.warmup, args.qps, args.seed)
+        started = time.perf_counter()
+        histograms, queries = run_clients(connections, args.mode, args.mix, args.duration, args.qps, args.seed)
+        elapsed = time.perf_counter() - started
+    finally:
+        for connection in connections:
+            connection.close()
+        writes = writer() if writer else None
+    run = {'scale': scale, 'queries': queries, 'achieved_qps': round(queries / elapsed, 1),
+           'shapes': summarize(histograms)}
+    if writes:
+        run['writes'] = writes
+    return run
+
+def start_write_workload(settings, args):
+    """Start the write workload for the warmup and measured seconds; return a function that waits for its report."""
+    import write_workload
+    connections = write_workload.open_connections(settings, args.write_connections)
+    outcome = {}
+
+    def run():
+        try:
+            outcome['report'] = write_workload.run_workload(
+                connections, args.write_tps, args.warmup + args.duration,
+                write_workload.parse_mix(write_workload.DEFAULT_MIX, write_workload.TRANSACTIONS),
+                schema='rds', seed=args.seed)
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            for connection in connections:
+                connection.close()
+
+    thread = threading.Thread(target=run, name='write-workload')
+    thread.start()
+
+    def wait():
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['report']
+    return wait
+
+def print_report(runs):
+    """Print a latency table per scale."""
+    for run in runs:
+        print(f"\nScale {run['scale']}: {run['queries']} queries, {run['achieved_qps']} queries/sec")
+        print(f"  {'shape':<13} {'count':>8} {'p50 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'max ms':>9}")
+        for shape, stats in run['shapes'].items():
+            values = [stats[key] for key in ('p50_ms', 'p99_ms', 'p999_ms', 'max_ms')]
+            print(f"  {shape:<13} {stats['count']:>8} " +
+                  " ".join(f"{value:>9.3f}" if value is not None else f"{'-':>9}" for value in values))
+        if 'writes' in run:
+            import write_workload
+            write_workload.print_report(run['writes'])
+
+def main():
+    """Load each scale, replay the query mix and report latency percentiles."""
+    check_requirements()
+    args = parse_args()
+    settings = mysql_settings()
+    if not settings['host']:
+        print("Error: MYSQL_HOST is not set. Point the MYSQL_* variables at a disposable MySQL.")
+        return 1
+
+    runs = []
+    for scale in args.scales:
+        if not args.no_load:
+            print(f"Loading scale {scale}...", file=sys.stderr)
+            load_scale(settings, scale, args.seed)
+        print(f"Measuring scale {scale}: {args.mode} loop, {args.clients} clients"
+              f"{f', {args.qps:g} qps target' if args.qps else ''}, {args.duration:g}s...", file=sys.stderr)
+        runs.append(measure_scale(settings, args, scale))
+
+    print_report(runs)
+    if args.output:
+        report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'mode': args.mode,
+                  'clients': args.clients, 'target_qps': args.qps, 'mix': args.mix, 'runs': runs}
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
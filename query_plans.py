@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+
+"""Report how the plans of typical MCP queries change as the dataset grows.
+
+For each scale in --scales the tables are loaded with the generated dataset
+and every query in the catalog below is planned and run:
+
+- EXPLAIN FORMAT=JSON gives the access type, index and estimated rows per
+  table, the optimizer's cost and whether a filesort or temporary table is
+  needed.
+- EXPLAIN ANALYZE (MySQL 8.0.18 and later) gives the actual execution time.
+- The query itself is run --repeat times for the client-side latency, and
+  the session's Handler_read% counters give the rows it examined.
+
+A log-log fit of rows examined and latency against the scale factor shows how
+each query grows: about 0 when it is flat, 1 when it is linear, and above
+SUPERLINEAR_EXPONENT the query is flagged. At every scale each candidate
+secondary index that does not exist yet is added, the queries it targets are
+measured again, and the index is dropped; indexes that pay off at the
+largest scale are suggested with the DDL to create them.
+
+Needs a disposable MySQL named by MYSQL_HOST, MYSQL_PORT, MYSQL_USER,
+MYSQL_PASS and MYSQL_DB. The tables are those of reset_and_insert_data.sh /
+reset_test_data.py, or of rds_insert_test_data.py with --schema rds.
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import statistics
+
+import seed_data
+from benchmark_loaders import mysql_settings
+
+DEFAULT_SCALES = '1,10,100'
+DEFAULT_REPEAT = 5
+
+# Growth exponents (log-log slope against the scale factor)
+SUPERLINEAR_EXPONENT = 1.2
+LINEAR_EXPONENT = 0.8
+FLAT_EXPONENT = 0.2
+
+# An index is suggested when a query it targets gets this much faster
+MIN_SPEEDUP = 1.25
+
+# Column names that differ between the two MySQL schemas
+SCHEMA_NAMES = {
+    'reset': {'customer_key': 'id', 'product_key': 'id', 'order_key': 'id', 'product_name': 'name'},
+    'rds': {'customer_key': 'customer_id', 'product_key': 'product_id', 'order_key': 'order_id',
+            'product_name': 'product_name'},
+}
+
+# name -> (description, SQL); {placeholders} are SCHEMA_NAMES, %(params)s come from query_params()
+QUERY_CATALOG = {
+    'select_limit': (
+        "first rows of a table",
+        "SELECT * FROM orders LIMIT 10"),
+    'sample_join': (
+        "display_sample_data's customers/orders JOIN",
+        "SELECT c.first_name, c.last_name, o.{order_key}, o.total_amount, o.status "
+        "FROM customers c JOIN orders o ON c.{customer_key} = o.customer_id LIMIT 10"),
+    'customer_by_email': (
+        "one customer by email",
+        "SELECT * FROM customers WHERE email = %(email)s"),
+    'customer_orders': (
+        "latest orders of one customer",
+        "SELECT {order_key}, order_date, status, total_amount FROM orders "
+        "WHERE customer_id = %(customer_id)s ORDER BY order_date DESC LIMIT 10"),
+    'customer_orders_since': (
+        "one customer's orders of the last quarter",
+        "SELECT {order_key}, order_date, status, total_amount FROM orders "
+        "WHERE customer_id = %(customer_id)s AND order_date >= %(quarter_start)s"),
+    'recent_orders': (
+        "latest orders of all customers",
+        "SELECT {order_key}, customer_id, order_date, total_amount FROM orders "
+        "WHERE order_date >= %(week_start)s ORDER BY order_date DESC LIMIT 20"),
+    'order_details': (
+        "line items of one order with product names",
+        "SELECT p.{product_name}, oi.quantity, oi.unit_price FROM order_items oi "
+        "JOIN products p ON p.{product_key} = oi.product_id WHERE oi.order_id = %(order_id)s"),
+    'products_by_category': (
+        "cheapest products of a category",
+        "SELECT {product_key}, {product_name}, price FROM products "
+        "WHERE category = %(category)s ORDER BY price LIMIT 20"),
+    'status_counts': (
+        "orders and revenue per status",
+        "SELECT status, COUNT(*), SUM(total_amount) FROM orders GROUP BY status"),
+    'top_customers': (
+        "customers with the highest order value",
+        "SELECT c.{customer_key}, c.first_name, c.last_name, SUM(o.total_amount) AS spent "
+        "FROM customers c JOIN orders o ON o.customer_id = c.{customer_key} "
+        "GROUP BY c.{customer_key}, c.first_name, c.last_name ORDER BY spent DESC LIMIT 10"),
+}
+
+# Queries on columns that only one schema has
+QUERY_SCHEMAS = {
+    'products_by_category': ('reset',),
+}
+
+# Secondary indexes to try: name -> (table, columns, queries they target)
+CANDIDATE_INDEXES = {
+    'idx_orders_customer_date': ('orders', ('customer_id', 'order_date'),
+                                 ('customer_orders', 'customer_orders_since')),
+    'idx_orders_date': ('orders', ('order_date',), ('recent_orders',)),
+    'idx_products_category': ('products', ('category',), ('products_by_category',)),
+}
+
+# Generated products have no category; the reset schema's column is filled
+# from the product's base name, with the categories of its sample rows
+PRODUCT_CATEGORIES = {
+    'Laptop': 'Electronics', 'Smartphone': 'Electronics', 'Headphones': 'Electronics', 'Tablet': 'Electronics',
+    'Smart Watch': 'Electronics', 'Coffee Maker': 'Home Appliances', 'Blender': 'Home Appliances',
+    'Toaster Oven': 'Home Appliances', 'Air Purifier': 'Home Appliances', 'Running Shoes': 'Clothing',
+    'Winter Jacket': 'Clothing', 'Backpack': 'Accessories', 'Water Bottle': 'Accessories', 'Yoga Mat': 'Fitness',
+    'Dumbbells Set': 'Fitness', 'Desk Lamp': 'Home Decor',
+}
+QUERY_CATEGORY = 'Home Decor'
+
+_ANALYZE_TIME = re.compile(r"actual time=[\d.]+\.\.([\d.]+)")
+
+def check_requirements():
+    """Check if required modules are installed."""
+    try:
+        import pymysql  # noqa: F401
+    except ImportError:
+        print("Error: pymysql module is required but not installed.")
+        print("Please install it using: pip install pymysql")
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Report how MCP query plans and costs grow with the dataset")
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"Comma-separated scale factors to load and measure (default: {DEFAULT_SCALES})")
+    parser.add_argument('--schema', choices=tuple(SCHEMA_NAMES), default='reset',
+                        help="Tables of reset_and_insert_data.sh / reset_test_data.py or of "
+                             "rds_insert_test_data.py (default: reset)")
+    parser.add_argument('--queries', help=f"Comma-separated catalog queries to run (default: all of "
+                                          f"{', '.join(QUERY_CATALOG)})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per query after one warm-up run (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--no-indexes', action='store_true', help="Do not try the candidate secondary indexes")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed for generated data")
+    parser.add_argument('--no-load', action='store_true',
+                        help="Measure the data already loaded instead of loading each scale "
+                             "(--scales then only labels the run)")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+    args.scales = [int(scale) for scale in args.scales.split(',')]
+    if any(scale < 1 for scale in args.scales):
+        parser.error("scales must be positive integers")
+    if args.no_load and len(args.scales) != 1:
+        parser.error("--no-load measures one dataset; give a single --scales value")
+    available = [name for name in QUERY_CATALOG if args.schema in QUERY_SCHEMAS.get(name, (args.schema,))]
+    args.queries = args.queries.split(',') if args.queries else available
+    unknown = [name for name in args.queries if name not in available]
+    if unknown:
+        parser.error(f"unknown queries for the {args.schema} schema: {', '.join(unknown)} "
+                     f"(choose from {', '.join(available)})")
+    return args
+
+def catalog_sql(name, schema):
+    """Return a catalog query's SQL for a schema."""
+    return QUERY_CATALOG[name][1].format(**SCHEMA_NAMES[schema])
+
+def query_params(scale, seed):
+    """Return the parameters of the catalog queries: keys from the middle of the generated dataset."""
+    customer_id = (seed_data.table_row_count('customers', scale) + 1) // 2
+    order_end = seed_data.ORDER_EPOCH + seed_data.SECONDS_PER_YEAR
+    return {
+        'customer_id': customer_id,
+        'email': seed_data.customer_row(seed, customer_id)[3],
+        'order_id': (seed_data.table_row_count('orders', scale) + 1) // 2,
+        'quarter_start': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(order_end - 91 * 24 * 3600)),
+        'week_start': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(order_end - 7 * 24 * 3600)),
+        'category': QUERY_CATEGORY,
+    }
+
+def open_connection(settings):
+    import rds_insert_test_data as rds
+    return rds.open_connection(settings['host'], settings['user'], settings['password'], settings['database'],
+                               port=settings['port'], autocommit=True)
+
+def fill_categories(connection):
+    """Set products.category from each generated product's base name."""
+    cases = " ".join("WHEN name LIKE %s THEN %s" for _ in PRODUCT_CATEGORIES)
+    params = [value for base, category in PRODUCT_CATEGORIES.items() for value in (f"{base} %", category)]
+    with connection.cursor() as cursor:
+        cursor.execute(f"UPDATE products SET category = CASE {cases} END WHERE category IS NULL", params)
+    connection.commit()
+
+def load_scale(settings, schema, scale, seed):
+    """Reset the tables of a schema and load a generated dataset of the given scale."""
+    import rds_insert_test_data as rds
+    if schema == 'rds':
+        from query_benchmark import load_scale as load_rds_scale
+        load_rds_scale(settings, scale, seed)
+        return
+    import reset_test_data
+    connection = open_connection(settings)
+    try:
+        with connection.cursor() as cursor:
+            reset_test_data.reset_tables(cursor)
+        connection.commit()
+        reset_test_data.insert_generated_data(connection, scale, seed, rds.insert_rows)
+        fill_categories(connection)
+    finally:
+        connection.close()
+
+def handler_reads(cursor):
+    """Return the session's total Handler_read% count: rows and index entries read by the storage engine."""
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(value) for _, value in cursor.fetchall())
+
+def status_overhead(cursor):
+    """Return the Handler_read% count added by reading the counters themselves."""
+    before = handler_reads(cursor)
+    return handler_reads(cursor) - before
+
+def supports_explain_analyze(cursor):
+    import pymysql
+    try:
+        cursor.execute("EXPLAIN ANALYZE SELECT 1")
+        cursor.fetchall()
+        return True
+    except pymysql.MySQLError:
+        return False
+
+def plan_tables(node):
+    """Yield the table entries of an EXPLAIN FORMAT=JSON plan, in plan order."""
+    if isinstance(node, dict):
+        if 'table_name' in node and 'access_type' in node:
+            yield node
+        for value in node.values():
+            yield from plan_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from plan_tables(value)
+
+def _plan_flag(node, flag):
+    if isinstance(node, dict):
+        return bool(node.get(flag)) or any(_plan_flag(value, flag) for value in node.values())
+    if isinstance(node, list):
+        return any(_plan_flag(value, flag) for value in node)
+    return False
+
+def summarize_plan(plan):
+    """Reduce an EXPLAIN FORMAT=JSON plan to its cost, per-table access and sort/temporary flags."""
+    cost = plan.get('query_block', {}).get('cost_info', {}).get('query_cost')
+    return {
+        'cost': float(cost) if cost is not None else None,
+        'tables': [{'table': table['table_name'], 'access': table['access_type'], 'key': table.get('key'),
+                    'rows_per_scan': table.get('rows_examined_per_scan')}
+                   for table in plan_tables(plan)],
+        'filesort': _plan_flag(plan, 'using_filesort'),
+        'temporary': _plan_flag(plan, 'using_temporary_table'),
+    }
+
+def access_text(summary):
+    """Format a plan summary as e.g. 'orders:ref(customer_id) +filesort'."""
+    parts = [f"{table['table']}:{table['access']}" + (f"({table['key']})" if table['key'] else "")
+             for table in summary['tables']]
+    parts += [f"+{flag}" for flag in ('filesort', 'temporary') if summary[flag]]
+    return " ".join(parts)
+
+def measure_query(cursor, sql, params, repeat, overhead, analyze):
+    """Plan and run one query; return its plan summary, rows examined and latency."""
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    result = summarize_plan(json.loads(cursor.fetchone()[0]))
+
+    cursor.execute(sql, params)
+    cursor.fetchall()
+    before = handler_reads(cursor)
+    cursor.execute(sql, params)
+    result['rows_returned'] = len(cursor.fetchall())
+    result['rows_examined'] = max(handler_reads(cursor) - before - overhead, 0)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    result['median_ms'] = round(statistics.median(timings), 3)
+    result['best_ms'] = round(min(timings), 3)
+
+    result['analyze_ms'] = None
+    if analyze:
+        cursor.execute(f"EXPLAIN ANALYZE {sql}", params)
+        match = _ANALYZE_TIME.search(cursor.fetchone()[0])
+        if match:
+            result['analyze_ms'] = float(match.group(1))
+    return result
+
+def existing_indexes(cursor, table):
+    """Return the column tuples of a table's indexes."""
+    cursor.execute("SELECT index_name, column_name FROM information_schema.statistics "
+                   "WHERE table_schema = DATABASE() AND table_name = %s ORDER BY index_name, seq_in_index",
+                   (table,))
+    indexes = {}
+    for index_name, column_name in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column_name.lower())
+    return [tuple(columns) for columns in indexes.values()]
+
+def table_columns(cursor, table):
+    cursor.execute("SELECT column_name FROM information_schema.columns "
+                   "WHERE table_schema = DATABASE() AND table_name = %s", (table,))
+    return {column_name.lower() for column_name, in cursor.fetchall()}
+
+def candidate_indexes(cursor, queries):
+    """Return the candidate indexes that target a selected query, exist on no table yet and fit its columns."""
+    candidates = {}
+    for name, (table, columns, targets) in CANDIDATE_INDEXES.items():
+        targets = tuple(query for query in targets if query in queries)
+        if not targets or not set(columns) <= table_columns(cursor, table):
+            continue
+        # An index that starts with the same columns would serve the same lookups
+        if any(index[:len(columns)] == columns for index in existing_indexes(cursor, table)):
+            continue
+        candidates[name] = (table, columns, targets)
+    return candidates
+
+def index_ddl(name, table, columns):
+    return f"ALTER TABLE {table} ADD INDEX {name} ({', '.join(columns)})"
+
+def measure_scale(settings, args, scale):
+    """Measure the catalog against the current dataset, then each candidate index on its queries."""
+    connection = open_connection(settings)
+    try:
+        with connection.cursor() as cursor:
+            for table in seed_data.TABLE_ORDER:
+                cursor.execute(f"ANALYZE TABLE {table}")
+                cursor.fetchall()
+            overhead = status_overhead(cursor)
+            analyze = supports_explain_analyze(cursor)
+            params = query_params(scale, args.seed)
+
+            def measure(name):
+                return measure_query(cursor, catalog_sql(name, args.schema), params, args.repeat, overhead, analyze)
+
+            rows = {table: seed_data.table_row_count(table, scale) for table in ('customers', 'products', 'orders')}
+            run = {'scale': scale, 'rows': rows, 'queries': {}, 'indexes': {}}
+            for name in args.queries:
+                print(f"  {name}...", file=sys.stderr)
+                run['queries'][name] = measure(name)
+
+            if not args.no_indexes:
+                for name, (table, columns, targets) in candidate_indexes(cursor, args.queries).items():
+                    print(f"  with {name}...", file=sys.stderr)
+                    cursor.execute(index_ddl(name, table, columns))
+                    try:
+                        run['indexes'][name] = {query: measure(query) for query in targets}
+                    finally:
+                        cursor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+    finally:
+        connection.close()
+    return run
+
+def growth_exponent(points):
+    """Return the least-squares slope of log(value) against log(scale), or None with fewer than two scales."""
+    points = [(math.log(scale), math.log(max(value, 1e-9))) for scale, value in points if value is not None]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in points) /
+            sum((x - mean_x) ** 2 for x, _ in points))
+
+def growth_class(exponent):
+    if exponent is None:
+        return '-'
+    if exponent > SUPERLINEAR_EXPONENT:
+        return 'super-linear'
+    if exponent >= LINEAR_EXPONENT:
+        return 'linear'
+    if exponent >= FLAT_EXPONENT:
+        return 'sub-linear'
+    return 'flat'
+
+def analyze_growth(runs, queries):
+    """Return {query: growth exponents and classes} of rows examined and latency across the runs."""
+    growth = {}
+    for name in queries:
+        examined = growth_exponent([(run['scale'], max(run['queries'][name]['rows_examined'], 1)) for run in runs])
+        latency = growth_exponent([(run['scale'], run['queries'][name]['median_ms']) for run in runs])
+        growth[name] = {'rows_examined_exponent': round(examined, 2) if examined is not None else None,
+                        'latency_exponent': round(latency, 2) if latency is not None else None,
+                        'rows_examined_growth': growth_class(examined), 'latency_growth': growth_class(latency),
+                        'super_linear': any(exponent is not None and exponent > SUPERLINEAR_EXPONENT
+                                            for exponent in (examined, latency))}
+    return growth
+
+def suggest_indexes(runs):
+    """Return the candidate indexes that made a targeted query MIN_SPEEDUP faster at the largest scale."""
+    largest = max(runs, key=lambda run: run['scale'])
+    suggestions = []
+    for name, measured in largest['indexes'].items():
+        table, columns, _ = CANDIDATE_INDEXES[name]
+        queries = {}
+        for query, after in measured.items():
+            before = largest['queries'][query]
+            queries[query] = {'before_ms': before['median_ms'], 'after_ms': after['median_ms'],
+                              'speedup': round(before['median_ms'] / max(after['median_ms'], 1e-3), 2),
+                              'before_rows_examined': before['rows_examined'],
+                              'after_rows_examined': after['rows_examined'],
+                              'before_access': access_text(before), 'after_access': access_text(after)}
+        if any(stats['speedup'] >= MIN_SPEEDUP for stats in queries.values()):
+            suggestions.append({'index': name, 'scale': largest['scale'], 'ddl': index_ddl(name, table, columns),
+                                'queries': queries})
+    return suggestions
+
+def print_report(runs, growth, suggestions):
+    """Print the plans per scale, the growth of every query and the suggested indexes."""
+    for run in runs:
+        print(f"\nScale {run['scale']} ({', '.join(f'{count} {table}' for table, count in run['rows'].items())}):")
+        print(f"  {'query':<22} {'examined':>10} {'returned':>8} {'median ms':>10} {'analyze ms':>10}  access")
+        for name, stats in run['queries'].items():
+            analyze_ms = f"{stats['analyze_ms']:>10.3f}" if stats['analyze_ms'] is not None else f"{'-':>10}"
+            print(f"  {name:<22} {stats['rows_examined']:>10} {stats['rows_returned']:>8} "
+                  f"{stats['median_ms']:>10.3f} {analyze_ms}  {access_text(stats)}")
+
+    if len(runs) > 1:
+        print(f"\nGrowth from scale {runs[0]['scale']} to {runs[-1]['scale']} (log-log slope; 1 = linear):")
+        print(f"  {'query':<22} {'examined':>8} {'':<13} {'latency':>8}")
+        for name, stats in growth.items():
+            exponents = [f"{value:>8.2f}" if value is not None else f"{'-':>8}"
+                         for value in (stats['rows_examined_exponent'], stats['latency_exponent'])]
+            flag = "  <-- super-linear" if stats['super_linear'] else ""
+            print(f"  {name:<22} {exponents[0]} {stats['rows_examined_growth']:<13} {exponents[1]} "
+                  f"{stats['latency_growth']}{flag}")
+
+    if suggestions:
+        print(f"\nSuggested indexes (measured at scale {suggestions[0]['scale']}):")
+        for suggestion in suggestions:
+            print(f"  {suggestion['ddl']};")
+            for query, stats in suggestion['queries'].items():
+                print(f"    {query}: {stats['before_ms']:.3f} -> {stats['after_ms']:.3f} ms "
+                      f"({stats['speedup']:.2f}x), rows examined {stats['before_rows_examined']} -> "
+                      f"{stats['after_rows_examined']}, {stats['before_access']} -> {stats['after_access']}")
+    elif runs[-1]['indexes']:
+        print(f"\nNo candidate index made its queries {MIN_SPEEDUP:g}x faster.")
+
+def main():
+    """Load each scale, plan and time the query catalog, and report growth and index suggestions."""
+    check_requirements()
+    args = parse_args()
+    settings = mysql_settings()
+    if not settings['host']:
+        print("Error: MYSQL_HOST is not set. Point the MYSQL_* variables at a disposable MySQL.")
+        return 1
+
+    runs = []
+    for scale in sorted(args.scales):
+        if not args.no_load:
+            print(f"Loading scale {scale}...", file=sys.stderr)
+            load_scale(settings, args.schema, scale, args.seed)
+        print(f"Measuring scale {scale}...", file=sys.stderr)
+        runs.append(measure_scale(settings, args, scale))
+
+    growth = analyze_growth(runs, args.queries)
+    suggestions = suggest_indexes(runs)
+    print_report(runs, growth, suggestions)
+    if args.output:
+        report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'schema': args.schema,
+                  'seed': args.seed, 'repeat': args.repeat,
+                  'queries': {name: {'description': QUERY_CATALOG[name][0], 'sql': catalog_sql(name, args.schema)}
+                              for name in args.queries},
+                  'runs': runs, 'growth': growth,
+                  'suggestions': suggestions}
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
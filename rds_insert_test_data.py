@@ -1,10 +1,30 @@
 #!/usr/bin/env python3
 
+import os
+import re
 import sys
+import json
+import time
 import getpass
+import hashlib
+import asyncio
+import argparse
+import tempfile
+import threading
+import queue
+import shutil
+import contextlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import pymysql
 from pymysql.cursors import DictCursor
 
+import seed_data
+import async_loader
+import verify_data
+import dataset_snapshots
+import statement_trace
+
 def check_requirements():
     """Check if required modules are installed."""
     try:
@@ -28,79 +48,787 @@ def confirm_operation():
     confirm = input("Continue? (y/n): ")
     return confirm.lower() in ['y', 'yes']
 
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Insert test data into an RDS MySQL database")
+    parser.add_argument('--scale', type=int,
+                        help="Generate a scaled dataset instead of the fixed sample rows "
+                             f"(1 unit = {seed_data.ROWS_PER_SCALE['customers']} customers, "
+                             f"{seed_data.ROWS_PER_SCALE['products']} products, "
+                             f"{seed_data.ROWS_PER_SCALE['orders']} orders)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--batch-size', type=int, default=seed_data.DEFAULT_BATCH_SIZE,
+                        help=f"Rows per multi-row INSERT (default: {seed_data.DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Load key ranges in parallel over this many connections (default: 1)")
+    parser.add_argument('--bulk-load', action='store_true',
+                        help="Load generated data with LOAD DATA LOCAL INFILE, falling back to "
+                             "multi-row INSERTs if the server has local_infile disabled")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Skip tables whose schema and data already match, truncate and reload tables "
+                             "whose data drifted, and only drop tables whose schema changed")
+    parser.add_argument('--defer-constraints', action='store_true',
+                        help="Create tables with only their primary keys, load with foreign_key_checks and "
+                             "unique_checks off, then add UNIQUE keys and foreign keys and check "
+                             "referential integrity")
+    parser.add_argument('--async-inflight', type=int, metavar='N',
+                        help="Load generated data with the asyncio loader, keeping N INSERT batches in flight "
+                             "over aiomysql connections (for high-latency links)")
+    parser.add_argument('--verify', action='store_true',
+                        help="After loading, compare per-table row counts and content hashes computed by the "
+                             "server with those of the generated rows, and drill down into differing key ranges")
+    add_snapshot_args(parser)
+    statement_trace.add_trace_args(parser)
+    args = parser.parse_args()
+    if args.scale is not None and args.scale < 1:
+        parser.error("--scale must be a positive integer")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be a positive integer")
+    if args.workers < 1:
+        parser.error("--workers must be a positive integer")
+    if args.workers > 1 and not args.scale:
+        parser.error("--workers requires --scale")
+    if args.bulk_load and not args.scale:
+        parser.error("--bulk-load requires --scale")
+    if args.snapshot_max_bytes < 1:
+        parser.error("--snapshot-max-bytes must be a positive integer")
+    if args.async_inflight is not None and (args.async_inflight < 1 or not args.scale):
+        parser.error("--async-inflight requires --scale and a positive N")
+    if args.async_inflight and (args.workers > 1 or args.bulk_load or args.incremental or args.defer_constraints):
+        parser.error("--async-inflight cannot be combined with --workers, --bulk-load, --incremental "
+                     "or --defer-constraints")
+    if args.incremental and args.workers > 1:
+        parser.error("--incremental cannot be combined with --workers")
+    if args.defer_constraints and (not args.scale or args.incremental):
+        parser.error("--defer-constraints requires --scale and cannot be combined with --incremental")
+    if args.verify and (not args.scale or args.incremental or args.async_inflight):
+        parser.error("--verify requires --scale and cannot be combined with --incremental or --async-inflight "
+                     "(run verify_data.py after those loads)")
+    return args
+
+def add_snapshot_args(parser):
+    """Add the dataset snapshot cache options to an argument parser."""
+    parser.add_argument('--snapshot-dir', default=dataset_snapshots.DEFAULT_CACHE_DIR,
+                        help="Cache generated datasets here and restore later loads of the same seed and "
+                             f"scale from it (default: {dataset_snapshots.DEFAULT_CACHE_DIR})")
+    parser.add_argument('--snapshot-max-bytes', type=int, default=dataset_snapshots.DEFAULT_CACHE_BYTES,
+                        help="Evict least recently used snapshots beyond this size "
+                             f"(default: {dataset_snapshots.DEFAULT_CACHE_BYTES})")
+    parser.add_argument('--no-snapshot', action='store_true', help="Neither read nor write snapshots")
+
+def open_snapshot_cache(args):
+    """Return the SnapshotCache selected by the command line, or None if disabled."""
+    if args.no_snapshot:
+        return None
+    return dataset_snapshots.SnapshotCache(args.snapshot_dir, args.snapshot_max_bytes)
+
+class TracedConnection(pymysql.connections.Connection):
+    """pymysql connection that records a statement_trace span per query, commit and rollback.
+
+    Every cursor class goes through Connection.query, so this covers all of
+    them; bytes are counted at the socket, protocol framing included.
+    """
+
+    bytes_sent = 0
+    bytes_received = 0
+
+    def _write_bytes(self, data):
+        self.bytes_sent += len(data)
+        super()._write_bytes(data)
+
+    def _read_bytes(self, num_bytes):
+        data = super()._read_bytes(num_bytes)
+        self.bytes_received += len(data)
+        return data
+
+    def query(self, sql, unbuffered=False):
+        # Unbuffered result sets report no row count until they are read
+        return self._traced('query', sql, super().query, sql, unbuffered, rows=not unbuffered)
+
+    def commit(self):
+        return self._traced('commit', None, super().commit)
+
+    def rollback(self):
+        return self._traced('rollback', None, super().rollback)
+
+    def _traced(self, kind, sql, call, *args, rows=False):
+        tracer = statement_trace.TRACER
+        if tracer is None:
+            return call(*args)
+        sent, received = self.bytes_sent, self.bytes_received
+        started = time.time()
+        clock = time.perf_counter()
+        result = error = None
+        try:
+            result = call(*args)
+            return result
+        except pymysql.MySQLError as e:
+            error = f"{type(e).__name__}({e.args[0] if e.args else ''})"
+            raise
+        finally:
+            tracer.record(kind, sql, time.perf_counter() - clock, started, rows=result if rows else None,
+                          request_bytes=self.bytes_sent - sent, response_bytes=self.bytes_received - received,
+                          error=error)
+
+def open_connection(host, user, password, database, **kwargs):
+    """Open a pymysql connection to the test database, traced when statement tracing is on."""
+    connection_class = TracedConnection if statement_trace.TRACER else pymysql.connections.Connection
+    return connection_class(
+        host=host,
+        user=user,
+        password=password,
+        database=database,
+        charset='utf8mb4',
+        **kwargs
+    )
+
+# Column definitions and table constraints, in creation order (parents first)
+TABLE_SCHEMAS = {
+    'customers': {
+        'columns': (
+            ('customer_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('first_name', 'VARCHAR(50) NOT NULL'),
+            ('last_name', 'VARCHAR(50) NOT NULL'),
+            ('email', 'VARCHAR(100) UNIQUE NOT NULL'),
+            ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ),
+        'constraints': (),
+    },
+    'products': {
+        'columns': (
+            ('product_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('product_name', 'VARCHAR(100) NOT NULL'),
+            ('description', 'TEXT'),
+            ('price', 'DECIMAL(10, 2) NOT NULL'),
+            ('stock_quantity', 'INT NOT NULL DEFAULT 0'),
+        ),
+        'constraints': (),
+    },
+    'orders': {
+        'columns': (
+            ('order_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('customer_id', 'INT NOT NULL'),
+            ('order_date', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+            ('total_amount', 'DECIMAL(10, 2) NOT NULL'),
+            ('status', "ENUM('pending', 'processing', 'shipped', 'delivered', 'cancelled') DEFAULT 'pending'"),
+        ),
+        'constraints': (
+            'FOREIGN KEY (customer_id) REFERENCES customers(customer_id)',
+        ),
+    },
+    'order_items': {
+        'columns': (
+            ('order_item_id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('order_id', 'INT NOT NULL'),
+            ('product_id', 'INT NOT NULL'),
+            ('quantity', 'INT NOT NULL'),
+            ('unit_price', 'DECIMAL(10, 2) NOT NULL'),
+        ),
+        'constraints': (
+            'FOREIGN KEY (order_id) REFERENCES orders(order_id)',
+            'FOREIGN KEY (product_id) REFERENCES products(product_id)',
+        ),
+    },
+}
+
+_FOREIGN_KEY = re.compile(r"FOREIGN KEY \((\w+)\) REFERENCES (\w+)\((\w+)\)")
+
+def create_table_sql(table, schema, deferred=False):
+    """Render the CREATE TABLE statement for a TABLE_SCHEMAS-style entry.
+
+    With `deferred`, UNIQUE keys and foreign keys are left out; see
+    deferred_constraints_sql().
+    """
+    lines = []
+    for name, definition in schema['columns']:
+        if deferred:
+            definition = definition.replace(' UNIQUE', '')
+        lines.append(f"{name} {definition}")
+    if not deferred:
+        lines.extend(schema['constraints'])
+    return f"CREATE TABLE {table} (\n    " + ",\n    ".join(lines) + "\n)"
+
+def deferred_constraints_sql(table, schema):
+    """Return the ALTER TABLE adding what create_table_sql(deferred=True) left out, or None.
+
+    Keys and constraints get the names MySQL generates for the full DDL
+    (the column name for indexes, <table>_ibfk_<n> for foreign keys), so the
+    resulting schema is identical to creating the table in one go.
+    """
+    clauses = []
+    indexed = set()
+    for name, definition in schema['columns']:
+        if 'PRIMARY KEY' in definition:
+            indexed.add(name)
+        if ' UNIQUE' in definition:
+            clauses.append(f"ADD UNIQUE KEY {name} ({name})")
+            indexed.add(name)
+    foreign_keys = [_FOREIGN_KEY.search(constraint) for constraint in schema['constraints']]
+    for match in foreign_keys:
+        # InnoDB creates an index for every foreign key column that has none
+        if match and match.group(1) not in indexed:
+            clauses.append(f"ADD KEY {match.group(1)} ({match.group(1)})")
+            indexed.add(match.group(1))
+    for number, constraint in enumerate(schema['constraints'], 1):
+        clauses.append(f"ADD CONSTRAINT {table}_ibfk_{number} {constraint}")
+    if not clauses:
+        return None
+    return f"ALTER TABLE {table} " + ", ".join(clauses)
+
+# Session settings for a deferred-constraint load: the constraints are added,
+# and referential integrity checked, once the data is in
+BULK_SESSION_SQL = "SET SESSION foreign_key_checks = 0, SESSION unique_checks = 0, SESSION autocommit = 0"
+RESTORE_SESSION_SQL = "SET SESSION foreign_key_checks = 1, SESSION unique_checks = 1"
+
+def add_deferred_constraints(connection, schemas, tables):
+    """Add the deferred UNIQUE keys and foreign keys, one ALTER per table, then check referential integrity."""
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        # With foreign_key_checks off the foreign keys are added in place instead of copying the table
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        for table in tables:
+            sql = deferred_constraints_sql(table, schemas[table])
+            if sql:
+                print(f"Adding indexes and foreign keys to {table}...")
+                cursor.execute(sql)
+
+        violations = []
+        for table in tables:
+            for constraint in schemas[table]['constraints']:
+                column, parent, parent_column = _FOREIGN_KEY.search(constraint).groups()
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {table} child LEFT JOIN {parent} parent "
+                    f"ON parent.{parent_column} = child.{column} "
+                    f"WHERE parent.{parent_column} IS NULL AND child.{column} IS NOT NULL")
+                orphans = cursor.fetchone()[0]
+                if orphans:
+                    violations.append(f"{table}.{column}: {orphans} rows without a matching {parent}")
+        cursor.execute(RESTORE_SESSION_SQL)
+    if violations:
+        raise RuntimeError("Referential integrity check failed: " + "; ".join(violations))
+
+TABLE_DDL = {table: create_table_sql(table, schema) for table, schema in TABLE_SCHEMAS.items()}
+
+# Fixed sample rows, one INSERT per table
+SAMPLE_INSERTS = {
+    'customers': """
+    INSERT INTO customers (first_name, last_name, email) VALUES
+    ('John', 'Doe', 'john.doe@example.com'),
+    ('Jane', 'Smith', 'jane.smith@example.com'),
+    ('Robert', 'Johnson', 'robert.johnson@example.com'),
+    ('Emily', 'Williams', 'emily.williams@example.com'),
+    ('Michael', 'Brown', 'michael.brown@example.com')
+    """,
+    'products': """
+    INSERT INTO products (product_name, description, price, stock_quantity) VALUES
+    ('Laptop', 'High-performance laptop with 16GB RAM', 1299.99, 50),
+    ('Smartphone', 'Latest model with 128GB storage', 899.99, 100),
+    ('Headphones', 'Noise-cancelling wireless headphones', 249.99, 75),
+    ('Tablet', '10-inch tablet with retina display', 499.99, 30),
+    ('Smart Watch', 'Fitness tracking and notifications', 199.99, 60)
+    """,
+    'orders': """
+    INSERT INTO orders (customer_id, total_amount, status) VALUES
+    (1, 1299.99, 'delivered'),
+    (2, 899.99, 'shipped'),
+    (3, 249.99, 'processing'),
+    (4, 699.98, 'pending'),
+    (5, 199.99, 'delivered'),
+    (1, 499.99, 'shipped')
+    """,
+    'order_items': """
+    INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES
+    (1, 1, 1, 1299.99),
+    (2, 2, 1, 899.99),
+    (3, 3, 1, 249.99),
+    (4, 4, 1, 499.99),
+    (4, 5, 1, 199.99),
+    (5, 5, 1, 199.99),
+    (6, 4, 1, 499.99)
+    """,
+}
+
+def create_tables(cursor, deferred=False):
+    """Drop and recreate the test tables, without UNIQUE keys and foreign keys if `deferred`."""
+    # Drop tables if they exist (children first)
+    for table in reversed(seed_data.TABLE_ORDER):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    # Create tables
+    for table in seed_data.TABLE_ORDER:
+        cursor.execute(create_table_sql(table, TABLE_SCHEMAS[table], deferred))
+
 def execute_sql_commands(connection):
     """Execute SQL commands to create and populate tables."""
     with connection.cursor() as cursor:
-        # Drop tables if they exist
-        cursor.execute("DROP TABLE IF EXISTS orders")
-        cursor.execute("DROP TABLE IF EXISTS customers")
-        cursor.execute("DROP TABLE IF EXISTS products")
+        create_tables(cursor)
 
-        # Create tables
-        cursor.execute("""
-        CREATE TABLE customers (
-            customer_id INT AUTO_INCREMENT PRIMARY KEY,
-            first_name VARCHAR(50) NOT NULL,
-            last_name VARCHAR(50) NOT NULL,
-            email VARCHAR(100) UNIQUE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
+        # Insert sample data
+        for table in seed_data.TABLE_ORDER:
+            cursor.execute(SAMPLE_INSERTS[table])
 
-        cursor.execute("""
-        CREATE TABLE products (
-            product_id INT AUTO_INCREMENT PRIMARY KEY,
-            product_name VARCHAR(100) NOT NULL,
-            description TEXT,
-            price DECIMAL(10, 2) NOT NULL,
-            stock_quantity INT NOT NULL DEFAULT 0
-        )
-        """)
+    # Commit the changes
+    connection.commit()
 
-        cursor.execute("""
-        CREATE TABLE orders (
-            order_id INT AUTO_INCREMENT PRIMARY KEY,
-            customer_id INT NOT NULL,
-            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            total_amount DECIMAL(10, 2) NOT NULL,
-            status ENUM('pending', 'processing', 'shipped', 'delivered', 'cancelled') DEFAULT 'pending',
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
-        )
-        """)
+# Incremental reset: after loading a table, a local file records a fingerprint
+# of the DDL it was created from, of its SHOW CREATE TABLE output, of the
+# dataset it was loaded with, and a row-hash aggregate of its content. The file
+# is keyed by server and database; the tables themselves are left untouched,
+# so the schema the MCP servers describe carries no bookkeeping.
+FINGERPRINT_FILE = os.environ.get('RESET_FINGERPRINT_FILE',
+                                  os.path.join(dataset_snapshots.DEFAULT_CACHE_DIR, 'reset-fingerprints.json'))
+FINGERPRINT_FIELDS = ('ddl', 'shape', 'data', 'rows', 'sum')
+_AUTO_INCREMENT = re.compile(r" AUTO_INCREMENT=\d+")
+
+def fingerprint(*parts):
+    """Return a short, stable hash of the given values."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+def _show_create_table(connection, table):
+    """Return SHOW CREATE TABLE output, or None if the table does not exist."""
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        try:
+            cursor.execute(f"SHOW CREATE TABLE {table}")
+        except pymysql.err.ProgrammingError as e:
+            if e.args[0] == 1146:  # ER_NO_SUCH_TABLE
+                return None
+            raise
+        return cursor.fetchone()[1]
+
+def _fingerprint_key(connection):
+    database = connection.db.decode() if isinstance(connection.db, bytes) else connection.db
+    return f"{connection.host}:{connection.port}/{database}"
+
+def load_fingerprints(path=FINGERPRINT_FILE):
+    """Return the fingerprint file's contents, or {} if it is missing or unreadable."""
+    try:
+        with open(path) as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def save_fingerprints(state, path=FINGERPRINT_FILE):
+    """Replace the fingerprint file atomically."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as state_file:
+        json.dump(state, state_file, indent=1, sort_keys=True)
+    os.replace(temp_path, path)
+
+def stored_fingerprint(connection, table, path=FINGERPRINT_FILE):
+    """Return a table's stored fingerprint, or {} if there is none or it cannot be parsed."""
+    tables = load_fingerprints(path).get(_fingerprint_key(connection))
+    stored = tables.get(table) if isinstance(tables, dict) else None
+    if not isinstance(stored, dict) or any(field not in stored for field in FINGERPRINT_FIELDS):
+        return {}
+    return stored
+
+def read_fingerprint(connection, table, path=FINGERPRINT_FILE):
+    """Return (stored fingerprint dict, live schema hash), or None if the table does not exist."""
+    ddl = _show_create_table(connection, table)
+    if ddl is None:
+        return None
+    # AUTO_INCREMENT moves with the data; it is not schema
+    return stored_fingerprint(connection, table, path), fingerprint(_AUTO_INCREMENT.sub('', ddl))
+
+def content_checksum(connection, table):
+    """Return (row count, sum of per-row CRC32) over every column of a table."""
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION", (table,))
+        columns = [row[0] for row in cursor.fetchall()]
+        # IFNULL keeps NULLs from being skipped by CONCAT_WS, which would shift columns
+        row_text = ", ".join(f"IFNULL(`{column}`, CHAR(0))" for column in columns)
+        cursor.execute(f"SELECT COUNT(*), COALESCE(SUM(CRC32(CONCAT_WS('|', {row_text}))), 0) FROM {table}")
+        count, total = cursor.fetchone()
+    return int(count), int(total)
+
+def record_fingerprint(connection, table, ddl_hash, data_hash, path=FINGERPRINT_FILE):
+    """Store the table's fingerprint in the fingerprint file after a load."""
+    _, shape = read_fingerprint(connection, table, path)
+    count, total = content_checksum(connection, table)
+    state = load_fingerprints(path)
+    key = _fingerprint_key(connection)
+    if not isinstance(state.get(key), dict):
+        state[key] = {}
+    state[key][table] = {'ddl': ddl_hash, 'shape': shape, 'data': data_hash, 'rows': count, 'sum': total}
+    save_fingerprints(state, path)
+
+def forget_fingerprints(connection, tables, path=FINGERPRINT_FILE):
+    """Drop the stored fingerprints of tables about to be reloaded, so an interrupted load is not skipped."""
+    state = load_fingerprints(path)
+    stored = state.get(_fingerprint_key(connection))
+    if isinstance(stored, dict) and any(table in stored for table in tables):
+        for table in tables:
+            stored.pop(table, None)
+        save_fingerprints(state, path)
+
+def classify_table(connection, table, ddl_hash, data_hash):
+    """Return 'skip', 'reload' or 'recreate' for a table, comparing the live table to its fingerprint."""
+    live = read_fingerprint(connection, table)
+    if live is None:
+        return 'recreate'
+    stored, shape = live
+    if stored.get('ddl') != ddl_hash or stored.get('shape') != shape:
+        return 'recreate'
+    if stored.get('data') != data_hash:
+        return 'reload'
+    count, total = content_checksum(connection, table)
+    if stored.get('rows') != count or stored.get('sum') != total:
+        return 'reload'
+    return 'skip'
+
+def incremental_reset(connection, tables, dependencies, ddl, data_hashes, load_table):
+    """Bring tables to their expected schema and content, redoing only what changed.
+
+    Tables that match their fingerprint are skipped, tables whose data drifted
+    are truncated and reloaded, and only schema changes drop and recreate a
+    table (and, through their foreign keys, the tables that reference it).
+    `tables` is in creation order, `ddl` and `data_hashes` map each table to
+    its CREATE TABLE statement and dataset hash, and `load_table(table)`
+    inserts a table's rows. Returns the action taken per table.
+    """
+    plan = {}
+    for table in tables:
+        ddl_hash = fingerprint(ddl[table].strip())
+        action = classify_table(connection, table, ddl_hash, data_hashes[table])
+        if any(plan.get(parent) == 'recreate' for parent in dependencies.get(table, ())):
+            action = 'recreate'
+        plan[table] = action
+        print(f"{table}: {action}")
+
+    forget_fingerprints(connection, [table for table in tables if plan[table] != 'skip'])
+    with connection.cursor() as cursor:
+        # TRUNCATE and DROP of a referenced table are refused while foreign key checks are on
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        try:
+            for table in reversed(tables):
+                if plan[table] == 'recreate':
+                    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                elif plan[table] == 'reload':
+                    cursor.execute(f"TRUNCATE TABLE {table}")
+            for table in tables:
+                if plan[table] == 'recreate':
+                    cursor.execute(ddl[table])
+        finally:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    connection.commit()
 
-        # Insert sample data into customers
-        cursor.execute("""
-        INSERT INTO customers (first_name, last_name, email) VALUES
-        ('John', 'Doe', 'john.doe@example.com'),
-        ('Jane', 'Smith', 'jane.smith@example.com'),
-        ('Robert', 'Johnson', 'robert.johnson@example.com'),
-        ('Emily', 'Williams', 'emily.williams@example.com'),
-        ('Michael', 'Brown', 'michael.brown@example.com')
-        """)
+    for table in tables:
+        if plan[table] != 'skip':
+            load_table(table)
+            connection.commit()
+            record_fingerprint(connection, table, fingerprint(ddl[table].strip()), data_hashes[table])
+    return plan
+
+def reset_tables_incremental(connection, scale, seed, load_rows):
+    """Incrementally reset the tables to the sample rows, or to a generated dataset if `scale` is set."""
+    def load_table(table):
+        if scale:
+            rows = seed_data.generate_rows(table, scale, seed)
+            print(f"Loading {table}: {load_rows(connection, table, seed_data.COLUMNS[table], rows)} rows")
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(SAMPLE_INSERTS[table])
+
+    if scale:
+        data_hashes = {table: fingerprint(seed_data.DATASET_VERSION, table, scale, seed)
+                       for table in seed_data.TABLE_ORDER}
+    else:
+        data_hashes = {table: fingerprint(SAMPLE_INSERTS[table].strip()) for table in seed_data.TABLE_ORDER}
+    return incremental_reset(connection, seed_data.TABLE_ORDER, seed_data.TABLE_DEPENDENCIES,
+                             TABLE_DDL, data_hashes, load_table)
+
+def insert_sql(table, columns):
+    """Return the parameterised INSERT for a table, in the form executemany batches into multi-row INSERTs."""
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+def insert_rows(connection, table, columns, rows, batch_size=seed_data.DEFAULT_BATCH_SIZE):
+    """Insert rows from an iterator in chunked multi-row INSERTs, committing per chunk."""
+    sql = insert_sql(table, columns)
+
+    inserted = 0
+    with connection.cursor() as cursor:
+        for chunk in seed_data.chunked(rows, batch_size):
+            # pymysql rewrites executemany on INSERT ... VALUES into multi-row statements
+            cursor.executemany(sql, chunk)
+            connection.commit()
+            inserted += len(chunk)
+    return inserted
+
+# Matches the CSV dialect written by seed_data.write_csv
+LOAD_DATA_SQL = (
+    "LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+    "LINES TERMINATED BY '\\n' ({columns})"
+)
+
+BULK_CHUNK_ROWS = 100000
+FIFO_CHUNK_BYTES = 64 * 1024
+
+def local_infile_enabled(connection):
+    """Return True if the server accepts LOAD DATA LOCAL INFILE."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT @@GLOBAL.local_infile")
+        row = cursor.fetchone()
+    value = list(row.values())[0] if isinstance(row, dict) else row[0]
+    return str(value).upper() in ('1', 'ON')
 
-        # Insert sample data into products
-        cursor.execute("""
-        INSERT INTO products (product_name, description, price, stock_quantity) VALUES
-        ('Laptop', 'High-performance laptop with 16GB RAM', 1299.99, 50),
-        ('Smartphone', 'Latest model with 128GB storage', 899.99, 100),
-        ('Headphones', 'Noise-cancelling wireless headphones', 249.99, 75),
-        ('Tablet', '10-inch tablet with retina display', 499.99, 30),
-        ('Smart Watch', 'Fitness tracking and notifications', 199.99, 60)
-        """)
+def _write_csv_chunks(rows, chunk_rows, ready, stop):
+    """Write rows into temporary CSV files of `chunk_rows` rows, queueing their paths."""
+    try:
+        for chunk in seed_data.chunked(rows, chunk_rows):
+            with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8',
+                                             delete=False) as csv_file:
+                seed_data.write_csv(chunk, csv_file)
+            ready.put((csv_file.name, len(chunk)))
+            if stop.is_set():
+                break
+    except Exception as e:
+        ready.put(e)
+        return
+    ready.put(None)
+
+def bulk_load_rows(connection, table, columns, rows, chunk_rows=BULK_CHUNK_ROWS):
+    """Load rows through LOAD DATA LOCAL INFILE, committing per chunk.
+
+    A background thread writes the next CSV chunk while the current one is
+    being loaded; at most two chunks exist on disk at any time.
+    """
+    sql = LOAD_DATA_SQL.format(table=table, columns=', '.join(columns))
+    ready = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    writer = threading.Thread(target=_write_csv_chunks, args=(rows, chunk_rows, ready, stop), daemon=True)
+    writer.start()
+
+    loaded = 0
+    try:
+        with connection.cursor() as cursor:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                path, count = item
+                try:
+                    cursor.execute(sql, (path,))
+                    connection.commit()
+                finally:
+                    os.unlink(path)
+                loaded += count
+    finally:
+        # Drain the writer so no temp files are left behind on error
+        stop.set()
+        while writer.is_alive() or not ready.empty():
+            try:
+                item = ready.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if isinstance(item, tuple):
+                os.unlink(item[0])
+        writer.join()
+    return loaded
+
+def _feed_fifo(stream, fifo_path, failed):
+    """Copy a binary stream into a named pipe until it ends or the reader goes away."""
+    try:
+        with stream, open(fifo_path, 'wb') as fifo:
+            shutil.copyfileobj(stream, fifo, FIFO_CHUNK_BYTES)
+    except BrokenPipeError:
+        pass
+    except Exception as e:
+        failed.append(e)
+
+def bulk_load_stream(connection, table, columns, stream):
+    """Load CSV from a binary stream with LOAD DATA LOCAL INFILE through a named pipe.
+
+    The stream is copied into the pipe by a background thread while the
+    server reads it, so nothing is staged on disk. The load is rolled back if
+    the stream fails part way through.
+    """
+    sql = LOAD_DATA_SQL.format(table=table, columns=', '.join(columns))
+    directory = tempfile.mkdtemp()
+    fifo_path = os.path.join(directory, f"{table}.csv")
+    os.mkfifo(fifo_path)
+    failed = []
+    feeder = threading.Thread(target=_feed_fifo, args=(stream, fifo_path, failed), daemon=True)
+    feeder.start()
+    try:
+        with connection.cursor() as cursor:
+            loaded = cursor.execute(sql, (fifo_path,))
+        feeder.join()
+        if failed:
+            connection.rollback()
+            raise failed[0]
+        connection.commit()
+    finally:
+        # If the server never opened the pipe, open its read end so the feeder unblocks and exits
+        while feeder.is_alive():
+            os.close(os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK))
+            feeder.join(0.1)
+        shutil.rmtree(directory, ignore_errors=True)
+    return loaded
+
+def load_generated_data(connection, scale, seed, load_rows, columns=seed_data.COLUMNS,
+                        snapshots=None, schema_version=None, bulk=False):
+    """Stream a generated dataset of the given scale into freshly created tables.
+
+    `load_rows(connection, table, columns, rows)` performs the actual load, e.g.
+    `insert_rows` or `bulk_load_rows`. With a snapshot cache, a snapshot of
+    the same (schema_version, seed, scale) is restored instead of generating
+    rows (through LOAD DATA when `bulk` is set), and a generated load writes
+    a new snapshot as it goes. Returns {table: RowDigest} of the rows loaded,
+    for verify_data.verify_tables().
+    """
+    snapshot = writer = None
+    if snapshots is not None:
+        key = snapshots.key(schema_version, seed, scale)
+        snapshot = snapshots.get(key)
+        if snapshot:
+            print(f"Restoring from snapshot {key}...")
+        else:
+            writer = snapshots.writer(key)
+
+    digests = {}
+    with writer or contextlib.nullcontext():
+        for table in seed_data.TABLE_ORDER:
+            print(f"Inserting rows into {table}...")
+            started = time.time()
+            if snapshot:
+                digests[table] = snapshot.digest(table)
+                if bulk:
+                    inserted = bulk_load_stream(connection, table, columns[table], snapshot.open_table(table))
+                else:
+                    inserted = load_rows(connection, table, columns[table], snapshot.table_rows(table))
+                if inserted != snapshot.row_count(table):
+                    raise RuntimeError(f"Snapshot restore of {table} loaded {inserted} rows, "
+                                       f"expected {snapshot.row_count(table)}")
+            else:
+                digests[table] = seed_data.RowDigest()
+                rows = digests[table].track(seed_data.generate_rows(table, scale, seed))
+                if writer:
+                    rows = writer.tee(table, rows, digests[table])
+                inserted = load_rows(connection, table, columns[table], rows)
+            elapsed = time.time() - started
+            print(f"  {inserted} rows in {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):.0f} rows/sec)")
+    return digests
+
+def insert_generated_data(connection, scale, seed, load_rows, snapshots=None, bulk=False, defer_constraints=False):
+    """Create the tables and stream a generated dataset of the given scale into them.
+
+    With `defer_constraints`, UNIQUE keys and foreign keys are added after
+    the load (the connection should have been opened with BULK_SESSION_SQL).
+    Returns {table: RowDigest} of the rows loaded.
+    """
+    with connection.cursor() as cursor:
+        create_tables(cursor, deferred=defer_constraints)
+    connection.commit()
 
-        # Insert sample data into orders
-        cursor.execute("""
-        INSERT INTO orders (customer_id, total_amount, status) VALUES
-        (1, 1299.99, 'delivered'),
-        (2, 899.99, 'shipped'),
-        (3, 249.99, 'processing'),
-        (4, 699.98, 'pending'),
-        (5, 199.99, 'delivered'),
-        (1, 499.99, 'shipped')
-        """)
+    digests = load_generated_data(connection, scale, seed, load_rows, snapshots=snapshots,
+                                  schema_version=fingerprint(TABLE_DDL), bulk=bulk)
+    if defer_constraints:
+        add_deferred_constraints(connection, TABLE_SCHEMAS, seed_data.TABLE_ORDER)
+    return digests
+
+def insert_generated_data_parallel(connect, scale, seed, load_rows, workers, defer_constraints=False):
+    """Load a generated dataset by key range over `workers` connections.
+
+    Ranges of independent tables are interleaved so they load concurrently; a
+    table is only scheduled once every range of the tables it references has
+    been committed. Returns {table: RowDigest} of the rows loaded, merged
+    across ranges.
+    """
+    connection = connect()
+    try:
+        with connection.cursor() as cursor:
+            create_tables(cursor, deferred=defer_constraints)
+        connection.commit()
+    finally:
+        connection.close()
 
-    # Commit the changes
-    connection.commit()
+    local = threading.local()
+    lock = threading.Lock()
+    connections = []
+    stats = {}
+    digests = {table: seed_data.RowDigest() for table in seed_data.TABLE_ORDER}
+
+    def load_range(table, start, stop):
+        worker_connection = getattr(local, 'connection', None)
+        if worker_connection is None:
+            worker_connection = local.connection = connect()
+            with lock:
+                connections.append(worker_connection)
+
+        started = time.time()
+        digest = seed_data.RowDigest()
+        rows = digest.track(seed_data.generate_rows(table, scale, seed, start, stop))
+        inserted = load_rows(worker_connection, table, seed_data.COLUMNS[table], rows)
+        elapsed = time.time() - started
+
+        with lock:
+            digests[table].merge(digest)
+            worker_stats = stats.setdefault(threading.current_thread().name, [0, 0.0])
+            worker_stats[0] += inserted
+            worker_stats[1] += elapsed
+        return inserted
+
+    # Several ranges per worker keeps every connection busy until the end of a table
+    pending = {table: seed_data.key_ranges(table, scale, workers * 4) for table in seed_data.TABLE_ORDER}
+    unfinished = {table: len(ranges) for table, ranges in pending.items()}
+    running = {}
+    started = time.time()
+
+    def schedule_ready_tables(pool):
+        ready = [table for table in seed_data.TABLE_ORDER
+                 if pending.get(table)
+                 and all(unfinished[parent] == 0 for parent in seed_data.TABLE_DEPENDENCIES[table])]
+        for table in ready:
+            print(f"Loading {table} in {len(pending[table])} ranges...")
+        # Round-robin across ready tables so they share the workers
+        queues = [pending.pop(table) for table in ready]
+        for position in range(max((len(queue) for queue in queues), default=0)):
+            for table, queue in zip(ready, queues):
+                if position < len(queue):
+                    start, stop = queue[position]
+                    running[pool.submit(load_range, table, start, stop)] = table
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='loader')
+    try:
+        schedule_ready_tables(pool)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = running.pop(future)
+                future.result()
+                unfinished[table] -= 1
+                if unfinished[table] == 0:
+                    print(f"  {table} committed ({time.time() - started:.1f}s)")
+            schedule_ready_tables(pool)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        for worker_connection in connections:
+            worker_connection.close()
+
+    elapsed = time.time() - started
+    print("\nPer-worker summary:")
+    total_rows = 0
+    for name in sorted(stats):
+        rows, busy = stats[name]
+        total_rows += rows
+        print(f"  {name}: {rows} rows in {busy:.1f}s ({rows / max(busy, 1e-9):.0f} rows/sec)")
+    print(f"  total: {total_rows} rows in {elapsed:.1f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/sec)")
+
+    if defer_constraints:
+        connection = connect()
+        try:
+            add_deferred_constraints(connection, TABLE_SCHEMAS, seed_data.TABLE_ORDER)
+        finally:
+            connection.close()
+    return digests
 
 def display_sample_data(connection):
     """Display sample data from the tables."""
@@ -178,6 +906,8 @@ def create_database_if_not_exists(host, user, password, db_name):
 def main():
     """Main function to execute the script."""
     check_requirements()
+    args = parse_args()
+    statement_trace.start(args)
 
     print("Script to insert test data into RDS MySQL database")
 
@@ -198,17 +928,45 @@ def main():
 
         # Connect to the database
         print("Connecting to database and executing SQL commands...")
-        connection = pymysql.connect(
-            host=rds_endpoint,
-            user=db_user,
-            password=db_password,
-            database=db_name,
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor
-        )
+        connect_options = {'local_infile': True} if args.bulk_load else {}
+        if args.defer_constraints:
+            connect_options['init_command'] = BULK_SESSION_SQL
+
+        def connect(**kwargs):
+            return open_connection(rds_endpoint, db_user, db_password, db_name, **connect_options, **kwargs)
+
+        connection = connect(cursorclass=pymysql.cursors.DictCursor)
+
+        load_rows = partial(insert_rows, batch_size=args.batch_size)
+        if args.bulk_load:
+            if local_infile_enabled(connection):
+                load_rows = bulk_load_rows
+            else:
+                print("Warning: local_infile is disabled on the server; using multi-row INSERTs instead.")
 
         # Execute SQL commands
-        execute_sql_commands(connection)
+        digests = None
+        if args.async_inflight:
+            async_loader.check_requirements()
+            asyncio.run(async_loader.load_mysql(rds_endpoint, db_user, db_password, db_name, args.scale,
+                                                args.seed, batch_size=args.batch_size,
+                                                inflight=args.async_inflight))
+        elif args.incremental:
+            reset_tables_incremental(connection, args.scale, args.seed, load_rows)
+        elif args.workers > 1:
+            digests = insert_generated_data_parallel(connect, args.scale, args.seed, load_rows, args.workers,
+                                                     defer_constraints=args.defer_constraints)
+        elif args.scale:
+            digests = insert_generated_data(connection, args.scale, args.seed, load_rows,
+                                            snapshots=open_snapshot_cache(args), bulk=load_rows is bulk_load_rows,
+                                            defer_constraints=args.defer_constraints)
+        else:
+            execute_sql_commands(connection)
+
+        if args.verify and not verify_data.verify_tables(connection, digests, scale=args.scale, seed=args.seed):
+            connection.close()
+            print("Error: Loaded data does not match the generated dataset.")
+            sys.exit(1)
 
         # Display sample data
         display_sample_data(connection)
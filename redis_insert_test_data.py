@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+"""Mirror the generated test dataset into Redis.
+
+Keys written for a dataset of a given scale and seed:
+
+    customer:<id>               hash of first_name, last_name, email, created_at
+    customer:<id>:orders        list of the customer's order ids, oldest first
+    product:<id>                hash of name, description, price, stock_quantity
+    order:<id>                  hash of customer_id, order_date, total_amount, status, items
+    orders:status:<status>      set of order ids per status
+    leaderboard:revenue         sorted set of customer:<id> by revenue of non-cancelled orders
+    leaderboard:product_units   sorted set of product:<id> by units sold
+    active_users                set of user<id> with a pending or processing order
+    session:user<id>            JSON session string for every active user
+
+Commands are generated as argument tuples and either sent in deep pipelines
+over a single connection, or encoded as a raw RESP stream for
+`redis-cli --pipe`:
+
+    python3 redis_insert_test_data.py --scale 10
+    python3 redis_insert_test_data.py --scale 10 --resp - | redis-cli --pipe
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import seed_data
+
+DEFAULT_PIPELINE_DEPTH = 10000
+DEFAULT_MEMORY_SAMPLES = 50
+ACTIVE_STATUSES = ('pending', 'processing')
+
+def check_requirements():
+    """Check if required modules are installed."""
+    try:
+        import redis
+    except ImportError:
+        print("Error: redis module is required but not installed.")
+        print("Please install it using: pip install redis")
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Load the generated test dataset into Redis")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Scale factor of the generated dataset (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--host', default=os.environ.get('REDIS_HOST', 'localhost'),
+                        help="Redis host (default: $REDIS_HOST or localhost)")
+    parser.add_argument('--port', type=int, default=os.environ.get('REDIS_PORT', 6379),
+                        help="Redis port (default: $REDIS_PORT or 6379)")
+    parser.add_argument('--tls', action='store_true', help="Connect with TLS (ElastiCache in-transit encryption)")
+    parser.add_argument('--pipeline-depth', type=int, default=DEFAULT_PIPELINE_DEPTH,
+                        help=f"Commands per pipelined round trip (default: {DEFAULT_PIPELINE_DEPTH})")
+    parser.add_argument('--resp', metavar='FILE',
+                        help="Write the commands as a RESP stream to FILE ('-' for stdout) for "
+                             "`redis-cli --pipe` instead of connecting")
+    parser.add_argument('--flush', action='store_true',
+                        help="FLUSHDB before loading (otherwise keys of an earlier, larger load remain)")
+    parser.add_argument('--memory-samples', type=int, default=DEFAULT_MEMORY_SAMPLES,
+                        help=f"Keys sampled per key pattern for the MEMORY USAGE report "
+                             f"(default: {DEFAULT_MEMORY_SAMPLES}, 0 to skip)")
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be a positive integer")
+    if args.pipeline_depth < 1:
+        parser.error("--pipeline-depth must be a positive integer")
+    return args
+
+def reset_commands(flush=False):
+    """Return the commands that clear the aggregate keys before a load."""
+    commands = [('FLUSHDB',)] if flush else []
+    commands.append(('DEL', 'leaderboard:revenue', 'leaderboard:product_units', 'active_users',
+                     *(f"orders:status:{status}" for status in seed_data.ORDER_STATUSES)))
+    return commands
+
+def customer_commands(row):
+    """Yield the commands that load one customers row."""
+    customer_id, first_name, last_name, email, created_at = row
+    yield ('HSET', f"customer:{customer_id}", 'first_name', first_name, 'last_name', last_name,
+           'email', email, 'created_at', created_at)
+    yield ('DEL', f"customer:{customer_id}:orders")
+
+def product_commands(row):
+    """Yield the command that loads one products row."""
+    product_id, name, description, price, stock_quantity = row
+    yield ('HSET', f"product:{product_id}", 'name', name, 'description', description,
+           'price', price, 'stock_quantity', stock_quantity)
+
+def order_commands(row, items):
+    """Yield the commands that load one orders row and its order_items rows."""
+    order_id, customer_id, order_date, total_amount, status = row
+    yield ('HSET', f"order:{order_id}", 'customer_id', customer_id, 'order_date', order_date,
+           'total_amount', total_amount, 'status', status,
+           'items', json.dumps([[product_id, quantity, unit_price]
+                                for _, _, product_id, quantity, unit_price in items]))
+    yield ('RPUSH', f"customer:{customer_id}:orders", order_id)
+    yield ('SADD', f"orders:status:{status}", order_id)
+    if status == 'cancelled':
+        return
+    yield ('ZINCRBY', 'leaderboard:revenue', total_amount, f"customer:{customer_id}")
+    for _, _, product_id, quantity, _ in items:
+        yield ('ZINCRBY', 'leaderboard:product_units', quantity, f"product:{product_id}")
+    if status in ACTIVE_STATUSES:
+        yield ('SADD', 'active_users', f"user{customer_id}")
+        yield ('SET', f"session:user{customer_id}",
+               json.dumps({'customer_id': customer_id, 'last_order_id': order_id, 'status': status}))
+
+def generate_commands(scale, seed, flush=False):
+    """Yield the Redis commands (as argument tuples) that load a generated dataset.
+
+    Re-running the same commands leaves the same data: aggregate keys and
+    per-customer order lists are deleted before they are built up. Orders
+    must be applied in order for the order lists and sessions to match.
+    """
+    yield from reset_commands(flush)
+    for row in seed_data.generate_rows('customers', scale, seed):
+        yield from customer_commands(row)
+    for row in seed_data.generate_rows('products', scale, seed):
+        yield from product_commands(row)
+    products = seed_data.table_row_count('products', scale)
+    for row in seed_data.generate_rows('orders', scale, seed):
+        yield from order_commands(row, seed_data.order_item_rows(seed, row[0], products))
+
+def _resp_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+def encode_resp(command):
+    """Encode one command as a RESP array of bulk strings."""
+    parts = [b'*%d\r\n' % len(command)]
+    for argument in command:
+        argument = _resp_bytes(argument)
+        parts.append(b'$%d\r\n%s\r\n' % (len(argument), argument))
+    return b''.join(parts)
+
+def write_resp(commands, stream, chunk_commands=DEFAULT_PIPELINE_DEPTH):
+    """Write commands to a binary stream in RESP; return the number written."""
+    count = 0
+    for chunk in seed_data.chunked(commands, chunk_commands):
+        stream.write(b''.join(map(encode_resp, chunk)))
+        count += len(chunk)
+    return count
+
+def get_redis_client(host, port, tls=False):
+    """Create and return a Redis client, checking that the server responds."""
+    import redis
+    try:
+        client = redis.Redis(host=host, port=port, ssl=tls, socket_timeout=300)
+        client.ping()
+        return client
+    except redis.RedisError as e:
+        print(f"Error: Could not connect to Redis at {host}:{port}: {e}")
+        sys.exit(1)
+
+def load_pipelined(client, commands, depth=DEFAULT_PIPELINE_DEPTH):
+    """Send commands over one connection, `depth` per round trip; return the number sent."""
+    pipe = client.pipeline(transaction=False)
+    count = 0
+    for chunk in seed_data.chunked(commands, depth):
+        for command in chunk:
+            pipe.execute_command(*command)
+        pipe.execute()
+        count += len(chunk)
+    return count
+
+def key_patterns(scale):
+    """Return (pattern, key count, key of an id) for each per-row key family."""
+    customers = seed_data.table_row_count('customers', scale)
+    products = seed_data.table_row_count('products', scale)
+    orders = seed_data.table_row_count('orders', scale)
+    return [
+        ('customer:<id>', customers, lambda key: f"customer:{key}"),
+        ('customer:<id>:orders', customers, lambda key: f"customer:{key}:orders"),
+        ('product:<id>', products, lambda key: f"product:{key}"),
+        ('order:<id>', orders, lambda key: f"order:{key}"),
+    ]
+
+def memory_report(client, scale, samples=DEFAULT_MEMORY_SAMPLES):
+    """Estimate the memory footprint of each key family by sampling MEMORY USAGE."""
+    sampler = random.Random(0)
+    print("\nMemory footprint (MEMORY USAGE sampling):")
+    estimated = 0
+    for pattern, count, key_of in key_patterns(scale):
+        keys = [key_of(sampler.randint(1, count)) for _ in range(min(samples, count))]
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key)
+        sizes = [size for size in pipe.execute() if size is not None]
+        average = sum(sizes) / max(len(sizes), 1)
+        estimated += average * count
+        print(f"  {pattern}: {count} keys x ~{average:.0f} bytes = ~{average * count / 1024 ** 2:.1f} MiB")
+    aggregates = ['leaderboard:revenue', 'leaderboard:product_units', 'active_users',
+                  *(f"orders:status:{status}" for status in seed_data.ORDER_STATUSES)]
+    pipe = client.pipeline(transaction=False)
+    for key in aggregates:
+        pipe.memory_usage(key)
+    for key, size in zip(aggregates, pipe.execute()):
+        estimated += size or 0
+        print(f"  {key}: {size or 0} bytes")
+    print(f"  estimated total: ~{estimated / 1024 ** 2:.1f} MiB "
+          f"(server used_memory: {client.info('memory')['used_memory'] / 1024 ** 2:.1f} MiB)")
+
+def display_sample_data(client):
+    """Show a few of the loaded keys, as the Redis MCP server would read them."""
+    print(f"\ncustomer:1 = {client.hgetall('customer:1')}")
+    print(f"customer:1:orders = {client.lrange('customer:1:orders', 0, -1)}")
+    print(f"Top customers by revenue: {client.zrevrange('leaderboard:revenue', 0, 4, withscores=True)}")
+    print(f"active_users: {client.scard('active_users')} members")
+
+def main():
+    """Main function to execute the script."""
+    args = parse_args()
+    commands = generate_commands(args.scale, args.seed, args.flush)
+
+    if args.resp:
+        started = time.time()
+        if args.resp == '-':
+            count = write_resp(commands, sys.stdout.buffer)
+        else:
+            with open(args.resp, 'wb') as resp_file:
+                count = write_resp(commands, resp_file)
+        print(f"Wrote {count} commands in {time.time() - started:.1f}s", file=sys.stderr)
+        return
+
+    check_requirements()
+    import redis
+
+    print("Script to insert test data into Redis")
+    client = get_redis_client(args.host, args.port, args.tls)
+    try:
+        print(f"Loading generated data (scale {args.scale}, seed {args.seed}) into {args.host}:{args.port}...")
+        started = time.time()
+        count = load_pipelined(client, commands, args.pipeline_depth)
+        elapsed = time.time() - started
+        print(f"  {count} commands in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} commands/sec)")
+        if args.memory_samples:
+            memory_report(client, args.scale, args.memory_samples)
+        display_sample_data(client)
+        print("\nSuccess! Test data has been inserted into Redis.")
+    except redis.RedisError as e:
+        print(f"Error: Redis error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+"""Stage the generated test dataset for a parallel Redshift COPY.
+
+Every table is written as gzip-compressed CSV (the seed_data.write_csv
+dialect) split into one part per cluster slice, so COPY loads all parts at
+once. Parts are generated by key range in separate processes. Alongside the
+data the output directory holds a COPY manifest per table and copy.sql with
+the CREATE TABLE and COPY statements:
+
+    python3 redshift_stage_test_data.py --scale 100 --slices 8 --output stage \\
+        --s3-prefix s3://my-bucket/mcp-test-data
+    aws s3 cp stage s3://my-bucket/mcp-test-data --recursive
+    psql -h <cluster endpoint> -p 5439 -U <user> -d <database> -f stage/copy.sql
+
+--verify-postgres loads the staged parts into PostgreSQL with COPY, as a
+local check of the files and the DDL.
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import seed_data
+
+DEFAULT_SLICES = 4
+DEFAULT_S3_PREFIX = 's3://YOUR_BUCKET/mcp-test-data'
+DEFAULT_IAM_ROLE = 'arn:aws:iam::YOUR_ACCOUNT_ID:role/YOUR_REDSHIFT_COPY_ROLE'
+COMPRESS_LEVEL = 6
+STAGE_MANIFEST = 'stage.json'
+
+# Column definitions shared by Redshift and the PostgreSQL check
+COLUMN_TYPES = {
+    'customers': ('INTEGER NOT NULL', 'VARCHAR(50) NOT NULL', 'VARCHAR(50) NOT NULL',
+                  'VARCHAR(100) NOT NULL', 'TIMESTAMP'),
+    'products': ('INTEGER NOT NULL', 'VARCHAR(100) NOT NULL', 'VARCHAR(256)', 'DECIMAL(10, 2) NOT NULL',
+                 'INTEGER NOT NULL'),
+    'orders': ('INTEGER NOT NULL', 'INTEGER NOT NULL', 'TIMESTAMP', 'DECIMAL(10, 2) NOT NULL',
+               'VARCHAR(20) NOT NULL'),
+    'order_items': ('INTEGER NOT NULL', 'INTEGER NOT NULL', 'INTEGER NOT NULL', 'INTEGER NOT NULL',
+                    'DECIMAL(10, 2) NOT NULL'),
+}
+
+# Distribution and sort keys: orders and order_items are co-located on
+# order_id so their join needs no redistribution; products is small
+# enough to copy to every node.
+TABLE_ATTRIBUTES = {
+    'customers': 'DISTKEY(customer_id) SORTKEY(customer_id)',
+    'products': 'DISTSTYLE ALL SORTKEY(product_id)',
+    'orders': 'DISTKEY(order_id) SORTKEY(order_date)',
+    'order_items': 'DISTKEY(order_id) SORTKEY(order_id)',
+}
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Write the generated dataset as sharded, COPY-ready files")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Scale factor of the generated dataset (default: 1)")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED,
+                        help=f"Seed for generated data (default: {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--slices', type=int, default=DEFAULT_SLICES,
+                        help="Parts per table; use the cluster's slice count "
+                             f"(SELECT COUNT(*) FROM stv_slices) (default: {DEFAULT_SLICES})")
+    parser.add_argument('--output', default='redshift_stage',
+                        help="Output directory (default: redshift_stage)")
+    parser.add_argument('--s3-prefix', default=DEFAULT_S3_PREFIX,
+                        help="S3 location the output directory will be uploaded to, used in the manifests")
+    parser.add_argument('--iam-role', default=DEFAULT_IAM_ROLE,
+                        help="IAM role ARN for COPY to read from S3")
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help="Region of the S3 bucket (default: $AWS_REGION or us-east-1)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help="Processes generating parts in parallel (default: CPU count)")
+    parser.add_argument('--verify-postgres', metavar='DSN',
+                        help="Load the staged files into PostgreSQL at DSN with COPY and check row counts, "
+                             "instead of writing new files")
+    args = parser.parse_args()
+    if args.scale < 1 or args.slices < 1 or args.processes < 1:
+        parser.error("--scale, --slices and --processes must be positive integers")
+    return args
+
+def create_table_sql(table, redshift=True):
+    """Return the CREATE TABLE statement of a table, with Redshift distribution and sort keys."""
+    columns = ",\n    ".join(f"{column} {column_type}"
+                             for column, column_type in zip(seed_data.COLUMNS[table], COLUMN_TYPES[table]))
+    key = seed_data.COLUMNS[table][0]
+    sql = f"CREATE TABLE {table} (\n    {columns},\n    PRIMARY KEY ({key})\n)"
+    if redshift:
+        sql += f"\n{TABLE_ATTRIBUTES[table]}"
+    return sql
+
+def part_filename(table, part):
+    return f"{table}.{part:04d}.csv.gz"
+
+def write_part(output, table, part, scale, seed, start, stop):
+    """Generate one key range of a table into a gzip CSV part; return its stage entry."""
+    filename = part_filename(table, part)
+    path = os.path.join(output, table, filename)
+    rows = 0
+    with gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=COMPRESS_LEVEL) as part_file:
+        for chunk in seed_data.chunked(seed_data.generate_rows(table, scale, seed, start, stop),
+                                       seed_data.DEFAULT_BATCH_SIZE):
+            seed_data.write_csv(chunk, part_file)
+            rows += len(chunk)
+    return {'table': table, 'file': f"{table}/{filename}", 'rows': rows, 'bytes': os.path.getsize(path)}
+
+def copy_manifest(entries, s3_prefix):
+    """Return a Redshift COPY manifest listing every part of a table."""
+    return {'entries': [{'url': f"{s3_prefix.rstrip('/')}/{entry['file']}", 'mandatory': True,
+                         'meta': {'content_length': entry['bytes']}} for entry in entries]}
+
+def copy_sql(s3_prefix, iam_role, region):
+    """Return the SQL script that recreates the tables and loads each with one COPY."""
+    statements = [f"DROP TABLE IF EXISTS {table};" for table in reversed(seed_data.TABLE_ORDER)]
+    for table in seed_data.TABLE_ORDER:
+        statements.append(create_table_sql(table) + ";")
+    for table in seed_data.TABLE_ORDER:
+        statements.append(
+            f"COPY {table} ({', '.join(seed_data.COLUMNS[table])})\n"
+            f"FROM '{s3_prefix.rstrip('/')}/{table}.manifest'\n"
+            f"IAM_ROLE '{iam_role}'\n"
+            f"REGION '{region}'\n"
+            f"MANIFEST GZIP CSV NULL AS 'NULL' TIMEFORMAT 'YYYY-MM-DD HH:MI:SS' COMPUPDATE ON STATUPDATE ON;")
+    return "\n\n".join(statements) + "\n"
+
+def stage_dataset(output, scale, seed, slices, s3_prefix, iam_role, region, processes):
+    """Write every table in `slices` parts over `processes` processes, then the manifests and copy.sql."""
+    for table in seed_data.TABLE_ORDER:
+        os.makedirs(os.path.join(output, table), exist_ok=True)
+
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(write_part, output, table, part, scale, seed, start, stop)
+                   for table in seed_data.TABLE_ORDER
+                   for part, (start, stop) in enumerate(seed_data.key_ranges(table, scale, slices))]
+        entries = [future.result() for future in futures]
+    elapsed = time.time() - started
+
+    for table in seed_data.TABLE_ORDER:
+        table_entries = [entry for entry in entries if entry['table'] == table]
+        with open(os.path.join(output, f"{table}.manifest"), 'w') as manifest_file:
+            json.dump(copy_manifest(table_entries, s3_prefix), manifest_file, indent=2)
+        print(f"  {table}: {sum(entry['rows'] for entry in table_entries)} rows in {len(table_entries)} parts, "
+              f"{sum(entry['bytes'] for entry in table_entries)} bytes")
+    with open(os.path.join(output, STAGE_MANIFEST), 'w') as stage_file:
+        json.dump({'scale': scale, 'seed': seed, 'slices': slices, 'files': entries}, stage_file, indent=2)
+    with open(os.path.join(output, 'copy.sql'), 'w') as sql_file:
+        sql_file.write(copy_sql(s3_prefix, iam_role, region))
+
+    total = sum(entry['rows'] for entry in entries)
+    print(f"  total: {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/sec)")
+    return entries
+
+def verify_postgres(output, dsn):
+    """Load the staged parts into PostgreSQL with COPY and compare the row counts; return True if equal."""
+    try:
+        import psycopg2
+    except ImportError:
+        print("Error: psycopg2 module is required for --verify-postgres but not installed.")
+        print("Please install it using: pip install psycopg2-binary")
+        sys.exit(1)
+
+    with open(os.path.join(output, STAGE_MANIFEST)) as stage_file:
+        stage = json.load(stage_file)
+
+    connection = psycopg2.connect(dsn)
+    ok = True
+    try:
+        with connection.cursor() as cursor:
+            for table in reversed(seed_data.TABLE_ORDER):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            for table in seed_data.TABLE_ORDER:
+                cursor.execute(create_table_sql(table, redshift=False))
+            for table in seed_data.TABLE_ORDER:
+                started = time.time()
+                entries = [entry for entry in stage['files'] if entry['table'] == table]
+                for entry in entries:
+                    with gzip.open(os.path.join(output, entry['file']), 'rb') as part_file:
+                        cursor.copy_expert(f"COPY {table} ({', '.join(seed_data.COLUMNS[table])}) FROM STDIN "
+                                           f"WITH (FORMAT csv, NULL 'NULL')", part_file)
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                loaded = cursor.fetchone()[0]
+                expected = sum(entry['rows'] for entry in entries)
+                status = "OK" if loaded == expected else "MISMATCH"
+                ok = ok and loaded == expected
+                print(f"  {table}: {status} ({loaded} rows loaded, {expected} staged, "
+                      f"{time.time() - started:.1f}s)")
+        connection.commit()
+    finally:
+        connection.close()
+    return ok
+
+def main():
+    """Stage the dataset, or verify a staged dataset against PostgreSQL."""
+    args = parse_args()
+
+    if args.verify_postgres:
+        print(f"Loading {args.output} into PostgreSQL with COPY...")
+        return 0 if verify_postgres(args.output, args.verify_postgres) else 1
+
+    print(f"Staging generated data (scale {args.scale}, seed {args.seed}) in {args.slices} parts per table "
+          f"to {args.output} with {args.processes} processes...")
+    stage_dataset(args.output, args.scale, args.seed, args.slices, args.s3_prefix, args.iam_role,
+                  args.region, args.processes)
+    print(f"\nUpload with: aws s3 cp {args.output} {args.s3_prefix} --recursive")
+    print(f"Then run {os.path.join(args.output, 'copy.sql')} on the cluster (query editor or psql)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
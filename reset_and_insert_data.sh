@@ -2,12 +2,47 @@
 
 # Script to drop existing tables, create new ones, and insert sample data into MySQL database "mcp"
 
-# Source the database credentials
-source /home/ec2-user/mcp/demo_mcp_on_amazon_bedrock/set_db_credentials.sh
+# Usage: ./reset_and_insert_data.sh [SCALE]
+# With a SCALE factor (or the SCALE environment variable), customers, products,
+# orders and order_items are filled from seed_data.py instead of the fixed
+# sample rows, streamed straight into LOAD DATA LOCAL INFILE. Set VERIFY=1 to
+# check the loaded tables against the generator with verify_data.py.
+# reset_test_data.py does the same reset over a single connection.
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+SCALE="${1:-$SCALE}"
+SEED="${SEED:-42}"
+
+# Source the database credentials (override the location with DB_CREDENTIALS_FILE)
+source "${DB_CREDENTIALS_FILE:-/home/ec2-user/mcp/demo_mcp_on_amazon_bedrock/set_db_credentials.sh}"
 
 # Function to execute MySQL commands
 execute_mysql() {
-    mysql -h "$MYSQL_HOST" -u "$MYSQL_USER" -p"$MYSQL_PASS" "$MYSQL_DB" -e "$1"
+    mysql --local-infile=1 -h "$MYSQL_HOST" -P "${MYSQL_PORT:-3306}" -u "$MYSQL_USER" -p"$MYSQL_PASS" "$MYSQL_DB" -e "$1"
+}
+
+# Function to load a generated table: load_generated_table <table> <column list>
+# Rows are streamed from the generator through a pipe, so generation and loading
+# overlap and nothing is buffered on disk. Falls back to multi-row INSERTs when
+# the server has local_infile disabled. Exits if either the generator or mysql
+# fails, so a partial load never reaches the row counts.
+load_generated_table() {
+    local -a status
+    if [ "$LOCAL_INFILE" = "1" ] || [ "$LOCAL_INFILE" = "ON" ]; then
+        python3 "$SCRIPT_DIR/seed_data.py" --format csv --table "$1" --scale "$SCALE" --seed "$SEED" | \
+            execute_mysql "LOAD DATA LOCAL INFILE '/dev/stdin' INTO TABLE $1 CHARACTER SET utf8mb4
+                           FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY ''
+                           LINES TERMINATED BY '\\n' ($2)"
+        status=("${PIPESTATUS[@]}")
+    else
+        python3 "$SCRIPT_DIR/seed_data.py" --format sql --table "$1" --scale "$SCALE" --seed "$SEED" --columns "$2" | \
+            mysql -h "$MYSQL_HOST" -P "${MYSQL_PORT:-3306}" -u "$MYSQL_USER" -p"$MYSQL_PASS" "$MYSQL_DB"
+        status=("${PIPESTATUS[@]}")
+    fi
+    if [ "${status[0]}" -ne 0 ] || [ "${status[1]}" -ne 0 ]; then
+        echo "Error: Loading $1 failed (generator exit status ${status[0]}, mysql exit status ${status[1]})."
+        exit 1
+    fi
 }
 
 echo "Dropping existing tables..."
@@ -120,9 +155,31 @@ INSERT INTO persons (first_name, last_name, email, age, gender, city, country) V
 ('Jacob', 'Jackson', 'jacob.jackson@example.com', 37, 'Male', 'Dubai', 'UAE'),
 ('Evelyn', 'Martin', 'evelyn.martin@example.com', 30, 'Female', 'Singapore', 'Singapore');"
 
-# Insert sample data into customers table
-echo "Inserting sample data into customers table..."
-execute_mysql "
+if [ -n "$SCALE" ]; then
+    LOCAL_INFILE=$(mysql -N -h "$MYSQL_HOST" -P "${MYSQL_PORT:-3306}" -u "$MYSQL_USER" -p"$MYSQL_PASS" "$MYSQL_DB" -e "SELECT @@GLOBAL.local_infile")
+    if [ "$LOCAL_INFILE" != "1" ] && [ "$LOCAL_INFILE" != "ON" ]; then
+        echo "local_infile is disabled on the server; falling back to multi-row INSERTs."
+    fi
+
+    echo "Loading generated data (scale $SCALE, seed $SEED) into customers table..."
+    load_generated_table customers "id, first_name, last_name, email, created_at"
+
+    echo "Loading generated data into products table..."
+    load_generated_table products "id, name, description, price, stock_quantity"
+
+    echo "Loading generated data into orders table..."
+    load_generated_table orders "id, customer_id, order_date, total_amount, status"
+
+    echo "Loading generated data into order_items table..."
+    load_generated_table order_items "id, order_id, product_id, quantity, unit_price"
+
+    if [ -n "$VERIFY" ]; then
+        python3 "$SCRIPT_DIR/verify_data.py" --scale "$SCALE" --seed "$SEED" --schema reset || exit 1
+    fi
+else
+    # Insert sample data into customers table
+    echo "Inserting sample data into customers table..."
+    execute_mysql "
 INSERT INTO customers (first_name, last_name, email, phone, address, city, state, postal_code, country) VALUES
 ('Robert', 'Johnson', 'robert.johnson@example.com', '555-123-4567', '123 Main St', 'New York', 'NY', '10001', 'USA'),
 ('Jennifer', 'Smith', 'jennifer.smith@example.com', '555-234-5678', '456 Oak Ave', 'Los Angeles', 'CA', '90001', 'USA'),
@@ -135,9 +192,9 @@ INSERT INTO customers (first_name, last_name, email, phone, address, city, state
 ('Matthew', 'Rodriguez', 'matthew.rodriguez@example.com', '555-901-2345', '606 Cherry Rd', 'Dallas', 'TX', '75201', 'USA'),
 ('Amanda', 'Martinez', 'amanda.martinez@example.com', '555-012-3456', '707 Spruce Dr', 'San Jose', 'CA', '95101', 'USA');"
 
-# Insert sample data into products table
-echo "Inserting sample data into products table..."
-execute_mysql "
+    # Insert sample data into products table
+    echo "Inserting sample data into products table..."
+    execute_mysql "
 INSERT INTO products (name, description, category, price, stock_quantity) VALUES
 ('Smartphone X', 'Latest smartphone with advanced features', 'Electronics', 999.99, 50),
 ('Laptop Pro', 'High-performance laptop for professionals', 'Electronics', 1499.99, 30),
@@ -155,9 +212,9 @@ INSERT INTO products (name, description, category, price, stock_quantity) VALUES
 ('Air Purifier', 'HEPA air purifier for allergen removal', 'Home Appliances', 199.99, 15),
 ('Desk Lamp', 'LED desk lamp with adjustable brightness', 'Home Decor', 49.99, 70);"
 
-# Insert sample data into orders table
-echo "Inserting sample data into orders table..."
-execute_mysql "
+    # Insert sample data into orders table
+    echo "Inserting sample data into orders table..."
+    execute_mysql "
 INSERT INTO orders (customer_id, order_date, status, total_amount, shipping_address, shipping_city, shipping_state, shipping_postal_code, shipping_country) VALUES
 (1, '2025-01-15 10:30:00', 'Delivered', 1199.98, '123 Main St', 'New York', 'NY', '10001', 'USA'),
 (2, '2025-01-20 14:45:00', 'Shipped', 279.98, '456 Oak Ave', 'Los Angeles', 'CA', '90001', 'USA'),
@@ -170,9 +227,9 @@ INSERT INTO orders (customer_id, order_date, status, total_amount, shipping_addr
 (9, '2025-02-25 12:30:00', 'Pending', 189.98, '606 Cherry Rd', 'Dallas', 'TX', '75201', 'USA'),
 (10, '2025-03-01 09:50:00', 'Processing', 1549.98, '707 Spruce Dr', 'San Jose', 'CA', '95101', 'USA');"
 
-# Insert sample data into order_items table
-echo "Inserting sample data into order_items table..."
-execute_mysql "
+    # Insert sample data into order_items table
+    echo "Inserting sample data into order_items table..."
+    execute_mysql "
 INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES
 (1, 1, 1, 999.99),
 (1, 11, 2, 24.99),
@@ -190,14 +247,17 @@ INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES
 (9, 6, 1, 79.99),
 (10, 2, 1, 1499.99),
 (10, 10, 1, 59.99);"
+fi
 
 echo "Sample data insertion complete!"
-echo "The following tables have been created or updated:"
-echo "- persons: 20 records"
-echo "- customers: 10 records"
-echo "- products: 15 records"
-echo "- orders: 10 records"
-echo "- order_items: 16 records"
+if [ -z "$SCALE" ]; then
+    echo "The following tables have been created or updated:"
+    echo "- persons: 20 records"
+    echo "- customers: 10 records"
+    echo "- products: 15 records"
+    echo "- orders: 10 records"
+    echo "- order_items: 16 records"
+fi
 
 # Show table counts
 echo -e "\nTable record counts:"
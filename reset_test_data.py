@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+
+"""Drop, recreate and repopulate the MySQL "mcp" test tables over one connection.
+
+Python replacement for reset_and_insert_data.sh: the same five tables and
+sample rows, but the schema and data are defined once below and loaded with
+the batched insert helpers from rds_insert_test_data.py. Credentials come from
+the environment (source set_db_credentials.sh first), so the password never
+appears on a command line.
+"""
+
+import os
+import re
+import sys
+import argparse
+from functools import partial
+
+import pymysql
+
+import seed_data
+import verify_data
+import statement_trace
+import rds_insert_test_data as rds
+
+# Column definitions and table constraints, in creation order (parents first)
+TABLE_SCHEMAS = {
+    'persons': {
+        'columns': (
+            ('id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('first_name', 'VARCHAR(50) NOT NULL'),
+            ('last_name', 'VARCHAR(50) NOT NULL'),
+            ('email', 'VARCHAR(100) UNIQUE NOT NULL'),
+            ('age', 'INT NOT NULL'),
+            ('gender', "ENUM('Male', 'Female', 'Other') NOT NULL"),
+            ('city', 'VARCHAR(50)'),
+            ('country', 'VARCHAR(50)'),
+            ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ),
+        'constraints': (),
+    },
+    'customers': {
+        'columns': (
+            ('id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('first_name', 'VARCHAR(50) NOT NULL'),
+            ('last_name', 'VARCHAR(50) NOT NULL'),
+            ('email', 'VARCHAR(100) UNIQUE NOT NULL'),
+            ('phone', 'VARCHAR(20)'),
+            ('address', 'VARCHAR(255)'),
+            ('city', 'VARCHAR(50)'),
+            ('state', 'VARCHAR(50)'),
+            ('postal_code', 'VARCHAR(20)'),
+            ('country', 'VARCHAR(50)'),
+            ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ),
+        'constraints': (),
+    },
+    'products': {
+        'columns': (
+            ('id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('name', 'VARCHAR(100) NOT NULL'),
+            ('description', 'TEXT'),
+            ('category', 'VARCHAR(50)'),
+            ('price', 'DECIMAL(10,2) NOT NULL'),
+            ('stock_quantity', 'INT NOT NULL DEFAULT 0'),
+            ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+        ),
+        'constraints': (),
+    },
+    'orders': {
+        'columns': (
+            ('id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('customer_id', 'INT NOT NULL'),
+            ('order_date', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+            ('status', "ENUM('Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled') DEFAULT 'Pending'"),
+            ('total_amount', 'DECIMAL(10,2) NOT NULL'),
+            ('shipping_address', 'VARCHAR(255)'),
+            ('shipping_city', 'VARCHAR(50)'),
+            ('shipping_state', 'VARCHAR(50)'),
+            ('shipping_postal_code', 'VARCHAR(20)'),
+            ('shipping_country', 'VARCHAR(50)'),
+        ),
+        'constraints': (
+            'FOREIGN KEY (customer_id) REFERENCES customers(id)',
+        ),
+    },
+    'order_items': {
+        'columns': (
+            ('id', 'INT AUTO_INCREMENT PRIMARY KEY'),
+            ('order_id', 'INT NOT NULL'),
+            ('product_id', 'INT NOT NULL'),
+            ('quantity', 'INT NOT NULL'),
+            ('unit_price', 'DECIMAL(10,2) NOT NULL'),
+        ),
+        'constraints': (
+            'FOREIGN KEY (order_id) REFERENCES orders(id)',
+            'FOREIGN KEY (product_id) REFERENCES products(id)',
+        ),
+    },
+}
+
+TABLE_ORDER = tuple(TABLE_SCHEMAS)
+
+# Tables each table references through its foreign keys
+TABLE_DEPENDENCIES = {
+    table: tuple(re.findall(r"REFERENCES (\w+)\(", " ".join(schema['constraints'])))
+    for table, schema in TABLE_SCHEMAS.items()
+}
+
+# Fixed sample rows: (column names, rows) per table
+SAMPLE_DATA = {
+    'persons': (
+        ('first_name', 'last_name', 'email', 'age', 'gender', 'city', 'country'),
+        [
+            ('John', 'Smith', 'john.smith@example.com', 32, 'Male', 'New York', 'USA'),
+            ('Emma', 'Johnson', 'emma.johnson@example.com', 28, 'Female', 'London', 'UK'),
+            ('Michael', 'Williams', 'michael.williams@example.com', 45, 'Male', 'Toronto', 'Canada'),
+            ('Sophia', 'Brown', 'sophia.brown@example.com', 22, 'Female', 'Sydney', 'Australia'),
+            ('William', 'Jones', 'william.jones@example.com', 38, 'Male', 'Chicago', 'USA'),
+            ('Olivia', 'Garcia', 'olivia.garcia@example.com', 29, 'Female', 'Madrid', 'Spain'),
+            ('James', 'Miller', 'james.miller@example.com', 41, 'Male', 'Berlin', 'Germany'),
+            ('Ava', 'Davis', 'ava.davis@example.com', 25, 'Female', 'Paris', 'France'),
+            ('Alexander', 'Rodriguez', 'alexander.rodriguez@example.com', 33, 'Male', 'Mexico City', 'Mexico'),
+            ('Isabella', 'Martinez', 'isabella.martinez@example.com', 27, 'Female', 'Rome', 'Italy'),
+            ('Ethan', 'Hernandez', 'ethan.hernandez@example.com', 36, 'Male', 'Tokyo', 'Japan'),
+            ('Mia', 'Lopez', 'mia.lopez@example.com', 24, 'Female', 'Seoul', 'South Korea'),
+            ('Daniel', 'Gonzalez', 'daniel.gonzalez@example.com', 39, 'Male', 'Beijing', 'China'),
+            ('Charlotte', 'Wilson', 'charlotte.wilson@example.com', 31, 'Female', 'Moscow', 'Russia'),
+            ('Matthew', 'Anderson', 'matthew.anderson@example.com', 43, 'Male', 'Cairo', 'Egypt'),
+            ('Amelia', 'Thomas', 'amelia.thomas@example.com', 26, 'Female', 'Cape Town', 'South Africa'),
+            ('Benjamin', 'Taylor', 'benjamin.taylor@example.com', 34, 'Male', 'Rio de Janeiro', 'Brazil'),
+            ('Harper', 'Moore', 'harper.moore@example.com', 23, 'Female', 'Bangkok', 'Thailand'),
+            ('Jacob', 'Jackson', 'jacob.jackson@example.com', 37, 'Male', 'Dubai', 'UAE'),
+            ('Evelyn', 'Martin', 'evelyn.martin@example.com', 30, 'Female', 'Singapore', 'Singapore'),
+        ],
+    ),
+    'customers': (
+        ('first_name', 'last_name', 'email', 'phone', 'address', 'city', 'state', 'postal_code', 'country'),
+        [
+            ('Robert', 'Johnson', 'robert.johnson@example.com', '555-123-4567', '123 Main St', 'New York', 'NY', '10001', 'USA'),
+            ('Jennifer', 'Smith', 'jennifer.smith@example.com', '555-234-5678', '456 Oak Ave', 'Los Angeles', 'CA', '90001', 'USA'),
+            ('David', 'Williams', 'david.williams@example.com', '555-345-6789', '789 Pine Rd', 'Chicago', 'IL', '60007', 'USA'),
+            ('Sarah', 'Brown', 'sarah.brown@example.com', '555-456-7890', '101 Maple Dr', 'Houston', 'TX', '77001', 'USA'),
+            ('Michael', 'Jones', 'michael.jones@example.com', '555-567-8901', '202 Cedar Ln', 'Phoenix', 'AZ', '85001', 'USA'),
+            ('Emily', 'Garcia', 'emily.garcia@example.com', '555-678-9012', '303 Birch Blvd', 'Philadelphia', 'PA', '19019', 'USA'),
+            ('Christopher', 'Miller', 'christopher.miller@example.com', '555-789-0123', '404 Elm St', 'San Antonio', 'TX', '78201', 'USA'),
+            ('Jessica', 'Davis', 'jessica.davis@example.com', '555-890-1234', '505 Walnut Ave', 'San Diego', 'CA', '92101', 'USA'),
+            ('Matthew', 'Rodriguez', 'matthew.rodriguez@example.com', '555-901-2345', '606 Cherry Rd', 'Dallas', 'TX', '75201', 'USA'),
+            ('Amanda', 'Martinez', 'amanda.martinez@example.com', '555-012-3456', '707 Spruce Dr', 'San Jose', 'CA', '95101', 'USA'),
+        ],
+    ),
+    'products': (
+        ('name', 'description', 'category', 'price', 'stock_quantity'),
+        [
+            ('Smartphone X', 'Latest smartphone with advanced features', 'Electronics', '999.99', 50),
+            ('Laptop Pro', 'High-performance laptop for professionals', 'Electronics', '1499.99', 30),
+            ('Wireless Headphones', 'Noise-cancelling wireless headphones', 'Electronics', '199.99', 100),
+            ('Smart Watch', 'Fitness and health tracking smartwatch', 'Electronics', '249.99', 75),
+            ('Coffee Maker', 'Programmable coffee maker with timer', 'Home Appliances', '89.99', 40),
+            ('Blender', 'High-speed blender for smoothies and more', 'Home Appliances', '79.99', 35),
+            ('Toaster Oven', 'Compact toaster oven with multiple functions', 'Home Appliances', '69.99', 25),
+            ('Running Shoes', 'Lightweight running shoes with cushioning', 'Clothing', '129.99', 60),
+            ('Winter Jacket', 'Waterproof and insulated winter jacket', 'Clothing', '179.99', 45),
+            ('Backpack', 'Durable backpack with laptop compartment', 'Accessories', '59.99', 80),
+            ('Water Bottle', 'Insulated stainless steel water bottle', 'Accessories', '24.99', 120),
+            ('Yoga Mat', 'Non-slip yoga mat with carrying strap', 'Fitness', '39.99', 55),
+            ('Dumbbells Set', 'Adjustable dumbbells set for home workouts', 'Fitness', '149.99', 20),
+            ('Air Purifier', 'HEPA air purifier for allergen removal', 'Home Appliances', '199.99', 15),
+            ('Desk Lamp', 'LED desk lamp with adjustable brightness', 'Home Decor', '49.99', 70),
+        ],
+    ),
+    'orders': (
+        ('customer_id', 'order_date', 'status', 'total_amount', 'shipping_address', 'shipping_city',
+         'shipping_state', 'shipping_postal_code', 'shipping_country'),
+        [
+            (1, '2025-01-15 10:30:00', 'Delivered', '1199.98', '123 Main St', 'New York', 'NY', '10001', 'USA'),
+            (2, '2025-01-20 14:45:00', 'Shipped', '279.98', '456 Oak Ave', 'Los Angeles', 'CA', '90001', 'USA'),
+            (3, '2025-01-25 09:15:00', 'Processing', '1499.99', '789 Pine Rd', 'Chicago', 'IL', '60007', 'USA'),
+            (4, '2025-02-01 16:20:00', 'Pending', '114.98', '101 Maple Dr', 'Houston', 'TX', '77001', 'USA'),
+            (5, '2025-02-05 11:10:00', 'Delivered', '249.99', '202 Cedar Ln', 'Phoenix', 'AZ', '85001', 'USA'),
+            (6, '2025-02-10 13:25:00', 'Cancelled', '179.99', '303 Birch Blvd', 'Philadelphia', 'PA', '19019', 'USA'),
+            (7, '2025-02-15 15:40:00', 'Processing', '329.97', '404 Elm St', 'San Antonio', 'TX', '78201', 'USA'),
+            (8, '2025-02-20 10:05:00', 'Shipped', '199.99', '505 Walnut Ave', 'San Diego', 'CA', '92101', 'USA'),
+            (9, '2025-02-25 12:30:00', 'Pending', '189.98', '606 Cherry Rd', 'Dallas', 'TX', '75201', 'USA'),
+            (10, '2025-03-01 09:50:00', 'Processing', '1549.98', '707 Spruce Dr', 'San Jose', 'CA', '95101', 'USA'),
+        ],
+    ),
+    'order_items': (
+        ('order_id', 'product_id', 'quantity', 'unit_price'),
+        [
+            (1, 1, 1, '999.99'),
+            (1, 11, 2, '24.99'),
+            (2, 3, 1, '199.99'),
+            (2, 10, 1, '59.99'),
+            (3, 2, 1, '1499.99'),
+            (4, 11, 2, '24.99'),
+            (4, 12, 1, '39.99'),
+            (5, 4, 1, '249.99'),
+            (6, 9, 1, '179.99'),
+            (7, 7, 1, '69.99'),
+            (7, 8, 2, '129.99'),
+            (8, 3, 1, '199.99'),
+            (9, 5, 1, '89.99'),
+            (9, 6, 1, '79.99'),
+            (10, 2, 1, '1499.99'),
+            (10, 10, 1, '59.99'),
+        ],
+    ),
+}
+
+# Target columns for seed_data's generated tables, in generator column order
+GENERATED_COLUMNS = {
+    'customers': ('id', 'first_name', 'last_name', 'email', 'created_at'),
+    'products': ('id', 'name', 'description', 'price', 'stock_quantity'),
+    'orders': ('id', 'customer_id', 'order_date', 'total_amount', 'status'),
+    'order_items': ('id', 'order_id', 'product_id', 'quantity', 'unit_price'),
+}
+
+def check_requirements():
+    """Check that the database credentials are set in the environment."""
+    missing = [name for name in ('MYSQL_HOST', 'MYSQL_USER', 'MYSQL_PASS', 'MYSQL_DB') if not os.environ.get(name)]
+    if missing:
+        print(f"Error: {', '.join(missing)} not set.")
+        print("Please source your credentials first: source ./set_db_credentials.sh")
+        sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Reset the MySQL test tables over a single connection")
+    parser.add_argument('scale', nargs='?', type=int, default=os.environ.get('SCALE') or None,
+                        help="Fill customers, products, orders and order_items from seed_data.py at this "
+                             "scale factor instead of the fixed sample rows (default: $SCALE)")
+    parser.add_argument('--seed', type=int, default=os.environ.get('SEED', seed_data.DEFAULT_SEED),
+                        help=f"Seed for generated data (default: $SEED or {seed_data.DEFAULT_SEED})")
+    parser.add_argument('--batch-size', type=int, default=seed_data.DEFAULT_BATCH_SIZE,
+                        help=f"Rows per multi-row INSERT (default: {seed_data.DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--bulk-load', action='store_true',
+                        help="Load generated data with LOAD DATA LOCAL INFILE when the server allows it")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Skip tables whose schema and data already match, truncate and reload tables "
+                             "whose data drifted, and only drop tables whose schema changed")
+    parser.add_argument('--defer-constraints', action='store_true',
+                        help="Create tables with only their primary keys, load with foreign_key_checks and "
+                             "unique_checks off, then add UNIQUE keys and foreign keys and check "
+                             "referential integrity")
+    parser.add_argument('--verify', action='store_true',
+                        help="After loading generated data, compare server-side row counts and content hashes "
+                             "with the generated rows")
+    rds.add_snapshot_args(parser)
+    statement_trace.add_trace_args(parser)
+    args = parser.parse_args()
+    if args.scale is not None and args.scale < 1:
+        parser.error("scale must be a positive integer")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be a positive integer")
+    if args.defer_constraints and args.incremental:
+        parser.error("--defer-constraints cannot be combined with --incremental")
+    if args.verify and (not args.scale or args.incremental):
+        parser.error("--verify requires a scale and cannot be combined with --incremental")
+    return args
+
+def create_table_sql(table, deferred=False):
+    """Render the CREATE TABLE statement for a table in TABLE_SCHEMAS."""
+    return rds.create_table_sql(table, TABLE_SCHEMAS[table], deferred)
+
+def reset_tables(cursor, deferred=False):
+    """Drop the test tables (children first) and recreate them."""
+    print("Dropping existing tables...")
+    for table in reversed(TABLE_ORDER):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for table in TABLE_ORDER:
+        print(f"Creating {table} table...")
+        cursor.execute(create_table_sql(table, deferred))
+
+def insert_sample_data(connection, batch_size):
+    """Insert the fixed sample rows into every table."""
+    for table in TABLE_ORDER:
+        columns, rows = SAMPLE_DATA[table]
+        print(f"Inserting sample data into {table} table...")
+        rds.insert_rows(connection, table, columns, rows, batch_size)
+
+def insert_generated_data(connection, scale, seed, load_rows, snapshots=None, bulk=False):
+    """Insert the sample persons rows and a generated dataset for the other tables.
+
+    Returns {table: RowDigest} of the generated tables.
+    """
+    columns, rows = SAMPLE_DATA['persons']
+    print("Inserting sample data into persons table...")
+    rds.insert_rows(connection, 'persons', columns, rows)
+
+    print(f"Loading generated data (scale {scale}, seed {seed})...")
+    schema_version = rds.fingerprint(*(create_table_sql(table) for table in TABLE_ORDER))
+    return rds.load_generated_data(connection, scale, seed, load_rows, columns=GENERATED_COLUMNS,
+                                   snapshots=snapshots, schema_version=schema_version, bulk=bulk)
+
+def reset_tables_incremental(connection, scale, seed, load_rows, batch_size):
+    """Reset only the tables whose schema or data differ from what this script would load."""
+    def generated(table):
+        return scale and table in GENERATED_COLUMNS
+
+    def load_table(table):
+        if generated(table):
+            rows = seed_data.generate_rows(table, scale, seed)
+            print(f"Loading {table}: {load_rows(connection, table, GENERATED_COLUMNS[table], rows)} rows")
+        else:
+            columns, rows = SAMPLE_DATA[table]
+            rds.insert_rows(connection, table, columns, rows, batch_size)
+
+    data_hashes = {
+        table: (rds.fingerprint(seed_data.DATASET_VERSION, table, scale, seed) if generated(table)
+                else rds.fingerprint(SAMPLE_DATA[table]))
+        for table in TABLE_ORDER
+    }
+    ddl = {table: create_table_sql(table) for table in TABLE_ORDER}
+    return rds.incremental_reset(connection, TABLE_ORDER, TABLE_DEPENDENCIES, ddl, data_hashes, load_table)
+
+def show_table_counts(cursor):
+    """Print the row count of every test table."""
+    cursor.execute(" UNION ALL ".join(
+        f"SELECT '{table}' AS table_name, COUNT(*) AS record_count FROM {table}" for table in TABLE_ORDER))
+    print("\nTable record counts:")
+    for table, count in cursor.fetchall():
+        print(f"- {table}: {count} records")
+
+def main():
+    """Reset the test tables and insert sample or generated data."""
+    check_requirements()
+    args = parse_args()
+    statement_trace.start(args)
+
+    try:
+        connection = rds.open_connection(
+            os.environ['MYSQL_HOST'], os.environ['MYSQL_USER'], os.environ['MYSQL_PASS'],
+            os.environ['MYSQL_DB'], port=int(os.environ.get('MYSQL_PORT', 3306)),
+            local_infile=args.bulk_load,
+            init_command=rds.BULK_SESSION_SQL if args.defer_constraints else None)
+    except pymysql.MySQLError as e:
+        print(f"Error: Could not connect to MySQL: {e}")
+        sys.exit(1)
+
+    try:
+        print(f"Creating tables and inserting sample data into MySQL database '{os.environ['MYSQL_DB']}'...")
+        load_rows = partial(rds.insert_rows, batch_size=args.batch_size)
+        if args.scale and args.bulk_load:
+            if rds.local_infile_enabled(connection):
+                load_rows = rds.bulk_load_rows
+            else:
+                print("local_infile is disabled on the server; falling back to multi-row INSERTs.")
+
+        if args.incremental:
+            reset_tables_incremental(connection, args.scale, args.seed, load_rows, args.batch_size)
+        else:
+            with connection.cursor() as cursor:
+                reset_tables(cursor, deferred=args.defer_constraints)
+            connection.commit()
+            if args.scale:
+                digests = insert_generated_data(connection, args.scale, args.seed, load_rows,
+                                                snapshots=rds.open_snapshot_cache(args),
+                                                bulk=load_rows is rds.bulk_load_rows)
+            else:
+                insert_sample_data(connection, args.batch_size)
+            if args.defer_constraints:
+                rds.add_deferred_constraints(connection, TABLE_SCHEMAS, TABLE_ORDER)
+            if args.verify and not verify_data.verify_tables(connection, digests, GENERATED_COLUMNS,
+                                                             args.scale, args.seed):
+                print("Error: Loaded data does not match the generated dataset.")
+                sys.exit(1)
+
+        print("Sample data insertion complete!")
+        with connection.cursor() as cursor:
+            show_table_counts(cursor)
+    except pymysql.MySQLError as e:
+        print(f"Error: MySQL error occurred: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+
+"""Deterministic, scale-factor driven test data generator.
+
+Every row is a pure function of (seed, table, row index), so two runs with the
+same seed and scale produce identical data and any key range can be generated
+independently without materialising the rest of the table.
+"""
+
+import csv
+import sys
+import time
+import zlib
+import argparse
+from itertools import islice
+
+DEFAULT_SEED = 42
+
+# Bump whenever a change here alters the rows generated for a given seed and
+# scale, so fingerprints of previously loaded tables stop matching
+DATASET_VERSION = 1
+
+# Bump whenever row_text() changes, so stored row digests stop matching
+ROW_DIGEST_VERSION = 2
+DEFAULT_BATCH_SIZE = 1000
+
+# Rows generated per unit of --scale (scale 1000 = 1M customers, 5M orders)
+ROWS_PER_SCALE = {
+    'customers': 1000,
+    'products': 100,
+    'orders': 5000,
+}
+
+# order_items has no scale of its own: it is generated per order, so its keys
+# (and key ranges) are order ids
+KEY_TABLES = {
+    'order_items': 'orders',
+}
+
+# Load order respects foreign keys: parents before children
+TABLE_ORDER = ('customers', 'products', 'orders', 'order_items')
+
+# Tables whose rows must be committed before a table can start loading
+TABLE_DEPENDENCIES = {
+    'customers': (),
+    'products': (),
+    'orders': ('customers',),
+    'order_items': ('orders', 'products'),
+}
+
+# Position of the column that carries a table's generation key
+# (order_items rows are generated per order, so it is order_id)
+KEY_COLUMN_INDEX = {
+    'customers': 0,
+    'products': 0,
+    'orders': 0,
+    'order_items': 1,
+}
+
+COLUMNS = {
+    'customers': ('customer_id', 'first_name', 'last_name', 'email', 'created_at'),
+    'products': ('product_id', 'product_name', 'description', 'price', 'stock_quantity'),
+    'orders': ('order_id', 'customer_id', 'order_date', 'total_amount', 'status'),
+    'order_items': ('order_item_id', 'order_id', 'product_id', 'quantity', 'unit_price'),
+}
+
+MAX_ITEMS_PER_ORDER = 3
+
+FIRST_NAMES = (
+    'John', 'Jane', 'Robert', 'Emily', 'Michael', 'Emma', 'Sophia', 'William',
+    'Olivia', 'James', 'Ava', 'Alexander', 'Isabella', 'Ethan', 'Mia', 'Daniel',
+    'Charlotte', 'Matthew', 'Amelia', 'Benjamin', 'Harper', 'Jacob', 'Evelyn',
+    'Jennifer', 'David', 'Sarah', 'Christopher', 'Jessica', 'Amanda',
+)
+
+LAST_NAMES = (
+    'Doe', 'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller',
+    'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson',
+    'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+)
+
+PRODUCTS = (
+    ('Laptop', 'High-performance laptop with 16GB RAM'),
+    ('Smartphone', 'Latest model with 128GB storage'),
+    ('Headphones', 'Noise-cancelling wireless headphones'),
+    ('Tablet', '10-inch tablet with retina display'),
+    ('Smart Watch', 'Fitness tracking and notifications'),
+    ('Coffee Maker', 'Programmable coffee maker with timer'),
+    ('Blender', 'High-speed blender for smoothies and more'),
+    ('Toaster Oven', 'Compact toaster oven with multiple functions'),
+    ('Running Shoes', 'Lightweight running shoes with cushioning'),
+    ('Winter Jacket', 'Waterproof and insulated winter jacket'),
+    ('Backpack', 'Durable backpack with laptop compartment'),
+    ('Water Bottle', 'Insulated stainless steel water bottle'),
+    ('Yoga Mat', 'Non-slip yoga mat with carrying strap'),
+    ('Dumbbells Set', 'Adjustable dumbbells set for home workouts'),
+    ('Air Purifier', 'HEPA air purifier for allergen removal'),
+    ('Desk Lamp', 'LED desk lamp with adjustable brightness'),
+)
+
+PRODUCT_EDITIONS = ('Lite', 'Plus', 'Pro', 'Max', 'Mini', 'Ultra')
+
+ORDER_STATUSES = ('pending', 'processing', 'shipped', 'delivered', 'cancelled')
+
+# Timestamps are spread over a fixed window so they do not depend on "now"
+CUSTOMER_EPOCH = 1672531200  # 2023-01-01 00:00:00 UTC
+ORDER_EPOCH = 1704067200     # 2024-01-01 00:00:00 UTC
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# Per-table salts keep the hash streams of different tables independent
+_SALT_CUSTOMER = 1
+_SALT_PRODUCT = 2
+_SALT_ORDER = 3
+_SALT_ORDER_ITEM = 4
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(seed, salt, index):
+    """Return a well-distributed 64-bit hash of (seed, salt, index) (splitmix64)."""
+    z = (seed * 0x9E3779B97F4A7C15 + salt * 0xD1B54A32D192ED03 + index) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _timestamp(epoch, offset):
+    """Format a UTC timestamp as MySQL DATETIME/TIMESTAMP text."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch + offset))
+
+
+def _money(cents):
+    """Format an integer number of cents as DECIMAL(10, 2) text."""
+    return '%d.%02d' % divmod(cents, 100)
+
+
+def table_row_count(table, scale):
+    """Return the number of keys generated for a table at a scale factor."""
+    return ROWS_PER_SCALE[KEY_TABLES.get(table, table)] * scale
+
+
+def customer_row(seed, customer_id):
+    """Generate one customers row."""
+    h = _mix(seed, _SALT_CUSTOMER, customer_id)
+    first_name = FIRST_NAMES[h % len(FIRST_NAMES)]
+    last_name = LAST_NAMES[(h >> 8) % len(LAST_NAMES)]
+    # The id suffix keeps the UNIQUE email constraint satisfied at any scale
+    email = f"{first_name}.{last_name}.{customer_id}@example.com".lower()
+    created_at = _timestamp(CUSTOMER_EPOCH, (h >> 16) % SECONDS_PER_YEAR)
+    return (customer_id, first_name, last_name, email, created_at)
+
+
+def customer_age(seed, customer_id):
+    """Return the deterministic age of a customer (document stores only, not a SQL column)."""
+    return 18 + (_mix(seed, _SALT_CUSTOMER, customer_id) >> 48) % 63
+
+
+def product_price_cents(seed, product_id):
+    """Return the deterministic price of a product in cents."""
+    return 999 + (_mix(seed, _SALT_PRODUCT, product_id) >> 24) % 199000
+
+
+def product_row(seed, product_id):
+    """Generate one products row."""
+    h = _mix(seed, _SALT_PRODUCT, product_id)
+    base_name, description = PRODUCTS[h % len(PRODUCTS)]
+    edition = PRODUCT_EDITIONS[(h >> 8) % len(PRODUCT_EDITIONS)]
+    product_name = f"{base_name} {edition} {product_id}"
+    price = _money(product_price_cents(seed, product_id))
+    stock_quantity = (h >> 48) % 500
+    return (product_id, product_name, description, price, stock_quantity)
+
+
+def order_item_parts(seed, order_id, products):
+    """Return the (product_id, quantity, unit_price_cents) line items of an order."""
+    count = 1 + _mix(seed, _SALT_ORDER, order_id) % MAX_ITEMS_PER_ORDER
+    items = []
+    for position in range(count):
+        h = _mix(seed, _SALT_ORDER_ITEM, order_id * MAX_ITEMS_PER_ORDER + position)
+        product_id = 1 + h % products
+        quantity = 1 + (h >> 32) % 4
+        items.append((product_id, quantity, product_price_cents(seed, product_id)))
+    return items
+
+
+def order_row(seed, order_id, customers, products):
+    """Generate one orders row; the total is the sum of its line items."""
+    h = _mix(seed, _SALT_ORDER, order_id)
+    customer_id = 1 + (h >> 8) % customers
+    order_date = _timestamp(ORDER_EPOCH, (h >> 24) % SECONDS_PER_YEAR)
+    total_cents = sum(quantity * cents for _, quantity, cents in order_item_parts(seed, order_id, products))
+    status = ORDER_STATUSES[(h >> 56) % len(ORDER_STATUSES)]
+    return (order_id, customer_id, order_date, _money(total_cents), status)
+
+
+def order_item_rows(seed, order_id, products):
+    """Generate the order_items rows of one order."""
+    first_id = (order_id - 1) * MAX_ITEMS_PER_ORDER + 1
+    return [
+        (first_id + position, order_id, product_id, quantity, _money(cents))
+        for position, (product_id, quantity, cents) in enumerate(order_item_parts(seed, order_id, products))
+    ]
+
+
+def generate_rows(table, scale, seed=DEFAULT_SEED, start=1, stop=None):
+    """Yield the rows of a table whose keys fall in [start, stop)."""
+    if stop is None:
+        stop = table_row_count(table, scale) + 1
+
+    if table == 'customers':
+        for customer_id in range(start, stop):
+            yield customer_row(seed, customer_id)
+    elif table == 'products':
+        for product_id in range(start, stop):
+            yield product_row(seed, product_id)
+    elif table == 'orders':
+        customers = table_row_count('customers', scale)
+        products = table_row_count('products', scale)
+        for order_id in range(start, stop):
+            yield order_row(seed, order_id, customers, products)
+    elif table == 'order_items':
+        # Item ids are spaced MAX_ITEMS_PER_ORDER apart per order so any order
+        # range can be generated without knowing how many items came before it
+        products = table_row_count('products', scale)
+        for order_id in range(start, stop):
+            yield from order_item_rows(seed, order_id, products)
+    else:
+        raise ValueError(f"Unknown table: {table}")
+
+
+def key_ranges(table, scale, parts):
+    """Split a table's keys into at most `parts` contiguous [start, stop) ranges."""
+    total = table_row_count(table, scale)
+    size = -(-total // max(parts, 1))
+    return [(start, min(start + size, total + 1)) for start in range(1, total + 1, size)]
+
+
+def chunked(rows, size):
+    """Yield lists of at most `size` items from an iterator."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(rows, stream):
+    """Write rows as CSV in the dialect expected by LOAD DATA ... ESCAPED BY ''.
+
+    Fields are quoted only when needed and embedded quotes are doubled; None is
+    written as an unquoted NULL, which LOAD DATA reads back as SQL NULL.
+    """
+    writer = csv.writer(stream, lineterminator='\n')
+    for row in rows:
+        writer.writerow(['NULL' if value is None else value for value in row])
+
+
+def row_text(row):
+    """Render a row the way verification hashes it.
+
+    Values are joined with '|' and NULL becomes CHAR(0), as in
+    CONCAT_WS('|', IFNULL(col, CHAR(0)), ...) on the server. The server
+    lower-cases only the status column (an ENUM may store 'pending' as
+    'Pending'); ORDER_STATUSES are already lower case, so generated rows are
+    hashed exactly as they are.
+    """
+    return '|'.join('\0' if value is None else str(value) for value in row)
+
+
+class RowDigest:
+    """Order-independent digest of a set of rows: count, sum and XOR of per-row CRC32s."""
+
+    def __init__(self, count=0, total=0, xor=0):
+        self.count = count
+        self.total = total
+        self.xor = xor
+
+    def add(self, row):
+        crc = zlib.crc32(row_text(row).encode('utf-8'))
+        self.count += 1
+        self.total += crc
+        self.xor ^= crc
+
+    def track(self, rows):
+        """Yield rows unchanged, adding each to the digest."""
+        for row in rows:
+            self.add(row)
+            yield row
+
+    def merge(self, other):
+        """Fold another digest (e.g. of a different key range) into this one."""
+        self.count += other.count
+        self.total += other.total
+        self.xor ^= other.xor
+
+    def as_tuple(self):
+        return (self.count, self.total, self.xor)
+
+    def __eq__(self, other):
+        return isinstance(other, RowDigest) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return f"RowDigest(count={self.count}, total={self.total}, xor={self.xor})"
+
+
+def sql_literal(value):
+    """Render a Python value as a MySQL literal."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+def write_sql_inserts(table, columns, rows, stream, batch_size=DEFAULT_BATCH_SIZE):
+    """Write rows as multi-row INSERT statements."""
+    prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+    for chunk in chunked(rows, batch_size):
+        values = ",\n".join("(" + ", ".join(sql_literal(value) for value in row) + ")" for row in chunk)
+        stream.write(prefix + values + ";\n")
+
+
+def main():
+    """Preview the generated dataset, or stream one table as CSV or SQL."""
+    parser = argparse.ArgumentParser(description="Preview or export the generated test dataset")
+    parser.add_argument('--scale', type=int, default=1, help="Scale factor (default: 1)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument('--rows', type=int, default=5, help="Rows to show per table")
+    parser.add_argument('--format', choices=('preview', 'csv', 'sql'), default='preview',
+                        help="preview: print sample rows; csv/sql: stream --table to stdout")
+    parser.add_argument('--table', choices=TABLE_ORDER, help="Table to stream with --format csv/sql")
+    parser.add_argument('--columns',
+                        help="Comma-separated target column names for --format sql (default: generator names)")
+    args = parser.parse_args()
+
+    if args.format != 'preview':
+        if not args.table:
+            parser.error("--table is required with --format csv/sql")
+        rows = generate_rows(args.table, args.scale, args.seed)
+        if args.format == 'csv':
+            write_csv(rows, sys.stdout)
+        else:
+            columns = args.columns.split(',') if args.columns else COLUMNS[args.table]
+            write_sql_inserts(args.table, columns, rows, sys.stdout)
+        return 0
+
+    for table in TABLE_ORDER:
+        print(f"\n{table} ({table_row_count(table, args.scale)} rows):")
+        print(COLUMNS[table])
+        for row in generate_rows(table, args.scale, args.seed, stop=args.rows + 1):
+            print(row)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,9 +19,14 @@ if [ -z "$MYSQL_HOST" ] || [ -z "$MYSQL_USER" ] || [ -z "$MYSQL_PASS" ] || \
     exit 1
 fi
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
 # Create mcp directory if it doesn't exist
 mkdir -p ~/mcp
 
+# Install the MySQL result cache proxy (registered below when MYSQL_MCP_CACHE=true)
+cp "$SCRIPT_DIR/mysql_cache_proxy.py" ~/mcp/
+
 # Clone Redis MCP server
 echo "Cloning Redis MCP server..."
 cd ~/mcp
@@ -141,6 +146,19 @@ new_configs = {
     }
 }
 
+# Put the read-through result cache in front of the MySQL MCP server
+if os.environ.get('MYSQL_MCP_CACHE', 'false').lower() == 'true':
+    mysql = new_configs['mcp_server_mysql']
+    mysql['args'] = [
+        '/home/ec2-user/mcp/mysql_cache_proxy.py',
+        '--ttl', os.environ.get('MYSQL_MCP_CACHE_TTL', '30'),
+        '--schema-ttl', os.environ.get('MYSQL_MCP_CACHE_SCHEMA_TTL', '300'),
+        '--',
+        mysql['command']
+    ] + mysql['args']
+    mysql['command'] = 'python3'
+    mysql['description'] += ' (cached reads)'
+
 # Update the mcpServers section with the new configurations
 if 'mcpServers' in config:
     config['mcpServers'].update(new_configs)
@@ -161,3 +179,6 @@ cd ~/mcp/demo_mcp_on_amazon_bedrock
 
 echo "Setup complete! MCP servers for databases are now configured and running."
 echo "MySQL write operations (INSERT, UPDATE, DELETE) are enabled."
+if [ "$MYSQL_MCP_CACHE" = "true" ]; then
+    echo "MySQL MCP queries go through the result cache (ask for the mysql_cache_stats tool for hit ratio)."
+fi
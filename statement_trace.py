@@ -0,0 +1,158 @@
+"""Per-statement timing spans for the MySQL and Data API loaders.
+
+When enabled with --trace FILE and/or --trace-summary, every statement,
+batch call, commit and rollback records a span: wall time, rows affected,
+request and response bytes, retries and (Data API) records returned.
+Spans are written as JSON lines:
+
+    {"ts": 1718000000.123, "kind": "query", "statement": "insert",
+     "template": "INSERT INTO customers (...) VALUES (?, ?, ?, ?, ?), ...",
+     "seconds": 0.0213, "rows": 1000, "request_bytes": 61234, "response_bytes": 52, "thread": "MainThread"}
+
+and --trace-summary prints the time spent per statement template at the
+end of the run, widest bar first. Tracing is off unless started; the
+loaders then only check the module-level TRACER for None per call.
+"""
+
+import re
+import sys
+import json
+import time
+import atexit
+import threading
+
+TRACER = None
+
+MAX_SQL_SCAN = 4096
+MAX_TEMPLATE_CHARS = 160
+SUMMARY_BAR_WIDTH = 30
+
+_LITERAL = re.compile(r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.)*"|\b\d+(?:\.\d+)?\b""")
+_REPEATED_TUPLES = re.compile(r"(\([^()]*\))(?:\s*,\s*\([^()]*\))+")
+
+def statement_template(sql):
+    """Return the statement with literals replaced by ? and repeated VALUES tuples folded, for grouping."""
+    truncated = len(sql) > MAX_SQL_SCAN
+    sql = sql[:MAX_SQL_SCAN]
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    template = re.sub(r'\s+', ' ', _LITERAL.sub('?', sql)).strip()
+    template = _REPEATED_TUPLES.sub(r"\1, ...", template)
+    if truncated:
+        # Drop the partial tuple or clause the cut left behind
+        template = template[:template.rfind(' ...') + 4] if ' ...' in template else template + " ..."
+    return template[:MAX_TEMPLATE_CHARS]
+
+def statement_verb(template):
+    return template.split(' ', 1)[0].lower() if template else ''
+
+class Tracer:
+    """Write statement spans as JSON lines and total them per statement template."""
+
+    def __init__(self, stream=None, summary=False):
+        self.stream = stream
+        self.summary = summary
+        self.lock = threading.Lock()
+        self.groups = {}  # (kind, template) -> totals
+
+    def record(self, kind, sql, seconds, started, rows=None, request_bytes=None, response_bytes=None,
+               records=None, retries=0, error=None):
+        """Record one span; `sql` is None for commits, rollbacks and transaction calls."""
+        template = statement_template(sql) if sql is not None else kind.upper()
+        span = {'ts': round(started, 6), 'kind': kind, 'statement': statement_verb(template),
+                'template': template, 'seconds': round(seconds, 6)}
+        for name, value in (('rows', rows), ('request_bytes', request_bytes), ('response_bytes', response_bytes),
+                            ('records', records)):
+            if value is not None:
+                span[name] = value
+        if retries:
+            span['retries'] = retries
+        if error is not None:
+            span['error'] = error
+        span['thread'] = threading.current_thread().name
+        self._add(kind, template, span)
+
+    def retry(self, kind, sql, error):
+        """Record that a call was retried by the caller after `error`."""
+        template = statement_template(sql) if sql is not None else kind.upper()
+        self._add(kind, template, {'ts': round(time.time(), 6), 'kind': 'retry',
+                                   'statement': statement_verb(template), 'template': template, 'error': error,
+                                   'thread': threading.current_thread().name})
+
+    def _add(self, kind, template, span):
+        line = json.dumps(span, separators=(',', ':')) + "\n" if self.stream else None
+        with self.lock:
+            totals = self.groups.get((kind, template))
+            if totals is None:
+                totals = self.groups[(kind, template)] = dict.fromkeys(
+                    ('calls', 'seconds', 'rows', 'request_bytes', 'response_bytes', 'records', 'retries',
+                     'errors'), 0)
+            if span['kind'] == 'retry':
+                totals['retries'] += 1
+            else:
+                totals['calls'] += 1
+                totals['seconds'] += span['seconds']
+                for name in ('rows', 'request_bytes', 'response_bytes', 'records', 'retries'):
+                    totals[name] += span.get(name) or 0
+                totals['errors'] += 'error' in span
+            if line:
+                self.stream.write(line)
+
+    def print_summary(self, stream=sys.stderr):
+        """Print the time per (kind, template), largest first, as a flat flame-style chart."""
+        with self.lock:
+            groups = sorted(self.groups.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        total = sum(totals['seconds'] for _, totals in groups) or 1e-9
+        print(f"\nStatement time by template ({total:.2f}s traced):", file=stream)
+        for (kind, template), totals in groups:
+            share = totals['seconds'] / total
+            bar = '#' * max(1, round(share * SUMMARY_BAR_WIDTH)) if totals['seconds'] else ''
+            extras = [f"{totals['rows']} rows" if totals['rows'] else None,
+                      f"{_mib(totals['request_bytes'])} sent" if totals['request_bytes'] else None,
+                      f"{_mib(totals['response_bytes'])} received" if totals['response_bytes'] else None,
+                      f"{totals['records']} records" if totals['records'] else None,
+                      f"{totals['retries']} retries" if totals['retries'] else None,
+                      f"{totals['errors']} errors" if totals['errors'] else None]
+            print(f"  {bar:<{SUMMARY_BAR_WIDTH}} {share:6.1%} {totals['seconds']:9.3f}s {totals['calls']:>7}x "
+                  f"{kind:<8} {template}", file=stream)
+            details = ", ".join(extra for extra in extras if extra)
+            if details:
+                print(f"  {'':<{SUMMARY_BAR_WIDTH}} {'':>6} {'':>10} {'':>8} {'':<8} {details}", file=stream)
+
+    def close(self):
+        if self.summary:
+            self.print_summary()
+        if self.stream not in (None, sys.stderr, sys.stdout):
+            self.stream.close()
+
+def _mib(size):
+    return f"{size / 1024 ** 2:.1f} MiB" if size >= 1024 ** 2 else f"{size / 1024:.1f} KiB"
+
+def add_trace_args(parser):
+    """Add the statement tracing options to an argument parser."""
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Write a JSON-lines span per statement, batch call and commit to FILE "
+                             "('-' for stderr)")
+    parser.add_argument('--trace-summary', action='store_true',
+                        help="Print the time spent per statement template at the end of the run")
+
+def start(args):
+    """Start tracing if the command line asks for it; the spans are flushed when the process exits."""
+    global TRACER
+    if not (args.trace or args.trace_summary):
+        return None
+    stream = None
+    if args.trace == '-':
+        stream = sys.stderr
+    elif args.trace:
+        stream = open(args.trace, 'w', buffering=1024 * 1024)
+    TRACER = Tracer(stream, args.trace_summary)
+    atexit.register(stop)
+    return TRACER
+
+def stop():
+    """Stop tracing, printing the summary if requested."""
+    global TRACER
+    tracer, TRACER = TRACER, None
+    if tracer is not None:
+        tracer.close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""Verify a generated dataset in MySQL without pulling it into client memory.
+
+Each table's row count and an order-independent content hash (sum and XOR of
+per-row CRC32s, see seed_data.RowDigest) are computed by the server and
+compared with the digest of the rows the generator produces. When a table
+does not match, per-bucket digests narrow the difference down to key ranges,
+and only those ranges are streamed back through an unbuffered SSCursor and
+compared row by row with regenerated rows.
+"""
+
+import os
+import sys
+import argparse
+
+import pymysql
+
+import seed_data
+
+# Keys (in each table's generation key space) per drill-down bucket
+VERIFY_BUCKET_KEYS = 100000
+MAX_REPORTED_DIFFERENCES = 10
+
+# Columns compared case-insensitively: the reset schema's ENUM stores 'pending'
+# as 'Pending'. Every other column is hashed exactly.
+CASE_INSENSITIVE_COLUMNS = ('status',)
+
+def _row_hash_sql(columns):
+    """Return the SQL for a row's CRC32, matching seed_data.row_text()."""
+    row_text = ", ".join(
+        f"IFNULL(LOWER(`{column}`), CHAR(0))" if column in CASE_INSENSITIVE_COLUMNS
+        else f"IFNULL(`{column}`, CHAR(0))"
+        for column in columns)
+    return f"CRC32(CONCAT_WS('|', {row_text}))"
+
+def server_digest(connection, table, columns):
+    """Return the server-side RowDigest of a table over the given columns."""
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        row_hash = _row_hash_sql(columns)
+        cursor.execute(f"SELECT COUNT(*), COALESCE(SUM({row_hash}), 0), COALESCE(BIT_XOR({row_hash}), 0) "
+                       f"FROM {table}")
+        count, total, xor = cursor.fetchone()
+    return seed_data.RowDigest(int(count), int(total), int(xor))
+
+def server_bucket_digests(connection, table, columns, bucket_keys=VERIFY_BUCKET_KEYS):
+    """Return {bucket: RowDigest} for buckets of `bucket_keys` generation keys, computed on the server."""
+    key_column = columns[seed_data.KEY_COLUMN_INDEX[table]]
+    row_hash = _row_hash_sql(columns)
+    with connection.cursor(pymysql.cursors.Cursor) as cursor:
+        cursor.execute(f"SELECT FLOOR((`{key_column}` - 1) / %s) AS bucket, COUNT(*), SUM({row_hash}), "
+                       f"BIT_XOR({row_hash}) FROM {table} GROUP BY bucket", (bucket_keys,))
+        return {int(bucket): seed_data.RowDigest(int(count), int(total), int(xor))
+                for bucket, count, total, xor in cursor.fetchall()}
+
+def expected_bucket_digests(table, scale, seed, bucket_keys=VERIFY_BUCKET_KEYS):
+    """Return {bucket: RowDigest} for the generated rows of a table."""
+    digests = {}
+    last_key = seed_data.table_row_count(table, scale)
+    for start in range(1, last_key + 1, bucket_keys):
+        stop = min(start + bucket_keys, last_key + 1)
+        digest = seed_data.RowDigest()
+        for row in seed_data.generate_rows(table, scale, seed, start, stop):
+            digest.add(row)
+        digests[(start - 1) // bucket_keys] = digest
+    return digests
+
+def _comparable(row, columns):
+    if row is None:
+        return None
+    return tuple(seed_data.row_text((value,)).lower() if column in CASE_INSENSITIVE_COLUMNS
+                 else seed_data.row_text((value,))
+                 for column, value in zip(columns, row))
+
+def diff_key_range(connection, table, columns, scale, seed, start, stop, limit=MAX_REPORTED_DIFFERENCES):
+    """Stream a key range from the server and compare it row by row with the generator.
+
+    Rows come through an unbuffered SSCursor in primary key order, so memory
+    use does not depend on the size of the range. Returns up to `limit`
+    (primary key, expected row, actual row) differences; a missing or extra
+    row has None on the other side.
+    """
+    key_column = columns[seed_data.KEY_COLUMN_INDEX[table]]
+    differences = []
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(f"SELECT {', '.join(f'`{column}`' for column in columns)} FROM {table} "
+                       f"WHERE `{key_column}` >= %s AND `{key_column}` < %s ORDER BY `{columns[0]}`",
+                       (start, stop))
+        # The generator only knows keys up to the table's size; the server may hold more
+        last_key = seed_data.table_row_count(table, scale)
+        expected_rows = seed_data.generate_rows(table, scale, seed, min(start, last_key + 1),
+                                                min(stop, last_key + 1))
+        actual_rows = iter(cursor.fetchone, None)
+        expected = next(expected_rows, None)
+        actual = next(actual_rows, None)
+        # Merge join on the primary key, which both sides produce in ascending order
+        while (expected is not None or actual is not None) and len(differences) < limit:
+            if actual is None or (expected is not None and expected[0] < actual[0]):
+                differences.append((expected[0], expected, None))
+                expected = next(expected_rows, None)
+            elif expected is None or actual[0] < expected[0]:
+                differences.append((actual[0], None, actual))
+                actual = next(actual_rows, None)
+            else:
+                if _comparable(expected, columns) != _comparable(actual, columns):
+                    differences.append((expected[0], expected, actual))
+                expected = next(expected_rows, None)
+                actual = next(actual_rows, None)
+        # Drain the unbuffered result so the connection can be reused
+        for _ in actual_rows:
+            pass
+    return differences
+
+def drill_down(connection, table, columns, scale, seed, bucket_keys=VERIFY_BUCKET_KEYS):
+    """Report the key ranges of a table that differ from the generated rows."""
+    actual = server_bucket_digests(connection, table, columns, bucket_keys)
+    expected = expected_bucket_digests(table, scale, seed, bucket_keys)
+    empty = seed_data.RowDigest()
+    for bucket in sorted(set(actual) | set(expected)):
+        if actual.get(bucket, empty) == expected.get(bucket, empty):
+            continue
+        start = bucket * bucket_keys + 1
+        stop = start + bucket_keys
+        print(f"    keys [{start}, {stop}) differ:")
+        for key, expected_row, actual_row in diff_key_range(connection, table, columns, scale, seed, start, stop):
+            if actual_row is None:
+                print(f"      {key}: missing, expected {expected_row}")
+            elif expected_row is None:
+                print(f"      {key}: unexpected row {actual_row}")
+            else:
+                print(f"      {key}: expected {expected_row}, found {actual_row}")
+
+def verify_tables(connection, expected, columns=seed_data.COLUMNS, scale=None, seed=None):
+    """Compare server-side digests with `expected` ({table: RowDigest}); return True if all match.
+
+    With `scale` and `seed`, mismatching tables are drilled down to the
+    differing key ranges and rows.
+    """
+    print("\nVerifying loaded data...")
+    ok = True
+    for table, expected_digest in expected.items():
+        actual_digest = server_digest(connection, table, columns[table])
+        if actual_digest == expected_digest:
+            print(f"  {table}: OK ({actual_digest.count} rows)")
+            continue
+        ok = False
+        print(f"  {table}: MISMATCH ({actual_digest.count} rows on the server, {expected_digest.count} expected)")
+        if scale and seed is not None:
+            drill_down(connection, table, columns[table], scale, seed)
+    return ok
+
+def expected_digests(scale, seed):
+    """Return the digest of every generated table, generating rows without storing them."""
+    digests = {}
+    for table in seed_data.TABLE_ORDER:
+        digest = seed_data.RowDigest()
+        for row in seed_data.generate_rows(table, scale, seed):
+            digest.add(row)
+        digests[table] = digest
+    return digests
+
+def main():
+    """Verify a previously loaded dataset against the generator."""
+    parser = argparse.ArgumentParser(description="Verify generated test data in MySQL (MYSQL_* environment)")
+    parser.add_argument('--scale', type=int, required=True, help="Scale factor the data was loaded with")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed the data was loaded with")
+    parser.add_argument('--schema', choices=('rds', 'reset'), default='rds',
+                        help="Column names of rds_insert_test_data.py or of reset_test_data.py / "
+                             "reset_and_insert_data.sh (default: rds)")
+    args = parser.parse_args()
+
+    if args.schema == 'reset':
+        from reset_test_data import GENERATED_COLUMNS as columns
+    else:
+        columns = seed_data.COLUMNS
+
+    try:
+        connection = pymysql.connect(host=os.environ['MYSQL_HOST'], port=int(os.environ.get('MYSQL_PORT', 3306)),
+                                     user=os.environ['MYSQL_USER'], password=os.environ['MYSQL_PASS'],
+                                     database=os.environ['MYSQL_DB'], charset='utf8mb4')
+    except KeyError as e:
+        print(f"Error: {e.args[0]} not set. Please source your credentials first: source ./set_db_credentials.sh")
+        return 1
+    except pymysql.MySQLError as e:
+        print(f"Error: Could not connect to MySQL: {e}")
+        return 1
+
+    try:
+        ok = verify_tables(connection, expected_digests(args.scale, args.seed), columns, args.scale, args.seed)
+    finally:
+        connection.close()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+
+"""Open-loop OLTP write workload against the MySQL test tables.
+
+Transactions start on a fixed schedule at --tps across --connections
+connections, whatever the latency of earlier ones, so MCP read latency can
+be measured under a steady concurrent write load (see query_benchmark.py
+--write-tps). The mix is made of three transactions:
+
+  new_order       decrement stock_quantity of 1-3 products (ascending id
+                  order), insert an orders row and its order_items rows
+  advance_status  move a recent order pending -> processing -> shipped -> delivered
+  cancel_order    cancel a pending or processing order and restock its items
+
+Deadlocks and lock wait timeouts roll back and retry with jittered backoff
+up to --max-retries times. The report gives commit counts, skipped
+transactions (out of stock, order already final), deadlock, lock timeout
+and retry counts, and HDR histograms of transaction latency (from the
+scheduled start to the end of COMMIT) and of COMMIT alone.
+
+Works on the tables of reset_and_insert_data.sh / reset_test_data.py
+(--schema reset) or rds_insert_test_data.py (--schema rds), using the
+MYSQL_* variables of set_db_credentials.sh.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from functools import partial
+
+import pymysql
+
+import seed_data
+from benchmark_loaders import mysql_settings
+from query_benchmark import Schedule, new_histogram, parse_mix, record_latency, summarize
+
+TRANSACTIONS = ('new_order', 'advance_status', 'cancel_order')
+DEFAULT_MIX = 'new_order=5,advance_status=4,cancel_order=1'
+DEFAULT_CONNECTIONS = 8
+DEFAULT_MAX_RETRIES = 5
+# advance_status and cancel_order pick among this many most recent orders
+RECENT_ORDERS = 1000
+
+# MySQL error codes that roll back the transaction and are worth retrying
+DEADLOCK = 1213
+LOCK_WAIT_TIMEOUT = 1205
+
+NEXT_STATUS = {'pending': 'processing', 'processing': 'shipped', 'shipped': 'delivered'}
+CANCELLABLE = ('pending', 'processing')
+
+# Primary key column of each table
+KEY_COLUMNS = {
+    'reset': {'customers': 'id', 'products': 'id', 'orders': 'id'},
+    'rds': {'customers': 'customer_id', 'products': 'product_id', 'orders': 'order_id'},
+}
+
+def check_requirements():
+    """Check if required modules are installed."""
+    for module, package in (('pymysql', 'pymysql'), ('hdrh', 'hdrhistogram')):
+        try:
+            __import__(module)
+        except ImportError:
+            print(f"Error: {package} module is required but not installed.")
+            print(f"Please install it using: pip install {package}")
+            sys.exit(1)
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run a rate-controlled OLTP write workload against MySQL")
+    parser.add_argument('--tps', type=float, required=True, help="Target transactions/sec across all connections")
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS,
+                        help=f"Concurrent connections (default: {DEFAULT_CONNECTIONS})")
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to run (default: 60)")
+    parser.add_argument('--mix', type=partial(parse_mix, names=TRANSACTIONS), default=DEFAULT_MIX,
+                        help=f"Transaction weights (default: {DEFAULT_MIX})")
+    parser.add_argument('--schema', choices=tuple(KEY_COLUMNS), default='reset',
+                        help="Tables of reset_and_insert_data.sh / reset_test_data.py or of "
+                             "rds_insert_test_data.py (default: reset)")
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f"Retries after a deadlock or lock wait timeout (default: {DEFAULT_MAX_RETRIES})")
+    parser.add_argument('--seed', type=int, default=seed_data.DEFAULT_SEED, help="Seed for transaction choices")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    if args.tps <= 0 or args.connections < 1 or args.duration <= 0 or args.max_retries < 0:
+        parser.error("--tps, --connections and --duration must be positive and --max-retries not negative")
+    return args
+
+class WorkloadState:
+    """Key ranges and counters shared by the workload connections."""
+
+    def __init__(self, cursor, keys, mix):
+        self.keys = keys
+        self.lock = threading.Lock()
+        self.max_ids = {}
+        for table in ('customers', 'products', 'orders'):
+            cursor.execute(f"SELECT COALESCE(MAX({keys[table]}), 0) FROM {table}")
+            self.max_ids[table] = cursor.fetchone()[0]
+        if not self.max_ids['customers'] or not self.max_ids['products']:
+            raise RuntimeError("customers and products must hold rows before running the write workload")
+        self.counts = {name: dict.fromkeys(('committed', 'skipped', 'deadlocks', 'lock_timeouts', 'retries',
+                                            'failed'), 0) for name in mix}
+        self.latency = {name: new_histogram() for name in mix}
+        self.commit_latency = new_histogram()
+
+    def recent_order(self, rng):
+        with self.lock:
+            newest = self.max_ids['orders']
+        return rng.randint(max(1, newest - RECENT_ORDERS + 1), newest) if newest else None
+
+    def note_order(self, order_id):
+        with self.lock:
+            self.max_ids['orders'] = max(self.max_ids['orders'], order_id)
+
+    def count(self, name, counter, amount=1):
+        with self.lock:
+            self.counts[name][counter] += amount
+
+def new_order(cursor, state, rng):
+    """Take stock for 1-3 products and insert an order with its line items; False if out of stock."""
+    keys = state.keys
+    customer_id = rng.randint(1, state.max_ids['customers'])
+    count = min(rng.randint(1, seed_data.MAX_ITEMS_PER_ORDER), state.max_ids['products'])
+    # Lock products in ascending id order so concurrent new orders do not deadlock on each other
+    product_ids = sorted(rng.sample(range(1, state.max_ids['products'] + 1), count))
+    quantities = [rng.randint(1, 5) for _ in product_ids]
+    for product_id, quantity in zip(product_ids, quantities):
+        cursor.execute(f"UPDATE products SET stock_quantity = stock_quantity - %s "
+                       f"WHERE {keys['products']} = %s AND stock_quantity >= %s", (quantity, product_id, quantity))
+        if cursor.rowcount == 0:
+            return False
+    cursor.execute(f"SELECT {keys['products']}, price FROM products WHERE {keys['products']} IN "
+                   f"({', '.join(['%s'] * len(product_ids))})", product_ids)
+    prices = dict(cursor.fetchall())
+    total = sum(prices[product_id] * quantity for product_id, quantity in zip(product_ids, quantities))
+    cursor.execute("INSERT INTO orders (customer_id, total_amount, status) VALUES (%s, %s, 'pending')",
+                   (customer_id, total))
+    order_id = cursor.lastrowid
+    cursor.executemany("INSERT INTO order_items (order_id, product_id, quantity, unit_price) VALUES (%s, %s, %s, %s)",
+                       [(order_id, product_id, quantity, prices[product_id])
+                        for product_id, quantity in zip(product_ids, quantities)])
+    state.note_order(order_id)
+    return True
+
+def _locked_status(cursor, state, order_id):
+    cursor.execute(f"SELECT status FROM orders WHERE {state.keys['orders']} = %s FOR UPDATE", (order_id,))
+    row = cursor.fetchone()
+    return row[0].lower() if row else None
+
+def advance_status(cursor, state, rng):
+    """Move a recent order to its next status; False if it is already delivered or cancelled."""
+    order_id = state.recent_order(rng)
+    status = _locked_status(cursor, state, order_id) if order_id else None
+    if status not in NEXT_STATUS:
+        return False
+    cursor.execute(f"UPDATE orders SET status = %s WHERE {state.keys['orders']} = %s",
+                   (NEXT_STATUS[status], order_id))
+    return True
+
+def cancel_order(cursor, state, rng):
+    """Cancel a recent pending or processing order and put its items back in stock."""
+    keys = state.keys
+    order_id = state.recent_order(rng)
+    if not order_id or _locked_status(cursor, state, order_id) not in CANCELLABLE:
+        return False
+    cursor.execute(f"UPDATE orders SET status = 'cancelled' WHERE {keys['orders']} = %s", (order_id,))
+    cursor.execute(f"UPDATE products p JOIN order_items oi ON oi.product_id = p.{keys['products']} "
+                   f"SET p.stock_quantity = p.stock_quantity + oi.quantity WHERE oi.order_id = %s", (order_id,))
+    return True
+
+TRANSACTION_FUNCTIONS = {
+    'new_order': new_order,
+    'advance_status': advance_status,
+    'cancel_order': cancel_order,
+}
+
+def run_transaction(connection, state, name, rng, max_retries):
+    """Run one transaction, retrying deadlocks and lock wait timeouts with jittered backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            with connection.cursor() as cursor:
+                applied = TRANSACTION_FUNCTIONS[name](cursor, state, rng)
+            if not applied:
+                connection.rollback()
+                state.count(name, 'skipped')
+                return
+            started = time.perf_counter()
+            connection.commit()
+            latency = (time.perf_counter() - started) * 1e6
+            with state.lock:
+                record_latency(state.commit_latency, latency)
+                state.counts[name]['committed'] += 1
+            return
+        except pymysql.err.OperationalError as e:
+            connection.rollback()
+            if e.args[0] not in (DEADLOCK, LOCK_WAIT_TIMEOUT):
+                raise
+            state.count(name, 'deadlocks' if e.args[0] == DEADLOCK else 'lock_timeouts')
+            if attempt == max_retries:
+                state.count(name, 'failed')
+                return
+            state.count(name, 'retries')
+            time.sleep(rng.uniform(0, 0.005 * 2 ** attempt))
+
+def workload_client(connection, state, mix, rng, schedule, max_retries):
+    """Run transactions at their scheduled times until the schedule ends."""
+    names, weights = zip(*mix.items())
+    clock = time.perf_counter
+    while True:
+        intended = schedule.next()
+        if intended is None:
+            return
+        if intended > clock():
+            time.sleep(intended - clock())
+        name = rng.choices(names, weights)[0]
+        run_transaction(connection, state, name, rng, max_retries)
+        latency = (clock() - intended) * 1e6
+        with state.lock:
+            record_latency(state.latency[name], latency)
+
+def run_workload(connections, tps, duration, mix, schema='reset', seed=seed_data.DEFAULT_SEED,
+                 max_retries=DEFAULT_MAX_RETRIES):
+    """Run the write workload over the connections for `duration` seconds and return its report."""
+    with connections[0].cursor() as cursor:
+        state = WorkloadState(cursor, KEY_COLUMNS[schema], mix)
+    connections[0].commit()
+
+    started = time.perf_counter()
+    schedule = Schedule(started, tps, started + duration)
+    errors = []
+
+    def client(index):
+        try:
+            workload_client(connections[index], state, mix, random.Random(seed * 1000 + index), schedule,
+                            max_retries)
+        except pymysql.MySQLError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=client, args=(index,), name=f"writer-{index}")
+               for index in range(len(connections))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    committed = sum(counts['committed'] for counts in state.counts.values())
+    latency = summarize(state.latency)
+    return {
+        'target_tps': tps, 'achieved_tps': round(committed / elapsed, 1), 'elapsed': round(elapsed, 2),
+        'transactions': {name: {**state.counts[name], 'latency': latency[name]} for name in mix},
+        'commit_latency': summarize({'commit': state.commit_latency})['commit'],
+    }
+
+def open_connections(settings, count):
+    """Open `count` autocommit-off connections to the test database."""
+    import rds_insert_test_data as rds
+    return [rds.open_connection(settings['host'], settings['user'], settings['password'], settings['database'],
+                                port=settings['port'], autocommit=False)
+            for _ in range(count)]
+
+def print_report(report):
+    """Print counts and latency percentiles per transaction."""
+    print(f"\nWrite workload: {report['achieved_tps']} commits/sec (target {report['target_tps']:g}) "
+          f"over {report['elapsed']}s")
+    print(f"  {'transaction':<15} {'commits':>8} {'skipped':>8} {'deadlk':>7} {'lockto':>7} {'retries':>8} "
+          f"{'failed':>7} {'p50 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9}")
+    for name, stats in report['transactions'].items():
+        latency = stats['latency']
+        print(f"  {name:<15} {stats['committed']:>8} {stats['skipped']:>8} {stats['deadlocks']:>7} "
+              f"{stats['lock_timeouts']:>7} {stats['retries']:>8} {stats['failed']:>7} " +
+              " ".join(f"{latency[key]:>9.3f}" if latency[key] is not None else f"{'-':>9}"
+                       for key in ('p50_ms', 'p99_ms', 'p999_ms')))
+    commit = report['commit_latency']
+    if commit['count']:
+        print(f"  COMMIT latency: p50 {commit['p50_ms']:.3f} ms, p99 {commit['p99_ms']:.3f} ms, "
+              f"p99.9 {commit['p999_ms']:.3f} ms, max {commit['max_ms']:.3f} ms")
+
+def main():
+    """Run the write workload and report commit latency and retry counts."""
+    check_requirements()
+    args = parse_args()
+    settings = mysql_settings()
+    if not settings['host']:
+        print("Error: MYSQL_HOST is not set. Please source your credentials first: source ./set_db_credentials.sh")
+        return 1
+
+    try:
+        connections = open_connections(settings, args.connections)
+    except pymysql.MySQLError as e:
+        print(f"Error: Could not connect to MySQL: {e}")
+        return 1
+    try:
+        print(f"Running write workload at {args.tps:g} tps over {args.connections} connections "
+              f"for {args.duration:g}s...", file=sys.stderr)
+        report = run_workload(connections, args.tps, args.duration, args.mix, args.schema, args.seed,
+                              args.max_retries)
+    except (pymysql.MySQLError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        for connection in connections:
+            connection.close()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())